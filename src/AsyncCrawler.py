@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: AsyncCrawler
+   :synopsis: This module contains the AsyncCrawler crawling several web pages at the same time.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import nullcontext
+import asyncio
+
+from Crawler import Crawler
+from HttpPool import HttpPool
+from ParseStage import ParseStage, initWorker, runStage
+
+class AsyncCrawler(Crawler):
+    """The crawler keeping several web requests in flight at the same time.
+
+    The works are taken from the working list manager in order, and at most ``concurrency`` web requests are sent at the same time. The web requests are sent by worker threads driven by an :mod:`asyncio` event loop. Once a web request is finished, the page is parsed, extracted and its links are added on the event loop thread one page after another, so the working list manager, the extractors and the log are never touched by two pages at the same time. The record files are the same as the ones of :obj:`Crawler`.
+
+    Parsing and extracting are bound to one core. If ``processes`` is set, they are done by a pool of worker processes instead: the raw bytes of each page are sent to a worker, which parses the page, runs the extractors and finds the links, and returns the extracted data and the links. The records, the new works and the log are still handled on the event loop thread one page after another. In this mode the extractors, their classes and the parser have to be picklable, for example defined at the top level of a module. If :obj:`addNewWorks` is overwritten, the pages are processed on the event loop thread as usual.
+
+    Attributes:
+
+    * concurrency (:obj:`int`): The maximum amount of web pages in flight.
+    * processes (:obj:`int`): The amount of worker processes parsing and extracting web pages. None means parsing on the event loop thread.
+
+    Args:
+
+    * concurrency (:obj:`int`): The maximum amount of web pages in flight. Default is 8.
+    * processes (:obj:`int`): The amount of worker processes parsing and extracting web pages. Default is None.
+    * httpPool (:obj:`HttpPool`): The http pool sending the web requests. Default is a new :obj:`HttpPool` keeping ``concurrency`` idle connections for each host.
+    * The other arguments are the same as :obj:`Crawler`.
+
+    Raise:
+
+    * TypeError: The `concurrency` or `processes` argument is not an integer.
+    * ValueError: The `concurrency` or `processes` argument is less than 1.
+    """
+    hookable = ('fetchPage', 'extract', 'addNewWorks', 'printInfo')        # The pages are fetched and parsed apart, without getPageBs and getPageHtml
+
+    def __init__(self, concurrency=8, processes=None, **kwargs):
+        """The initial method of an async crawler.
+        """
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool):
+            raise TypeError('Concurrency must be an integer')
+        if concurrency < 1:
+            raise ValueError('Concurrency must be at least 1')
+        self.concurrency = concurrency
+
+        if processes is not None:
+            if not isinstance(processes, int) or isinstance(processes, bool):
+                raise TypeError('Argument "processes" must be an integer')
+            if processes < 1:
+                raise ValueError('Argument "processes" must be at least 1')
+        self.processes = processes
+
+        if kwargs.get('httpPool') is None:
+            kwargs['httpPool'] = HttpPool(poolMaxsize=concurrency)
+
+        super().__init__(**kwargs)
+
+    def processPage(self, url, req):
+        """The method of handling a fetched web page: parsing, extracting, adding new works and printing information.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * req (:obj:`requests.Response`): The response returned from :obj:`fetchPage`. It is None if the request failed.
+        """
+        self.curUrl = url
+        if req is None:
+            pageBs = None
+        elif self.treeNeeded():
+            pageBs = self.parsePage(req)
+        else:
+            pageBs = self.decodePage(req)
+        extractInfo = self.unchangedInfo if self.isUnchanged(req) else self.callHooked('extract', url, pageBs)
+        with self.timer.measure('links'):
+            self.callHooked('addNewWorks', **{'url': url, 'bs': pageBs})
+        with self.timer.measure('log'):
+            self.callHooked('printInfo', extractInfo)
+
+    def applyStage(self, url, results, links, base, linkError):
+        """The method of handling the results of a web page returned from a worker process: recording the extracted data, adding new works and printing information.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * results (:obj:`list`): The pairs of extracted data and messages, one for each extractor. None if the web page is unchanged since the last crawl and it is not extracted.
+        * links (:obj:`list`): The ``href`` of the links of the web page.
+        * base (:obj:`str`): The ``href`` of the ``<base>`` tag of the web page.
+        * linkError (:obj:`str`): The message of the exception raised when finding the links.
+        """
+        self.curUrl = url
+        if results is None:
+            extractInfo = self.unchangedInfo
+        else:
+            with self.timer.measure('record'):
+                extractInfo = '\n'.join(extractor.recordData(dataset, msgs) for extractor, (dataset, msgs) in zip(self.extractors, results))
+
+        if self.autoAddInternalLinks:
+            if linkError:
+                print(f'Failed to add new works: {linkError}')
+            else:
+                with self.timer.measure('links'):
+                    self.addLinks(url, links, base)
+
+        with self.timer.measure('log'):
+            self.callHooked('printInfo', extractInfo)
+
+    def parseStage(self):
+        """The method of building the parse stage sent to the worker processes.
+
+        Return:
+
+        * :obj:`ParseStage`: The parse stage.
+        * :obj:`None`: None if the pages have to be processed on the event loop thread.
+        """
+        if self.processes is None or type(self).addNewWorks is not Crawler.addNewWorks:
+            return None
+
+        return ParseStage(self.extractors, self.parser, self.treeNeeded(), self.autoAddInternalLinks)
+
+    async def handlePage(self, url, threadPool, processPool):
+        """The coroutine of handling a web page: fetching it on a worker thread, then processing it on a worker process or on the event loop thread.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * threadPool (:obj:`ThreadPoolExecutor`): The pool of the worker threads sending the web requests.
+        * processPool (:obj:`ProcessPoolExecutor`): The pool of the worker processes. None if the pages are processed on the event loop thread.
+        """
+        loop = asyncio.get_running_loop()
+        req = await loop.run_in_executor(threadPool, self.callHooked, 'fetchPage', url)
+
+        if processPool is None or req is None:
+            self.processPage(url, req)
+        else:
+            with self.timer.measure('stage'):
+                results = await loop.run_in_executor(processPool, runStage, url, req.content, self.declaredEncoding(req), not self.isUnchanged(req))
+            self.applyStage(url, *results)
+
+        with self.timer.measure('frontier'):
+            self.WLM.finishWork(url)
+        self.timer.dumpIfDue()
+        if self.profiler is not None:
+            self.profiler.pageDone()
+
+    async def crawlAsync(self):
+        """The coroutine of crawling. It keeps at most ``concurrency`` web pages in flight until the working list is clear and no page is pending. If the working list manager holds the works back, it waits until a work is ready or a pending page is done.
+        """
+        stage = self.parseStage()
+        processPool = nullcontext() if stage is None else ProcessPoolExecutor(max_workers=self.processes, initializer=initWorker, initargs=(stage,))
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as threadPool, processPool:
+            if stage is None:
+                processPool = None
+
+            while self.WLM.workExists() or pending:
+                while self.WLM.workExists() and len(pending) < self.concurrency:
+                    with self.timer.measure('queue'):
+                        url = self.WLM.getWork()
+                    if url is None:
+                        break
+                    if self.verbose:
+                        print(f'Getting: {url}')
+                    pending.add(asyncio.ensure_future(self.handlePage(url, threadPool, processPool)))
+
+                timeout = self.WLM.waitTime() if self.WLM.workExists() and len(pending) < self.concurrency else None
+                if not pending:
+                    await asyncio.sleep(timeout or 0)
+                    continue
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+
+    def crawl(self):
+        """The main method of crawling. The crawl is finished by :obj:`finish` even if it stops with an exception.
+        """
+        self.start()
+        try:
+            asyncio.run(self.crawlAsync())
+        finally:
+            self.finish()
@@ -0,0 +1,276 @@
+from contextlib import contextmanager, redirect_stdout
+from bs4 import BeautifulSoup
+import subprocess
+import tracemalloc
+import platform
+import tempfile
+import shutil
+import json
+import time
+import io
+import os
+
+from MetricsServer import peakResidentMemory
+from Crawler import Crawler
+from AsyncCrawler import AsyncCrawler
+from Extractor import Extractor
+from UrlMatcher import UrlMatcher
+from Recorder import WorkingListManager, JsonRecorder
+from .SyntheticSite import SyntheticSite
+
+crawlerClasses = {'Crawler': Crawler, 'AsyncCrawler': AsyncCrawler}
+
+class BenchmarkExtractor(Extractor):
+    """The extractor of the benchmarks, getting the title and the headline of each page of a :obj:`SyntheticSite`. It is defined at the top level so it could be sent to worker processes.
+    """
+    def get_title(self, url, bs):
+        return bs.head.title.get_text(), ''
+
+    def get_headline(self, url, bs):
+        return bs.h1.get_text(), ''
+
+@contextmanager
+def temporaryDirectory():
+    """The context manager running the code in it in a new temporary working directory, so the record files of the benchmarks do not overwrite the ones in ``./tmp``. The directory is removed afterwards.
+    """
+    cwd = os.getcwd()
+    path = tempfile.mkdtemp(prefix='crawlerBenchmark')
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(path, ignore_errors=True)
+
+def timeIt(func, operations):
+    """The method of timing a function doing a number of operations.
+
+    Args:
+
+    * func (:obj:`callable`): The function, called without arguments.
+    * operations (:obj:`int`): The amount of operations done by the function.
+
+    Return:
+
+    * :obj:`dict`: The ``operations``, the ``seconds`` and the ``operationsPerSecond``.
+    """
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    return {'operations': operations, 'seconds': seconds, 'operationsPerSecond': operations / seconds if seconds else None}
+
+def benchmarkCrawl(site, crawler='Crawler', trackMemory=True, **kwargs):
+    """The method of measuring crawling a synthetic site end to end, from the first page until the working list is clear.
+
+    The throughput and the cpu time are measured on a crawl without memory tracing. If ``trackMemory`` is set, the site is crawled once more under :mod:`tracemalloc` for the peak python memory, since tracing slows the crawl down.
+
+    Args:
+
+    * site (:obj:`SyntheticSite`): The site crawled.
+    * crawler (:obj:`str`): The name of the crawler class, ``Crawler`` or ``AsyncCrawler``. Default is ``Crawler``.
+    * trackMemory (:obj:`bool`): Whether to measure the peak python memory. Default is True.
+    * kwargs: The other arguments of the crawler, for example ``concurrency``.
+
+    Return:
+
+    * :obj:`dict`: The ``pages`` crawled, the ``requests`` received by the site, the ``seconds``, the ``pagesPerSecond``, the ``cpuSecondsPerPage`` (None if no page was crawled), the ``peakMemoryBytes``, the ``peakRssBytes`` and the p50 and p95 of each stage of the stage timer.
+    """
+    crawlerClass = crawlerClasses[crawler]
+
+    def crawl():
+        c = crawlerClass(
+            workingList=[site.startUrl],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[BenchmarkExtractor('benchmarkTitle')],
+            verbose=False,
+            **kwargs
+        )
+        with redirect_stdout(io.StringIO()):
+            c.crawl()
+        return c
+
+    with temporaryDirectory():
+        requestCount = site.requestCount
+        start, cpuStart = time.perf_counter(), time.process_time()
+        c = crawl()
+        seconds, cpuSeconds = time.perf_counter() - start, time.process_time() - cpuStart
+        pages = len(c.WLM.done)
+
+        result = {
+            'pages': pages,
+            'requests': site.requestCount - requestCount,
+            'seconds': seconds,
+            'pagesPerSecond': pages / seconds,
+            'cpuSecondsPerPage': cpuSeconds / pages if pages else None,
+            'stages': {stage: {'p50': summary['p50'], 'p95': summary['p95']} for stage, summary in c.timer.summary().items()},
+        }
+
+        if trackMemory:
+            tracemalloc.start()
+            try:
+                crawl()
+                result['peakMemoryBytes'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    result['peakRssBytes'] = peakResidentMemory()
+    return result
+
+def benchmarkWorkingListManager(n):
+    """The method of measuring adding works to and getting works from a :obj:`WorkingListManager`, with the files written as in a crawl.
+
+    Args:
+
+    * n (:obj:`int`): The amount of works.
+
+    Return:
+
+    * :obj:`dict`: The timing of ``addWorks`` and ``getWork``.
+    """
+    works = [f'http://www.test.com/page/{i}.html' for i in range(n)]
+
+    with temporaryDirectory():
+        WLM = WorkingListManager()
+        return {
+            'addWorks': timeIt(lambda: WLM.addWorks(works), n),
+            'getWork': timeIt(lambda: [WLM.getWork() for _ in range(n)], n),
+        }
+
+def benchmarkUrlMatcher(n):
+    """The method of measuring matching urls with a :obj:`UrlMatcher`. The first pass matches new urls, and the second pass matches the same urls again, whose verdicts may be memorized.
+
+    Args:
+
+    * n (:obj:`int`): The amount of urls.
+
+    Return:
+
+    * :obj:`dict`: The timing of ``isIncluded`` and ``isIncludedAgain``.
+    """
+    UM = UrlMatcher(domain_pattern=r'www\.test\.com', path_pattern=r'/page/.*')
+    urls = [f'http://www.test.com/page/{i}.html' if i % 2 else f'http://www.other.com/{i}' for i in range(n)]
+
+    return {
+        'isIncluded': timeIt(lambda: [UM.isIncluded(url) for url in urls], n),
+        'isIncludedAgain': timeIt(lambda: [UM.isIncluded(url) for url in urls], n),
+    }
+
+def benchmarkExtractor(n, site):
+    """The method of measuring extracting a parsed page of a synthetic site and recording the data with :obj:`Extractor.extract`.
+
+    Args:
+
+    * n (:obj:`int`): The amount of extractions.
+    * site (:obj:`SyntheticSite`): The site providing the page.
+
+    Return:
+
+    * :obj:`dict`: The timing of ``extract``.
+    """
+    bs = BeautifulSoup(site.documents['/page/0.html'], 'html.parser')
+
+    with temporaryDirectory():
+        extractor = BenchmarkExtractor('benchmarkExtract')
+        return {'extract': timeIt(lambda: [extractor.extract(site.startUrl, bs) for _ in range(n)], n)}
+
+def benchmarkJsonRecorder(n):
+    """The method of measuring adding records to a :obj:`JsonRecorder`, saving automatically as the extractors do.
+
+    Args:
+
+    * n (:obj:`int`): The amount of records.
+
+    Return:
+
+    * :obj:`dict`: The timing of ``addRecord``.
+    """
+    with temporaryDirectory():
+        recorder = JsonRecorder('benchmarkRecords')
+        return {'addRecord': timeIt(lambda: [recorder.addRecord({'title': f'Page {i}', 'headline': f'Page {i}'}) for i in range(n)], n)}
+
+def environment():
+    """The method of describing the environment of the benchmarks, so results of different versions and machines could be told apart.
+
+    Return:
+
+    * :obj:`dict`: The ``python`` version, the ``platform``, the git ``commit`` of the source if known, and the ``time``.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+def runBenchmarks(pages=200, fanOut=10, pageSize=20000, latency=0, duplicateRatio=0.2, seed=0, crawler='Crawler', concurrency=8, processes=None, microSize=1000, trackMemory=True):
+    """The method of running the end-to-end crawl benchmark on a synthetic site and the micro benchmarks.
+
+    Args:
+
+    * pages (:obj:`int`): The amount of pages of the site. Default is 200.
+    * fanOut (:obj:`int`): The amount of distinct pages linked from each page. Default is 10.
+    * pageSize (:obj:`int`): The approximate size of each page in bytes. Default is 20000.
+    * latency (:obj:`float`): The seconds each response is delayed. Default is 0.
+    * duplicateRatio (:obj:`float`): The ratio of the links which are other notations of a linked page. Default is 0.2.
+    * seed (:obj:`int`): The seed of generating the site. Default is 0.
+    * crawler (:obj:`str`): The name of the crawler class, ``Crawler`` or ``AsyncCrawler``. Default is ``Crawler``.
+    * concurrency (:obj:`int`): The concurrency of the :obj:`AsyncCrawler`. Default is 8.
+    * processes (:obj:`int`): The worker processes of the :obj:`AsyncCrawler`. Default is None.
+    * microSize (:obj:`int`): The amount of operations of each micro benchmark. Default is 1000.
+    * trackMemory (:obj:`bool`): Whether to measure the peak python memory of the crawl. Default is True.
+
+    Return:
+
+    * :obj:`dict`: The ``environment``, the ``config``, the ``crawl`` result and the ``micro`` results, which could be written as json.
+
+    Raise:
+
+    * ValueError: ``crawler`` is not ``Crawler`` or ``AsyncCrawler``.
+    """
+    if crawler not in crawlerClasses:
+        raise ValueError(f'Crawler "{crawler}" is not one of {sorted(crawlerClasses)}')
+
+    config = {
+        'pages': pages,
+        'fanOut': fanOut,
+        'pageSize': pageSize,
+        'latency': latency,
+        'duplicateRatio': duplicateRatio,
+        'seed': seed,
+        'crawler': crawler,
+        'concurrency': concurrency,
+        'processes': processes,
+        'microSize': microSize,
+    }
+    crawlerArgs = {'concurrency': concurrency, 'processes': processes} if crawler == 'AsyncCrawler' else {}
+
+    site = SyntheticSite(pages=pages, fanOut=fanOut, pageSize=pageSize, latency=latency, duplicateRatio=duplicateRatio, seed=seed)
+    try:
+        crawlResult = benchmarkCrawl(site, crawler, trackMemory=trackMemory, **crawlerArgs)
+        micro = {
+            'WorkingListManager': benchmarkWorkingListManager(microSize),
+            'UrlMatcher': benchmarkUrlMatcher(microSize),
+            'Extractor': benchmarkExtractor(microSize, site),
+            'JsonRecorder': benchmarkJsonRecorder(microSize),
+        }
+    finally:
+        site.close()
+
+    return {'environment': environment(), 'config': config, 'crawl': crawlResult, 'micro': micro}
+
+def writeResults(results, path):
+    """The method of writing the results of the benchmarks as a json file.
+
+    Args:
+
+    * results (:obj:`dict`): The results returned from :obj:`runBenchmarks`.
+    * path (:obj:`str`): The path of the json file.
+    """
+    with open(path, 'wt') as fout:
+        fout.write(json.dumps(results, indent=2))
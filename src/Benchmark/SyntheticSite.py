@@ -0,0 +1,131 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import socket
+import random
+import time
+
+class SyntheticSite:
+    """The generated web site served by a local http server, so the crawler can be benchmarked without the internet and with the same pages on every run.
+
+    The pages are ``/page/{i}.html`` for ``i`` from 0 to ``pages - 1``. Each page links to the next page, so every page is reachable from ``/page/0.html``, and to ``fanOut - 1`` other pages chosen at random. A ``duplicateRatio`` of the links are other notations of a page already linked from the same page, with a fragment or a tracking parameter, which the crawler should take as the same work. Each page is padded with paragraphs to about ``pageSize`` bytes, and each response is delayed by ``latency`` seconds.
+
+    Attributes:
+
+    * pages (:obj:`int`): The amount of pages.
+    * fanOut (:obj:`int`): The amount of distinct pages linked from each page.
+    * pageSize (:obj:`int`): The approximate size of each page in bytes.
+    * latency (:obj:`float`): The seconds each response is delayed.
+    * duplicateRatio (:obj:`float`): The ratio of the links which are other notations of a linked page.
+    * documents (:obj:`dict`): The encoded html documents, keyed by path.
+    * requestCount (:obj:`int`): The amount of requests served.
+    * server (:obj:`ThreadingHTTPServer`): The http server.
+    * root (:obj:`str`): The root url of the server, for example ``http://127.0.0.1:8000``.
+
+    Args:
+
+    * pages (:obj:`int`): The amount of pages. Default is 200.
+    * fanOut (:obj:`int`): The amount of distinct pages linked from each page. Default is 10.
+    * pageSize (:obj:`int`): The approximate size of each page in bytes. Default is 20000.
+    * latency (:obj:`float`): The seconds each response is delayed. Default is 0.
+    * duplicateRatio (:obj:`float`): The ratio of the links which are other notations of a linked page. Default is 0.2.
+    * seed (:obj:`int`): The seed of generating the links. Default is 0.
+
+    Raise:
+
+    * ValueError: ``pages`` or ``fanOut`` is less than 1, or ``duplicateRatio`` is not between 0 and 1.
+    """
+    paragraph = 'Lorem ipsum dolor sit amet, consectetur adipisicing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. '
+
+    def __init__(self, pages=200, fanOut=10, pageSize=20000, latency=0, duplicateRatio=0.2, seed=0):
+        """The initial method of a synthetic site.
+        """
+        if pages < 1 or fanOut < 1:
+            raise ValueError('Arguments "pages" and "fanOut" must be at least 1')
+        if not 0 <= duplicateRatio < 1:
+            raise ValueError('Argument "duplicateRatio" must be between 0 and 1')
+
+        self.pages = pages
+        self.fanOut = fanOut
+        self.pageSize = pageSize
+        self.latency = latency
+        self.duplicateRatio = duplicateRatio
+        self.requestCount = 0
+        self.lock = threading.Lock()
+
+        rng = random.Random(seed)
+        self.documents = {f'/page/{i}.html': self.generatePage(i, rng).encode('utf-8') for i in range(pages)}
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)     # The headers and the body are written separately, so do not wait for the delayed ack.
+
+            def do_GET(self):
+                with site.lock:
+                    site.requestCount += 1
+                if site.latency:
+                    time.sleep(site.latency)
+
+                body = site.documents.get(self.path.split('?')[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.root = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def generatePage(self, i, rng):
+        """The method of generating the html document of a page.
+
+        Args:
+
+        * i (:obj:`int`): The index of the page.
+        * rng (:obj:`random.Random`): The random generator of the links.
+
+        Return:
+
+        * :obj:`str`: The html document.
+        """
+        targets = [(i + 1) % self.pages] + [rng.randrange(self.pages) for _ in range(self.fanOut - 1)]
+        links = [f'/page/{target}.html' for target in targets]
+
+        duplicates = round(len(links) * self.duplicateRatio / (1 - self.duplicateRatio))
+        for k in range(duplicates):
+            target = rng.choice(targets)
+            links.append(f'/page/{target}.html#part{k}' if k % 2 else f'/page/{target}.html?utm_source=bench{k}')
+        rng.shuffle(links)
+
+        head = f'<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1><ul>'
+        head += ''.join(f'<li><a href="{link}">link</a></li>' for link in links)
+        head += '</ul>'
+        tail = '</body></html>'
+        paragraphs = max(0, (self.pageSize - len(head) - len(tail)) // (len(self.paragraph) + 7))
+
+        return head + f'<p>{self.paragraph}</p>' * paragraphs + tail
+
+    @property
+    def startUrl(self):
+        """The url of the first page, from which every page is reachable.
+        """
+        return f'{self.root}/page/0.html'
+
+    def close(self):
+        """The method of shutting down the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: Benchmark
+   :synopsis: This module contains the offline benchmarks of the crawler: the synthetic site served locally, the end-to-end crawl benchmark, and the micro benchmarks. Run ``python -m Benchmark --help`` in ``src`` for the command line usage.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from .SyntheticSite import SyntheticSite
+from .Benchmarks import runBenchmarks, writeResults, benchmarkCrawl, benchmarkWorkingListManager, benchmarkUrlMatcher, benchmarkExtractor, benchmarkJsonRecorder
+
+__all__ = [
+    'SyntheticSite',
+    'runBenchmarks',
+    'writeResults',
+    'benchmarkCrawl',
+    'benchmarkWorkingListManager',
+    'benchmarkUrlMatcher',
+    'benchmarkExtractor',
+    'benchmarkJsonRecorder'
+]
@@ -0,0 +1,47 @@
+import argparse
+import json
+
+from .Benchmarks import runBenchmarks, writeResults
+
+def main(argv=None):
+    """The command line entry of the benchmarks. The results are printed as json, and written into ``--output`` if it is given.
+
+    Args:
+
+    * argv (:obj:`list`): The command line arguments. Default is ``sys.argv[1:]``.
+    """
+    parser = argparse.ArgumentParser(prog='python -m Benchmark', description='Benchmark the crawler on a local synthetic site.')
+    parser.add_argument('--pages', type=int, default=200, help='amount of pages of the site')
+    parser.add_argument('--fan-out', type=int, default=10, help='distinct pages linked from each page')
+    parser.add_argument('--page-size', type=int, default=20000, help='approximate bytes of each page')
+    parser.add_argument('--latency', type=float, default=0, help='seconds each response is delayed')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.2, help='ratio of links which are other notations of a linked page')
+    parser.add_argument('--seed', type=int, default=0, help='seed of generating the site')
+    parser.add_argument('--crawler', choices=['Crawler', 'AsyncCrawler'], default='Crawler', help='crawler class')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrency of the AsyncCrawler')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes of the AsyncCrawler')
+    parser.add_argument('--micro-size', type=int, default=1000, help='operations of each micro benchmark')
+    parser.add_argument('--no-memory', action='store_true', help='skip the crawl traced for the peak memory')
+    parser.add_argument('--output', default=None, help='path of the json file of the results')
+    args = parser.parse_args(argv)
+
+    results = runBenchmarks(
+        pages=args.pages,
+        fanOut=args.fan_out,
+        pageSize=args.page_size,
+        latency=args.latency,
+        duplicateRatio=args.duplicate_ratio,
+        seed=args.seed,
+        crawler=args.crawler,
+        concurrency=args.concurrency,
+        processes=args.processes,
+        microSize=args.micro_size,
+        trackMemory=not args.no_memory,
+    )
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        writeResults(results, args.output)
+
+if __name__ == '__main__':
+    main()
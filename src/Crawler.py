@@ -7,17 +7,24 @@
 
 """
 
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-import requests
+from urllib.parse import urlparse, urljoin
+from collections import deque
+from bs4.builder import builder_registry
 import time
-import re
 import os
 
-from Recorder import WorkingListManager
+from Recorder import WorkingListManager, LogRecorder, WriteBehind
 from UrlMatcher import UrlMatcher
 from Extractor import Extractor
 from Headers import getHeaders
+from LinkParser import findLinks, findBase
+from UrlCanonicalizer import UrlCanonicalizer
+from ParseStage import parseContent, decodeContent
+from HttpPool import HttpPool
+from HttpCache import HttpCache
+from StageTimer import StageTimer
+from MetricsServer import CrawlMetrics, MetricsServer
+from Profiler import CrawlProfiler
 
 class Crawler:
     """The main class of the crawler.
@@ -28,21 +35,48 @@ class Crawler:
 
     * WLM (:obj:`WorkingListManager`): The working list manager handling the working list during crawling.
     * UM (:obj:`UrlMatcher`): The url matcher to match links in each page with patterns specified by the initialization arguments.
+    * canonicalizer (:obj:`UrlCanonicalizer`): The url canonicalizer turning the links in each page into canonical urls before matching and adding them.
+    * httpPool (:obj:`HttpPool`): The http pool sending the web requests with kept-alive connections.
+    * httpCache (:obj:`HttpCache`): The http cache revalidating the web pages of the last crawl. None if the web pages are always downloaded.
     * extractors (:obj:`list`): The list of user defined extractors used to extract data from each web request.
     * autoAddInternalLinks (:obj:`bool`): Handle auto adding links matched the specified scheme, domain, path pattern.
     * curUrl (:obj:`str`): Record the current page url for each request of web page.
+    * curUnchanged (:obj:`bool`): Whether the current page is unchanged since the last crawl and its extracting is skipped.
     * startTime (:obj:`float`): Record the start time of crawling.
-    * log (:obj:`list`): The list of information returned during crawling.
+    * logRecorder (:obj:`LogRecorder`): The log recorder appending the information returned during crawling to the log file.
+    * log (:obj:`collections.deque`): The recent information returned during crawling. It is the record buffer of the log recorder.
     * logPath (:obj:`str`): The path of log file. Default is `./tmp/log.txt`.
+    * verbose (:obj:`bool`): Whether printing the information of each web page or not.
+    * parser (:obj:`str` or :obj:`callable`): The parser backend parsing each web page.
+    * timer (:obj:`StageTimer`): The stage timer measuring the time cost of each stage of crawling each page.
+    * metrics (:obj:`CrawlMetrics`): The counters of the web requests.
+    * metricsPort (:obj:`int`): The port of the metrics server. None means no server.
+    * metricsServer (:obj:`MetricsServer`): The local http server exposing the metrics in the Prometheus text format, started when the crawl starts. None if ``metricsPort`` is not set or the crawl has not started.
+    * profiler (:obj:`CrawlProfiler`): The profiler of a window of the crawl. None if the crawl is not profiled.
+    * hooks (:obj:`dict`): The pairs of callbacks called before and after the hookable methods, keyed by method name. See :obj:`addHook`.
+    * writeBehind (:obj:`WriteBehind`): The write-behind policy of the working list manager, the log recorder and the recorders of the extractors. None if they save at once.
 
     Args:
 
-        * workingList (:obj:`list`): A list of url strings. Default is an empty list.
+        * workingList (:obj:`list`): A list of url strings, which are turned into canonical urls by ``canonicalizer``. Default is an empty list.
         * scheme_pattern (:obj:`str`): The regular expression string of url scheme. For example, http, https, etc. Default is ``r'http|https'``.
         * domain_pattern (:obj:`str`): The regular expression string of url domain. Default is ``r'.*'``.
         * path_pattern (:obj:`str`): The regular expression string of url path. Default is ``r'.*'``.
         * extractors (:obj:`list`): A list of user defined extractors used to extract data from each web request. Default is an empty list.
         * autoAddInternalLinks (:obj:`bool`): Whether auto adding links matched the specified scheme, domain, path pattern or not. Default is True.
+        * httpPool (:obj:`HttpPool`): The http pool sending the web requests. Default is a new :obj:`HttpPool` with default settings.
+        * httpCache (:obj:`HttpCache`): The http cache sending conditional requests and reusing the web pages not modified since the last crawl. Default is None.
+        * urlMatcher (:obj:`UrlMatcher`): The url matcher used instead of building one with the patterns, for example a :obj:`RuleUrlMatcher`. Default is None.
+        * parser (:obj:`str` or :obj:`callable`): The parser backend. A string is the name of a BeautifulSoup tree builder, for example ``'html.parser'``, ``'lxml'`` or ``'html5lib'``. A callable is called with the raw bytes and the declared encoding of each web page, and its returned object is passed to the extractors as ``bs``, so it has to offer what the extracting methods use. Default is ``'html.parser'``.
+        * logRecorder (:obj:`LogRecorder`): The log recorder of the crawling log. Default is a new :obj:`LogRecorder` with default settings, which appends to ``./tmp/log.txt`` and keeps 100 recent entries in memory.
+        * verbose (:obj:`bool`): Whether printing the information of each web page or not. Default is True.
+        * canonicalizer (:obj:`UrlCanonicalizer`): The url canonicalizer of the links. Default is a new :obj:`UrlCanonicalizer` with default settings.
+        * timer (:obj:`StageTimer`): The stage timer. Default is a new :obj:`StageTimer` with default settings, which writes the summary into ``./tmp/timing.json`` every minute and when the crawl finishes.
+        * metricsPort (:obj:`int`): The port of a local http server exposing the metrics at ``http://127.0.0.1:{metricsPort}/metrics``, which is started when the crawl starts and closed when the crawl finishes. 0 means any free port. Default is None, which means no server.
+        * profiler (:obj:`CrawlProfiler`): The profiler started when the crawl starts, which writes ``./tmp/profile.pstats`` and ``./tmp/profile.collapsed`` by default when its window is over or the crawl finishes. Default is None.
+        * writeBehind (:obj:`WriteBehind`): The write-behind policy set to the working list manager, the log recorder and the recorders of the extractors, so the record files are saved in batches instead of on every page. The savings of all of them are counted together and done in the same flush, the working list manager last, so a page is never finished on disk before its records are written. The deferred savings are flushed when the crawl finishes. The files of a crawl stopped abruptly lag behind by the deferred savings, so a resumed crawl may process some pages again. Default is None.
+        * workingListManager (:obj:`WorkingListManager`): The working list manager used instead of building one, for example a :obj:`HostWorkingListManager` crawling each host politely. The works of ``workingList`` are added to it. Default is None.
+        * resume (:obj:`bool`): Whether to resume a stopped crawl from the files in ``./tmp``. The working list, the done list and the default log recorder continue from their files, and the pages being processed when the crawl stopped are crawled again. The works of ``workingList`` not seen before are added after the loaded ones. The extractors are built by the user, so build them with ``resume=True`` as well to continue their record files. Default is False.
 
     Raise:
 
@@ -53,13 +87,48 @@ class Crawler:
         * `domain_pattern`: The `domain_pattern` argument is defined and not a string.
         * `path_pattern`: The `path_pattern` argument is defined and not a string.
         * `autoAddInternalLinks`: The `autoAddInternalLinks` argument is defined and not a bool value.
+        * `httpPool`: The `httpPool` argument is defined and not a http pool.
+        * `httpCache`: The `httpCache` argument is defined and not a http cache.
+        * `timer`: The `timer` argument is defined and not a stage timer.
+        * `metricsPort`: The `metricsPort` argument is defined and not an integer.
+        * `profiler`: The `profiler` argument is defined and not a crawl profiler.
+        * `writeBehind`: The `writeBehind` argument is defined and not a write-behind policy.
+        * `urlMatcher`: The `urlMatcher` argument is defined and not a url matcher.
+        * `parser`: The `parser` argument is defined and neither a string nor a callable.
+        * `resume`: The `resume` argument is defined and not a bool value.
+        * `workingListManager`: The `workingListManager` argument is defined and not a working list manager.
+        * `canonicalizer`: The `canonicalizer` argument is defined and not a url canonicalizer.
+        * `logRecorder`: The `logRecorder` argument is defined and not a log recorder.
+        * `verbose`: The `verbose` argument is defined and not a bool value.
+
+    * ValueError
+        * `parser`: The `parser` argument is the name of a tree builder which is not installed.
     """
-    def __init__(self, workingList=None, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*', extractors=None, autoAddInternalLinks=True):
+    unchangedInfo = 'Unchanged since the last crawl, extracting skipped'
+    hookable = ('getPageBs', 'getPageHtml', 'fetchPage', 'extract', 'addNewWorks', 'printInfo')
+
+    def __init__(self, workingList=None, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*', extractors=None, autoAddInternalLinks=True, httpPool=None, logRecorder=None, verbose=True, urlMatcher=None, parser='html.parser', resume=False, workingListManager=None, canonicalizer=None, httpCache=None, timer=None, metricsPort=None, profiler=None, writeBehind=None):
         """The initial method of a crawler.
         """
+        if not isinstance(resume, bool):
+            raise TypeError('Argument "resume" must be a boolean value')
+
+        if canonicalizer is None:
+            canonicalizer = UrlCanonicalizer()
+        elif not isinstance(canonicalizer, UrlCanonicalizer):
+            raise TypeError('Argument "canonicalizer" must be a url canonicalizer')
+        self.canonicalizer = canonicalizer
+
         if workingList is None:
             workingList = []
-        self.WLM = WorkingListManager(workingList)
+        workingList = self.canonicalWorks(workingList)
+        if workingListManager is None:
+            workingListManager = WorkingListManager(workingList, resume=resume)
+        elif isinstance(workingListManager, WorkingListManager):
+            workingListManager.addWorks(workingList)
+        else:
+            raise TypeError('Argument "workingListManager" must be a working list manager')
+        self.WLM = workingListManager
         
         if extractors is None:
             extractors = []
@@ -77,16 +146,74 @@ class Crawler:
             raise TypeError('Domain pattern must be a string of regular expression')
         if not isinstance(path_pattern, str):
             raise TypeError('Url pattern must be a string of regular expression')
-        self.UM = UrlMatcher(scheme_pattern=scheme_pattern, domain_pattern=domain_pattern, path_pattern=path_pattern)
+        if urlMatcher is None:
+            urlMatcher = UrlMatcher(scheme_pattern=scheme_pattern, domain_pattern=domain_pattern, path_pattern=path_pattern)
+        elif not isinstance(urlMatcher, UrlMatcher):
+            raise TypeError('Argument "urlMatcher" must be a url matcher')
+        self.UM = urlMatcher
 
         if not isinstance(autoAddInternalLinks, bool):
             raise TypeError('Argument "autoAddInternalLinks" must be a boolean value')        
         self.autoAddInternalLinks = autoAddInternalLinks
+
+        if httpPool is None:
+            httpPool = HttpPool()
+        elif not isinstance(httpPool, HttpPool):
+            raise TypeError('Argument "httpPool" must be a http pool')
+        self.httpPool = httpPool
+
+        if httpCache is not None and not isinstance(httpCache, HttpCache):
+            raise TypeError('Argument "httpCache" must be a http cache')
+        self.httpCache = httpCache
+
+        if timer is None:
+            timer = StageTimer()
+        elif not isinstance(timer, StageTimer):
+            raise TypeError('Argument "timer" must be a stage timer')
+        self.timer = timer
+        for extractor in self.extractors:
+            extractor.timer = timer
+
+        if isinstance(parser, str):
+            if builder_registry.lookup(parser) is None:
+                raise ValueError(f'Parser "{parser}" is not installed')
+        elif not callable(parser):
+            raise TypeError('Argument "parser" must be a string or a callable')
+        self.parser = parser
+
+        if not isinstance(verbose, bool):
+            raise TypeError('Argument "verbose" must be a boolean value')
+        self.verbose = verbose
         
         self.curUrl = ''
+        self.curUnchanged = False
         self.startTime = time.time()
-        self.log = []
-        self.logPath = 'tmp/log.txt'
+
+        if logRecorder is None:
+            logRecorder = LogRecorder(resume=resume)
+        elif not isinstance(logRecorder, LogRecorder):
+            raise TypeError('Argument "logRecorder" must be a log recorder')
+        self.logRecorder = logRecorder
+        self.log = logRecorder.records
+        self.logPath = logRecorder.path
+
+        if metricsPort is not None and (not isinstance(metricsPort, int) or isinstance(metricsPort, bool)):
+            raise TypeError('Argument "metricsPort" must be an integer')
+        self.metrics = CrawlMetrics()
+        self.metricsPort = metricsPort
+        self.metricsServer = None
+
+        if profiler is not None and not isinstance(profiler, CrawlProfiler):
+            raise TypeError('Argument "profiler" must be a crawl profiler')
+        self.profiler = profiler
+        self.hooks = {}
+
+        if writeBehind is not None and not isinstance(writeBehind, WriteBehind):
+            raise TypeError('Argument "writeBehind" must be a write-behind policy')
+        self.writeBehind = writeBehind
+        if writeBehind is not None:
+            for recorder in [extractor.JsonRecorder for extractor in self.extractors] + [self.logRecorder, self.WLM]:
+                recorder.setWriteBehind(writeBehind)
         
         try:
             os.mkdir('tmp')
@@ -95,14 +222,32 @@ class Crawler:
         except Exception as e:
             print(e)
 
+    def canonicalWorks(self, workingList):
+        """The method of turning the url strings of a working list into canonical urls, the same as the links found in the web pages. A url which could not be canonicalized is kept as it is. The working list is returned as it is if it is not a list of strings, so the working list manager raises the error.
+
+        Args:
+
+        * workingList (:obj:`list`): A list of url strings.
+
+        Return:
+
+        * :obj:`list`: The list of canonical url strings, or a deque if the working list is a deque.
+        """
+        if not isinstance(workingList, (list, deque)) or not all(isinstance(url, str) for url in workingList):
+            return workingList
+
+        return type(workingList)(self.canonicalizer.join(url, '') or url for url in workingList)
+
     def extendWorkingList(self, workingList):
-        """The method of extending working list.
+        """The method of extending working list. The url strings are turned into canonical urls first.
         
         Args:
 
         * workingList (:obj:`list`): A list of url strings.
         """
-        self.WLM.addWorks(workingList)
+        workingList = self.canonicalWorks(workingList)
+        with self.timer.measure('frontier'):
+            self.WLM.addWorks(workingList)
 
     def setUrlPattern(self, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*'):
         """The method of setting patterns for url matcher.
@@ -123,9 +268,7 @@ class Crawler:
         if not isinstance(path_pattern, str):
             print('Url pattern must be a string of regular expression')
             return
-        self.UM.scheme_pattern = scheme_pattern
-        self.UM.domain_pattern = domain_pattern
-        self.UM.path_pattern = path_pattern
+        self.UM.setPatterns(scheme_pattern, domain_pattern, path_pattern)
 
     def addExtractors(self, extractors):
         """The method of adding extractors.
@@ -143,8 +286,94 @@ class Crawler:
                 print('Failed to add extractors: some elements are not extractors')
                 return
 
+        for e in extractors:
+            e.timer = self.timer
+            if self.writeBehind is not None:
+                e.JsonRecorder.setWriteBehind(self.writeBehind)
         self.extractors += extractors
 
+    def addHook(self, method, before=None, after=None):
+        """The method of adding callbacks called around a method of the crawl loop, so tracing could be attached without overwriting the method.
+
+        The hookable methods are ``getPageBs``, ``getPageHtml``, ``fetchPage``, ``extract``, ``addNewWorks`` and ``printInfo``. ``before`` is called as ``before(crawler, *args, **kwargs)`` with the arguments of the method, and ``after`` is called as ``after(crawler, result, *args, **kwargs)`` with the returned value as well. The callbacks of several hooks are called in the order they are added. An exception raised by a callback is printed and does not stop the crawl.
+
+        The :obj:`AsyncCrawler` fetches and parses the pages apart without calling ``getPageBs`` and ``getPageHtml``, so they are not hookable there; hook ``fetchPage`` or ``extract`` instead. The ``fetchPage`` hooks of the :obj:`AsyncCrawler` are called from its worker threads. If its pages are processed by worker processes, ``extract`` and ``addNewWorks`` are done in the workers and their hooks are not called.
+
+        Args:
+
+        * method (:obj:`str`): The name of the hooked method.
+        * before (:obj:`callable`): The callback called before the method. Default is None.
+        * after (:obj:`callable`): The callback called after the method. Default is None.
+
+        Raise:
+
+        * ValueError: ``method`` is not hookable by the crawler.
+        * TypeError: ``before`` or ``after`` is defined and not callable.
+
+        Example::
+
+            c.addHook('extract', before=lambda crawler, url, bs: print(f'Extracting {url}'))
+        """
+        if method not in self.hookable:
+            raise ValueError(f'Method "{method}" is not one of {", ".join(self.hookable)}')
+        if (before is not None and not callable(before)) or (after is not None and not callable(after)):
+            raise TypeError('Arguments "before" and "after" must be callable')
+
+        self.hooks.setdefault(method, []).append((before, after))
+
+    def clearHooks(self, method=None):
+        """The method of removing the hooks of a method.
+
+        Args:
+
+        * method (:obj:`str`): The name of the hooked method. Default is None, which means the hooks of all methods.
+        """
+        if method is None:
+            self.hooks.clear()
+        else:
+            self.hooks.pop(method, None)
+
+    def callHooked(self, method, *args, **kwargs):
+        """The method of calling a method of the crawler with its hooks.
+
+        Args:
+
+        * method (:obj:`str`): The name of the method.
+        * args, kwargs: The arguments of the method.
+
+        Return:
+
+        * The value returned from the method.
+        """
+        hooks = self.hooks.get(method)
+        if not hooks:
+            return getattr(self, method)(*args, **kwargs)
+
+        for before, _ in hooks:
+            if before is not None:
+                self.runHook(method, before, args, kwargs)
+        result = getattr(self, method)(*args, **kwargs)
+        for _, after in hooks:
+            if after is not None:
+                self.runHook(method, after, (result, ) + args, kwargs)
+
+        return result
+
+    def runHook(self, method, callback, args, kwargs):
+        """The method of calling a callback of a hook, printing the exception raised by it.
+
+        Args:
+
+        * method (:obj:`str`): The name of the hooked method.
+        * callback (:obj:`callable`): The callback.
+        * args (:obj:`tuple`): The positional arguments passed after the crawler.
+        * kwargs (:obj:`dict`): The keyword arguments.
+        """
+        try:
+            callback(self, *args, **kwargs)
+        except Exception as e:
+            print(f'Failed to run the hook of {method}: {e}')
+
     def getPageBs(self, url):
         """The method of getting a BeautifulSoup object of a web page.
 
@@ -152,17 +381,149 @@ class Crawler:
 
         * url (:obj:`str`): The url string of the attempted web page.
         """
-        print(f'Getting: {url}')
+        if self.verbose:
+            print(f'Getting: {url}')
         self.curUrl = url
+        req = self.callHooked('fetchPage', url)
+        self.curUnchanged = self.isUnchanged(req)
+
+        if req is None:
+            return None
+
+        return self.parsePage(req)
+
+    def getPageHtml(self, url):
+        """The method of getting the html text of a web page without parsing it.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the attempted web page.
+
+        Return:
+
+        * :obj:`str`: The html text of the web page.
+        * :obj:`None`: None if the request failed.
+        """
+        if self.verbose:
+            print(f'Getting: {url}')
+        self.curUrl = url
+        req = self.callHooked('fetchPage', url)
+        self.curUnchanged = self.isUnchanged(req)
+
+        if req is None:
+            return None
+
+        return self.decodePage(req)
+
+    def treeNeeded(self):
+        """The method of checking whether the pages have to be parsed into BeautifulSoup objects.
+
+        The full parse is skipped only if no extractor needs the tree and :obj:`addNewWorks` is not overwritten. In that case, the extractors and :obj:`addNewWorks` receive the html text of each page instead of a BeautifulSoup object, and the links are found by :obj:`LinkParser.findLinks`.
+
+        Return:
+
+        * :obj:`bool`: True if the pages have to be parsed, False otherwise.
+        """
+        if type(self).addNewWorks is not Crawler.addNewWorks:
+            return True
+
+        return any(extractor.needsTree for extractor in self.extractors)
+
+    def fetchPage(self, url):
+        """The method of sending the web request of a web page. It does not touch any state of the crawler, so it is safe to be called from worker threads.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the attempted web page.
+
+        Return:
+
+        * :obj:`requests.Response`: The response of the web request.
+        * :obj:`None`: None if the request failed.
+        """
         pr = urlparse(url)
+        start = time.perf_counter()
+        self.metrics.startRequest()
+        req = None
         try:
-            req = requests.get(url, headers=getHeaders(pr.netloc, url))
+            if self.httpCache is not None:
+                req = self.httpCache.get(url, self.httpPool.get, headers=getHeaders(pr.netloc, url), key=self.canonicalizer.join(url, ''))
+            else:
+                req = self.httpPool.get(url, headers=getHeaders(pr.netloc, url))
 
         except Exception as e:
             print(f'Failed to get {url}: {e}')
             return None
 
-        return BeautifulSoup(req.text, 'html.parser')
+        finally:
+            self.timer.add('fetch', time.perf_counter() - start)
+            self.metrics.finishRequest(pr.hostname or pr.netloc, req)
+
+        elapsed = getattr(req, 'elapsed', None)
+        if elapsed is not None:
+            ttfb = elapsed.total_seconds()      # Until the headers are parsed
+            self.timer.add('fetch.ttfb', ttfb)
+            self.timer.add('fetch.download', max(0.0, time.perf_counter() - start - ttfb))
+
+        return req
+
+    def isUnchanged(self, req):
+        """The method of checking whether the extracting of a web page is skipped, because the page is unchanged since the last crawl and the http cache is set to skip unchanged pages.
+
+        Args:
+
+        * req (:obj:`requests.Response`): The response returned from :obj:`fetchPage`. It is None if the request failed.
+
+        Return:
+
+        * :obj:`bool`: True if the extracting is skipped, False otherwise.
+        """
+        return self.httpCache is not None and self.httpCache.skipUnchanged and getattr(req, 'unchanged', False)
+
+    def parsePage(self, req):
+        """The method of parsing the response of a web request into a BeautifulSoup object with the parser backend. The raw bytes are parsed with the encoding declared in the response headers, so the text is not decoded twice; if no encoding is declared, the parser detects it from the document.
+
+        Args:
+
+        * req (:obj:`requests.Response`): The response returned from :obj:`fetchPage`.
+
+        Return:
+
+        * :obj:`BeautifulSoup`: The BeautifulSoup object of the web page, or the object returned from the callable parser.
+        """
+        with self.timer.measure('parse'):
+            return parseContent(req.content, self.declaredEncoding(req), self.parser)
+
+    def decodePage(self, req):
+        """The method of decoding the response of a web request into the html text without parsing it. The text is decoded in the same way as :obj:`parsePage`, so the extractors see the same text whether the tree is built or not.
+
+        Args:
+
+        * req (:obj:`requests.Response`): The response returned from :obj:`fetchPage`.
+
+        Return:
+
+        * :obj:`str`: The html text of the web page.
+        """
+        with self.timer.measure('parse'):
+            return decodeContent(req.content, self.declaredEncoding(req))
+
+    def declaredEncoding(self, req):
+        """The method of getting the encoding declared in the ``Content-Type`` header of a response.
+
+        Args:
+
+        * req (:obj:`requests.Response`): The response of a web request.
+
+        Return:
+
+        * :obj:`str`: The declared encoding.
+        * :obj:`None`: None if no encoding is declared.
+        """
+        if 'charset=' not in req.headers.get('Content-Type', '').lower():
+            return None
+
+        return req.encoding
 
     def extract(self, url, bs):
         """The method of extracting data from BeartifulSoup object and corresponding url.
@@ -175,8 +536,10 @@ class Crawler:
         extractInfo = []
 
         for extractor in self.extractors:
-            msg = extractor.extract(url, bs)
-            extractInfo.append(msg)
+            with self.timer.measure(f'extract.{extractor.name}'):
+                dataset, msgs = extractor.extractData(url, bs)
+            with self.timer.measure('record'):
+                extractInfo.append(extractor.recordData(dataset, msgs))
 
         return '\n'.join(extractInfo)
 
@@ -190,26 +553,58 @@ class Crawler:
         Args:
 
         * url (:obj:`str`): The url string of the corresponding web page.
-        * bs (:obj:`BeautifulSoup`) The BeautifulSoup object of the corresponding web page.
+        * bs (:obj:`BeautifulSoup`) The BeautifulSoup object of the corresponding web page. It could be the html text of the web page as well.
         """
         if not self.autoAddInternalLinks:
             return
 
         try:        
-            links = (elem['href'] for elem in bs.findAll('a', href=re.compile(r'.+')))      # Get all href of all links from BeautifulSoup object.
-            pr = urlparse(url)
-            links = (f'{pr.scheme}://{pr.netloc}{link}' if link.startswith('/') else link for link in links)        # Complete the relatively notated urls.
-            internalLinks = [link for link in links if self.UM.isIncluded(link)]        # Filt out the internal links
-            self.extendWorkingList(internalLinks)
+            links = self.getLinks(bs)       # Get all href of all links from BeautifulSoup object or html text.
+            base = findBase(bs)
+        except Exception as e:
+            print(f'Failed to add new works: {e}')
+            return
+
+        self.addLinks(url, links, base)
+
+    def addLinks(self, url, links, base=None):
+        """The method of turning the links of a web page into canonical urls, and adding the ones matched by the url matcher as new works.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the corresponding web page.
+        * links (:obj:`list`): The ``href`` strings of the links of the web page.
+        * base (:obj:`str`): The ``href`` of the ``<base>`` tag of the web page. Default is None.
+        """
+        try:
+            if base:
+                url = urljoin(url, base)
+            links = (self.canonicalizer.join(url, link) for link in links)        # Complete the relatively notated urls.
+            internalLinks = [link for link in links if link and self.UM.isIncluded(link)]        # Filt out the internal links
+            with self.timer.measure('frontier'):
+                self.WLM.addWorks(internalLinks)        # Already canonical
         except Exception as e:
             print(f'Failed to add new works: {e}')
 
+    def getLinks(self, bs):
+        """The method of getting the ``href`` of all links of a web page.
+
+        Args:
+
+        * bs (:obj:`BeautifulSoup`) The BeautifulSoup object of the web page, or the html text of the web page.
+
+        Return:
+
+        * :obj:`list`: The list of not empty ``href`` strings.
+        """
+        return findLinks(bs)
+
     def printInfo(self, extractInfo=''):
         """The method of printing and recording information during crawling.
 
         The information includes the extracting result return from the extractors and the remained work amount.
 
-        The record path is ``./tmp/log.txt`` by default.
+        The information is appended to the log file by the log recorder, whose path is ``./tmp/log.txt`` by default. It is printed only if ``verbose`` is set True.
 
         Args:
 
@@ -220,31 +615,69 @@ class Crawler:
             f'Remained Work Amount: {self.WLM.remainedAmount()}',
             '-'*20
         ])
-        print(text) 
+        if self.verbose:
+            print(text)
         
-        self.log.append(text)
-        self.saveLog()
+        self.logRecorder.addRecord(text)
     
     def saveLog(self):
-        """The method of saving logs.
+        """The method of saving the unsaved logs to the log file.
         """
-        try:
-            with open(self.logPath, 'wt') as fout:
-                fout.write('\n'.join(self.log))
-
-        except Exception as e:
-            print(f'Failed to save log: {e}')
-        
+        self.logRecorder.save()
 
     def crawl(self):
-        """The main method of crawling.
+        """The main method of crawling. The crawl is finished by :obj:`finish` even if it stops with an exception, for example when it is interrupted by Ctrl-C.
+        """
+        self.start()
+        try:
+            while self.WLM.workExists():
+                with self.timer.measure('queue'):
+                    url = self.WLM.getWork()
+                if url is None:
+                    time.sleep(self.WLM.waitTime() or 0)        # No work is ready yet, for example a host crawled politely.
+                    continue
+
+                pageBs = self.callHooked('getPageBs', url) if self.treeNeeded() else self.callHooked('getPageHtml', url)
+                extractInfo = self.unchangedInfo if self.curUnchanged else self.callHooked('extract', url, pageBs)
+                with self.timer.measure('links'):
+                    self.callHooked('addNewWorks', **{'url': url, 'bs': pageBs})
+                with self.timer.measure('log'):
+                    self.callHooked('printInfo', extractInfo)
+                with self.timer.measure('frontier'):
+                    self.WLM.finishWork(url)
+                self.timer.dumpIfDue()
+                if self.profiler is not None:
+                    self.profiler.pageDone()
+
+        finally:
+            self.finish()
+
+    def start(self):
+        """The method of starting a crawl. The profiling is started, and the metrics server is started if ``metricsPort`` is set.
         """
-        while self.WLM.workExists():
-            url = self.WLM.getWork()
-            pageBs = self.getPageBs(url)
-            extractInfo = self.extract(url, pageBs)
-            self.addNewWorks(**{'url': url, 'bs': pageBs})
-            self.printInfo(extractInfo)
+        if self.profiler is not None:
+            self.profiler.start()
+        if self.metricsPort is not None and (self.metricsServer is None or not self.metricsServer.thread.is_alive()):
+            self.metricsServer = MetricsServer(self, port=self.metricsPort)
 
-        print('Working List is clear. Done.')
+    def finish(self):
+        """The method of finishing a crawl, called when the crawl finishes or stops with an exception. The profiling is stopped, the unsaved records of the extractors are saved, the deferred savings of the recorders are flushed, the working list manager is closed, the summary of the stage timer is written, the metrics server is closed, and the time cost is printed.
+        """
+        if self.profiler is not None:
+            self.profiler.stop()
+        for extractor in self.extractors:
+            extractor.JsonRecorder.save()
+        self.saveLog()
+        if self.writeBehind is not None:
+            for recorder in [extractor.JsonRecorder for extractor in self.extractors] + [self.logRecorder]:
+                recorder.close()
+        self.WLM.close()        # Also closes the seen set of a spilling working list manager
+        self.timer.dump()
+        if self.metricsServer is not None:
+            self.metricsServer.close()
+
+        if self.WLM.workExists():
+            print(f'Stopped with {self.WLM.remainedAmount()} works remained.')
+        else:
+            print('Working List is clear. Done.')
         print(f'Time cost: {time.time() - self.startTime}')
\ No newline at end of file
@@ -7,6 +7,8 @@
 
 """
 
+import time
+
 from Recorder import JsonRecorder
 
 
@@ -15,11 +17,17 @@ class Extractor:
 
     Attributes:
 
-    * JesonRecorder (:obj:`JsonRecorder`): The json recorder recording the data into a json file.
+    * JesonRecorder (:obj:`JsonRecorder`): The json recorder recording the data into a json file. It is an instance of the class attribute ``recorderClass``.
+    * needsTree (:obj:`bool`): Whether the extracting methods need the BeautifulSoup object of each page. Default is True. Set it False on a subclass whose extracting methods only use the url or the html text; if no extractor of a crawler needs the tree, the crawler skips building the BeautifulSoup object and the extracting methods receive the html text as ``bs``.
+    * recorderClass (:obj:`type`): The class of the recorder. Default is :obj:`JsonRecorder`. Set it :obj:`JsonLinesRecorder` on a subclass to append each record as a json line instead of rewriting the whole json file.
+    * extractingMethodNames (:obj:`tuple`): The sorted names of the extracting methods of the class. It is found once when the subclass is created.
+    * extractingMethods (:obj:`list`): The pairs of attribute name and decorated extracting method. The methods are decorated once at the initialization.
+    * timer (:obj:`StageTimer`): The stage timer measuring each extracting method as the stage ``extract.{name}.{attribute name}``. It is set by the crawler. None if the extracting methods are not measured.
 
     Args:
 
     * name (:obj:`str`): The name of the extractor.
+    * resume (:obj:`bool`): Whether the recorder resumes from the existing record file instead of overwriting it. Default is False.
 
     Example::
 
@@ -35,12 +43,45 @@ class Extractor:
                 data = data.title.get_text()      # The method could be multiple lines
                 msg  = ''
                 return data, msg
+
+    To write the records as json lines::
+
+        class myExtractor(Extractor):
+            recorderClass = JsonLinesRecorder
     """
-    def __init__(self, name):
+    recorderClass = JsonRecorder
+    needsTree = True
+    timer = None
+    extractingMethodNames = ()
+    jsonSerializableTypes = frozenset([dict, list, tuple, str, int, float, bool, type(None)])
+
+    def __init_subclass__(cls, **kwargs):
+        """The hook finding the extracting methods, which have names starting with ``get_``, once for each subclass.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.extractingMethodNames = tuple(name for name in dir(cls) if name.startswith('get_') and callable(getattr(cls, name)))
+
+    def __init__(self, name, resume=False):
         """The initial method of an Extractor.
         """
         self.name = name
-        self.JsonRecorder = JsonRecorder(name)
+        self.JsonRecorder = self.recorderClass(name, resume=resume)
+        self.extractingMethods = [(funcName[4:], self.get(getattr(self, funcName))) for funcName in self.extractingMethodNames]
+
+    def __getstate__(self):
+        """The method of pickling an extractor, for sending it to a worker process. The json recorder, the stage timer and the decorated extracting methods are not pickled.
+        """
+        state = self.__dict__.copy()
+        state['JsonRecorder'] = None
+        state['timer'] = None
+        state['extractingMethods'] = None
+        return state
+
+    def __setstate__(self, state):
+        """The method of unpickling an extractor. The extracting methods are decorated again, and the extractor has no json recorder.
+        """
+        self.__dict__.update(state)
+        self.extractingMethods = [(funcName[4:], self.get(getattr(self, funcName))) for funcName in self.extractingMethodNames]
 
     def get(self, extractFunc):
         """The decorator to decorate user-defined extracting method. It would wrap the input method with a ``try...except`` structure, and return the attempted data and message. If no exception raised, the return message would combine the returned message of the input method and the default message, which has a format ``Get {attribute name}: {data}``, with a ``'\\n'``.
@@ -57,10 +98,11 @@ class Extractor:
 
         if not callable(extractFunc):
             return None
+
+        attrName = extractFunc.__name__[4:]
             
         def get_attr(*args, **kwargs):
         
-            attrName  = extractFunc.__name__[4:]
             data, msg = '', ''
             
             try:
@@ -86,17 +128,46 @@ class Extractor:
 
         * :obj:`str`: The messages returned from each data extracting method joined with ``'\\n'``.
         """
+        dataset, msgs = self.extractData(url, bs)
+        return self.recordData(dataset, msgs)
 
-        jsonSerializablTypes = [dict, list, tuple, str, int, float, bool, type(None)]
-        dataset, msgs = {}, []
+    def recordData(self, dataset, msgs):
+        """The method of adding the extracted data as a record into the json recorder.
+
+        Args:
 
-        for func in (getattr(self, funcName) for funcName in dir(self) if funcName.startswith('get_')):
-            attr = func.__name__[4:]
+        * dataset (:obj:`dict`): The extracted data keyed by attribute name.
+        * msgs (:obj:`list`): The messages returned from each data extracting method.
 
+        Return:
+
+        * :obj:`str`: The messages joined with ``'\\n'``.
+        """
+        self.JsonRecorder.addRecord(dataset)
+
+        return '\n'.join(msgs)
+
+    def extractData(self, url, bs):
+        """The method of running all the extractor's extracting method without recording.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * bs (:obj:`BeautifulSoup`): The :obj:`BeautifulSoup` object of the web page.
+
+        Return:
+
+        * :obj:`dict`: The extracted data keyed by attribute name.
+        * :obj:`list`: The messages returned from each data extracting method.
+        """
+        dataset, msgs = {}, []
+
+        for attr, func in self.extractingMethods:
+            start = time.perf_counter()
             try:
-                data, msg = self.get(func)(url, bs)
+                data, msg = func(url, bs)
 
-                if type(data) not in jsonSerializablTypes:
+                if type(data) not in self.jsonSerializableTypes:
                     data = str(data)        # If the returned data is not json serializable, convert it into a string.
 
                 dataset[attr] = data
@@ -104,7 +175,8 @@ class Extractor:
 
             except Exception as e:
                 msgs.append(f'Failed to run the extracting method {attr} of extractor {self.name}: {e}')
-        
-        self.JsonRecorder.addRecord(dataset)
 
-        return '\n'.join(msgs)
\ No newline at end of file
+            if self.timer is not None:
+                self.timer.add(f'extract.{self.name}.{attr}', time.perf_counter() - start)
+
+        return dataset, msgs
\ No newline at end of file
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: HttpCache
+   :synopsis: This module contains the http cache revalidating the web pages of the last crawl with conditional requests.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import threading
+import requests
+import hashlib
+import sqlite3
+import json
+
+class HttpCache:
+    """The device to keep the web pages of the last crawl on disk, so that a recrawl downloads only the pages changed since then.
+
+    The ``ETag`` and ``Last-Modified`` headers, the other headers and the body of each successful response are kept in a sqlite database, keyed by the canonical url of the web page. When the page is requested again, ``If-None-Match`` and ``If-Modified-Since`` are sent with the kept validators. If the server answers ``304 Not Modified``, the kept body is reused as a ``200`` response without downloading it again.
+
+    A page is unchanged if the server answers ``304``, or if the digest of the downloaded body is the same as the kept one. The returned response has the attributes ``fromCache`` and ``unchanged``. If ``skipUnchanged`` is set, the crawler skips extracting the unchanged pages, while their links are still added.
+
+    Attributes:
+
+    * path (:obj:`str`): The path of the database file.
+    * skipUnchanged (:obj:`bool`): Whether the crawler skips extracting the unchanged pages.
+    * connection (:obj:`sqlite3.Connection`): The connection to the database.
+    * hits (:obj:`int`): The amount of responses reused from the cache.
+    * misses (:obj:`int`): The amount of responses downloaded.
+    * unchanged (:obj:`int`): The amount of unchanged pages, including the reused ones.
+
+    Args:
+
+    * path (:obj:`str`): The path of the database file. Default is ``tmp/httpCache.sqlite``.
+    * skipUnchanged (:obj:`bool`): Whether the crawler skips extracting the unchanged pages. Default is False.
+
+    Raise:
+
+    * TypeError: ``path`` is not a string, or ``skipUnchanged`` is not a boolean value.
+    """
+    keptHeaders = ('ETag', 'Last-Modified', 'Date', 'Expires', 'Cache-Control')
+
+    def __init__(self, path='tmp/httpCache.sqlite', skipUnchanged=False):
+        """The initial method of a http cache.
+        """
+        if not isinstance(path, str):
+            raise TypeError('Argument "path" must be a string')
+        if not isinstance(skipUnchanged, bool):
+            raise TypeError('Argument "skipUnchanged" must be a boolean value')
+
+        self.path = path
+        self.skipUnchanged = skipUnchanged
+        self.hits = 0
+        self.misses = 0
+        self.unchanged = 0
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)        # Web requests are sent from worker threads.
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, lastModified TEXT, digest TEXT, headers TEXT, content BLOB) WITHOUT ROWID')
+
+    @staticmethod
+    def digest(content):
+        """The method of getting the digest of the body of a web page.
+
+        Args:
+
+        * content (:obj:`bytes`): The body of the web page.
+
+        Return:
+
+        * :obj:`str`: The hex digest.
+        """
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def lookup(self, key):
+        """The method of getting the kept entry of a web page.
+
+        Args:
+
+        * key (:obj:`str`): The canonical url of the web page.
+
+        Return:
+
+        * :obj:`dict`: The entry with ``etag``, ``lastModified``, ``digest``, ``headers`` and ``content``. None if the page is not kept.
+        """
+        with self.lock:
+            row = self.connection.execute('SELECT etag, lastModified, digest, headers, content FROM pages WHERE url = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        return dict(zip(('etag', 'lastModified', 'digest', 'headers', 'content'), row))
+
+    def store(self, key, req, digest):
+        """The method of keeping a successful response. A response with ``Cache-Control: no-store`` is not kept.
+
+        Args:
+
+        * key (:obj:`str`): The canonical url of the web page.
+        * req (:obj:`requests.Response`): The response.
+        * digest (:obj:`str`): The digest of the body.
+        """
+        if 'no-store' in req.headers.get('Cache-Control', '').lower():
+            return
+
+        with self.lock:
+            self.connection.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)', (
+                key,
+                req.headers.get('ETag'),
+                req.headers.get('Last-Modified'),
+                digest,
+                json.dumps(dict(req.headers)),
+                req.content,
+            ))
+            self.connection.commit()
+
+    def refresh(self, key, req):
+        """The method of keeping the refreshed validators and headers of a revalidated entry, or of an entry whose body is the same as the kept one. The kept body and digest are not written again.
+
+        Args:
+
+        * key (:obj:`str`): The canonical url of the web page.
+        * req (:obj:`requests.Response`): The response built by :obj:`cachedResponse`, or the ``200`` response with the same body.
+        """
+        with self.lock:
+            self.connection.execute('UPDATE pages SET etag=?, lastModified=?, headers=? WHERE url=?', (
+                req.headers.get('ETag'),
+                req.headers.get('Last-Modified'),
+                json.dumps(dict(req.headers)),
+                key,
+            ))
+            self.connection.commit()
+
+    def cachedResponse(self, entry, req):
+        """The method of building a ``200`` response from a kept entry and the ``304`` response revalidating it. The validators sent with the ``304`` response replace the kept ones.
+
+        Args:
+
+        * entry (:obj:`dict`): The kept entry.
+        * req (:obj:`requests.Response`): The ``304`` response.
+
+        Return:
+
+        * :obj:`requests.Response`: The response with the kept body.
+        """
+        res = requests.Response()
+        res.status_code = 200
+        res.reason = 'OK'
+        res.url = req.url
+        res.request = req.request
+        res.elapsed = req.elapsed
+        res.headers = CaseInsensitiveDict(json.loads(entry['headers']))
+        res.headers.update({name: req.headers[name] for name in self.keptHeaders if name in req.headers})
+        res.encoding = get_encoding_from_headers(res.headers)
+        res._content = entry['content']
+        return res
+
+    def get(self, url, send, headers=None, key=None):
+        """The method of sending a conditional GET request of a web page, and reusing the kept body if the page is not modified.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * send (:obj:`callable`): The method sending the web request, called with the url and the headers, for example :obj:`HttpPool.get`.
+        * headers (:obj:`dict`): The headers of the web request. Default is None.
+        * key (:obj:`str`): The canonical url of the web page. Default is ``url``.
+
+        Return:
+
+        * :obj:`requests.Response`: The response, with the attributes ``fromCache`` and ``unchanged``.
+        """
+        key = key or url
+        entry = self.lookup(key)
+        headers = dict(headers or {})
+
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['lastModified']:
+                headers['If-Modified-Since'] = entry['lastModified']
+
+        req = send(url, headers=headers)
+
+        if req.status_code == 304 and entry is not None:
+            req = self.cachedResponse(entry, req)
+            req.fromCache = req.unchanged = True
+            with self.lock:
+                self.hits += 1
+                self.unchanged += 1
+            if any(name in req.headers for name in ('ETag', 'Last-Modified')):
+                self.refresh(key, req)       # Keep the refreshed validators.
+            return req
+
+        req.fromCache = False
+        req.unchanged = False
+        with self.lock:
+            self.misses += 1
+
+        if req.status_code == 200:
+            digest = self.digest(req.content)
+            req.unchanged = entry is not None and entry['digest'] == digest
+            if req.unchanged:
+                with self.lock:
+                    self.unchanged += 1
+                self.refresh(key, req)       # The kept body is the same.
+            else:
+                self.store(key, req, digest)
+
+        return req
+
+    def stats(self):
+        """The method of getting the statistics of the cache.
+
+        Return:
+
+        * :obj:`dict`: The amount of ``hits``, ``misses`` and ``unchanged`` pages.
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'unchanged': self.unchanged}
+
+    def close(self):
+        """The method of committing and closing the database.
+        """
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: HttpPool
+   :synopsis: This module contains the http pool keeping connections alive across web requests.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+import threading
+import requests
+import time
+
+class HttpPool:
+    """The device to send web requests through a :obj:`requests.Session`, so that the connections of each host are kept alive and reused across the whole crawl instead of doing a new TCP and TLS handshake for each web page.
+
+    Each host has its own connection pool. The connection pool of a host which has not been used for ``idleTimeout`` seconds is closed.
+
+    Attributes:
+
+    * session (:obj:`requests.Session`): The session sending the web requests.
+    * adapter (:obj:`requests.adapters.HTTPAdapter`): The adapter holding the connection pools.
+    * poolConnections (:obj:`int`): The maximum amount of hosts whose connection pools are kept.
+    * poolMaxsize (:obj:`int`): The maximum amount of idle connections kept for each host.
+    * idleTimeout (:obj:`float`): The seconds a connection pool may be unused before it is closed.
+    * lastUsed (:obj:`dict`): The time each host was last requested, keyed by ``(scheme, host, port)``.
+
+    Args:
+
+    * poolConnections (:obj:`int`): The maximum amount of hosts whose connection pools are kept. Default is 10.
+    * poolMaxsize (:obj:`int`): The maximum amount of idle connections kept for each host. Default is 10.
+    * idleTimeout (:obj:`float`): The seconds a connection pool may be unused before it is closed. Default is 60.
+
+    Raise:
+
+    * TypeError: Some arguments are not numbers.
+    """
+    defaultPorts = {'http': 80, 'https': 443}
+
+    def __init__(self, poolConnections=10, poolMaxsize=10, idleTimeout=60):
+        """The initial method of a http pool.
+        """
+        if not isinstance(poolConnections, int):
+            raise TypeError('Argument "poolConnections" must be an integer')
+        if not isinstance(poolMaxsize, int):
+            raise TypeError('Argument "poolMaxsize" must be an integer')
+        if not isinstance(idleTimeout, (int, float)):
+            raise TypeError('Argument "idleTimeout" must be a number')
+
+        self.poolConnections = poolConnections
+        self.poolMaxsize = poolMaxsize
+        self.idleTimeout = idleTimeout
+        self.lastUsed = {}
+        self.lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=poolConnections, pool_maxsize=poolMaxsize)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+    def hostKey(self, url):
+        """The method of getting the key of the host of a url.
+
+        Args:
+
+        * url (:obj:`str`): The url string.
+
+        Return:
+
+        * :obj:`tuple`: The tuple of scheme, host and port.
+        """
+        pr = urlparse(url)
+        scheme = pr.scheme.lower()
+        return scheme, (pr.hostname or '').lower(), pr.port or self.defaultPorts.get(scheme)
+
+    def get(self, url, **kwargs):
+        """The method of sending a GET request through the session. The connection pools idle for too long are closed before sending.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the attempted web page.
+        * kwargs: The other arguments passed to :obj:`requests.Session.get`.
+
+        Return:
+
+        * :obj:`requests.Response`: The response of the web request.
+        """
+        now = time.time()
+        self.closeIdle(now)
+
+        with self.lock:
+            self.lastUsed[self.hostKey(url)] = now
+
+        return self.session.get(url, **kwargs)
+
+    def closeIdle(self, now=None):
+        """The method of closing the connection pools of the hosts which have not been requested for ``idleTimeout`` seconds.
+
+        Args:
+
+        * now (:obj:`float`): The current time. Default is the time of calling.
+        """
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            idleHosts = {key for key, t in self.lastUsed.items() if now - t >= self.idleTimeout}
+            for key in idleHosts:
+                del self.lastUsed[key]
+
+        if not idleHosts:
+            return
+
+        pools = self.adapter.poolmanager.pools
+        for poolKey in list(pools.keys()):
+            if (poolKey.key_scheme, poolKey.key_host, poolKey.key_port) in idleHosts:
+                pools.pop(poolKey, None)        # The pool manager closes the connections of a removed pool.
+
+    def stats(self):
+        """The method of getting the statistics of the connection pools.
+
+        Return:
+
+        * :obj:`dict`: The statistics of each host, keyed by ``{scheme}://{host}:{port}``. Each value is a dict with the amount of ``requests`` sent, ``connections`` opened, and ``idle`` connections kept.
+        """
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+
+        for poolKey in list(pools.keys()):
+            pool = pools.get(poolKey)
+            if pool is None:
+                continue
+
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            stats[f'{poolKey.key_scheme}://{poolKey.key_host}:{poolKey.key_port}'] = {
+                'requests': pool.num_requests,
+                'connections': pool.num_connections,
+                'idle': idle,
+            }
+
+        return stats
+
+    def close(self):
+        """The method of closing the session and all its connections.
+        """
+        self.session.close()
+        with self.lock:
+            self.lastUsed.clear()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: LinkParser
+   :synopsis: This module contains the link parser finding links in a html document without building a tree.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from html.parser import HTMLParser
+import re
+
+class LinkParser(HTMLParser):
+    """The streaming parser collecting the ``href`` of each ``<a>`` tag. It only tokenizes the html document and never builds a tree, so it is much cheaper than a :obj:`BeautifulSoup` object when only the links are needed.
+
+    Attributes:
+
+    * links (:obj:`list`): The list of collected ``href`` strings, in document order. Empty ``href`` are skipped.
+    """
+    def __init__(self):
+        """The initial method of a link parser.
+        """
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        """The method handling each start tag. The ``href`` of an ``<a>`` tag is collected.
+        """
+        if tag != 'a':
+            return
+
+        for name, value in attrs:
+            if name == 'href':
+                if value:
+                    self.links.append(value)
+                return
+
+def extractLinks(html):
+    """The method of collecting the ``href`` of each ``<a>`` tag in a html document.
+
+    Args:
+
+    * html (:obj:`str`): The html document.
+
+    Return:
+
+    * :obj:`list`: The list of ``href`` strings, in document order.
+    """
+    parser = LinkParser()
+    parser.feed(html)
+    parser.close()
+    return parser.links
+
+def findLinks(bs):
+    """The method of collecting the ``href`` of each ``<a>`` tag from a BeautifulSoup object or a html document.
+
+    Args:
+
+    * bs (:obj:`BeautifulSoup`): The BeautifulSoup object of a web page, or the html text of the web page.
+
+    Return:
+
+    * :obj:`list`: The list of not empty ``href`` strings, in document order.
+    """
+    if isinstance(bs, str):
+        return extractLinks(bs)
+
+    return [elem['href'] for elem in bs.find_all('a', href=True) if elem['href']]
+
+baseRegex = re.compile(r'<base\s[^>]*?href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+def findBase(bs):
+    """The method of finding the ``href`` of the ``<base>`` tag from a BeautifulSoup object or a html document. The links of the web page are relative to it instead of the url of the web page.
+
+    Args:
+
+    * bs (:obj:`BeautifulSoup`): The BeautifulSoup object of a web page, or the html text of the web page.
+
+    Return:
+
+    * :obj:`str`: The ``href`` of the ``<base>`` tag. None if there is no ``<base>`` tag with a ``href``.
+    """
+    if isinstance(bs, str):
+        m = baseRegex.search(bs)
+        return next((group for group in m.groups() if group is not None), None) if m else None
+
+    elem = bs.find('base', href=True)
+    return elem['href'] if elem is not None else None
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: MetricsServer
+   :synopsis: This module contains the crawl metrics and the http server exposing them in the Prometheus text format.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from collections import deque
+import threading
+import time
+import sys
+import os
+
+class CrawlMetrics:
+    """The counters of the web requests of a crawler. They are updated by :obj:`Crawler.fetchPage`, which may be called from worker threads.
+
+    Attributes:
+
+    * pages (:obj:`int`): The amount of web requests finished.
+    * bytes (:obj:`int`): The amount of bytes downloaded. The bodies reused from a http cache are not counted.
+    * errors (:obj:`int`): The amount of failed web requests, including the responses with a status code of 400 or above.
+    * inFlight (:obj:`int`): The amount of web requests being sent.
+    * hostRequests (:obj:`dict`): The amount of web requests finished of each host.
+    * hostErrors (:obj:`dict`): The amount of failed web requests of each host.
+    * window (:obj:`float`): The seconds of the recent web requests the rates are computed from.
+    * recent (:obj:`collections.deque`): The finishing time and the downloaded bytes of the web requests in the recent ``window`` seconds.
+    * startTime (:obj:`float`): The time the counting started.
+
+    Args:
+
+    * window (:obj:`float`): The seconds of the recent web requests the rates are computed from. Default is 60.
+    """
+    def __init__(self, window=60):
+        """The initial method of crawl metrics.
+        """
+        self.pages = 0
+        self.bytes = 0
+        self.errors = 0
+        self.inFlight = 0
+        self.hostRequests = {}
+        self.hostErrors = {}
+        self.window = window
+        self.recent = deque()
+        self.startTime = time.time()
+        self.lock = threading.Lock()
+
+    def startRequest(self):
+        """The method of counting a web request being sent.
+        """
+        with self.lock:
+            self.inFlight += 1
+
+    def finishRequest(self, host, req):
+        """The method of counting a finished web request.
+
+        Args:
+
+        * host (:obj:`str`): The host of the web page.
+        * req (:obj:`requests.Response`): The response of the web request. None if the request failed.
+        """
+        error = req is None or req.status_code >= 400
+        size = 0 if req is None or getattr(req, 'fromCache', False) else len(req.content)
+        now = time.time()
+
+        with self.lock:
+            self.inFlight -= 1
+            self.pages += 1
+            self.bytes += size
+            self.hostRequests[host] = self.hostRequests.get(host, 0) + 1
+            if error:
+                self.errors += 1
+                self.hostErrors[host] = self.hostErrors.get(host, 0) + 1
+            self.recent.append((now, size))
+            self.expire(now)
+
+    def expire(self, now):
+        """The method of forgetting the web requests finished before the recent ``window`` seconds. It is called with the lock held.
+
+        Args:
+
+        * now (:obj:`float`): The current time.
+        """
+        while self.recent and now - self.recent[0][0] > self.window:
+            self.recent.popleft()
+
+    def rates(self, now=None):
+        """The method of computing the amount of pages and bytes per second of the recent ``window`` seconds, or since the counting started if it is shorter.
+
+        Args:
+
+        * now (:obj:`float`): The current time. Default is the time of calling.
+
+        Return:
+
+        * :obj:`float`: The pages per second.
+        * :obj:`float`: The bytes per second.
+        """
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            self.expire(now)
+            pages, size = len(self.recent), sum(s for _, s in self.recent)
+
+        seconds = min(self.window, now - self.startTime)
+        if seconds <= 0:
+            return 0.0, 0.0
+
+        return pages / seconds, size / seconds
+
+def residentMemory():
+    """The method of getting the resident memory of the process. The current size is read from ``/proc`` on Linux; elsewhere the peak size is used if the ``resource`` module is available.
+
+    Return:
+
+    * :obj:`int`: The resident memory in bytes. None if it is unknown.
+    """
+    try:
+        with open('/proc/self/statm', 'rt') as fin:
+            return int(fin.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    return peakResidentMemory()
+
+def peakResidentMemory():
+    """The method of getting the peak resident memory of the process.
+
+    Return:
+
+    * :obj:`int`: The peak resident memory in bytes. None if the ``resource`` module is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024        # Bytes on macOS, kilobytes elsewhere
+
+def escapeLabel(value):
+    """The method of escaping a label value of the Prometheus text format.
+
+    Args:
+
+    * value (:obj:`str`): The label value.
+
+    Return:
+
+    * :obj:`str`: The escaped label value.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsServer:
+    """The local http server exposing the metrics of a crawler at ``/metrics`` in the Prometheus text format, so a long-lived crawl can be scraped by Prometheus. It serves on a daemon thread until it is closed.
+
+    The exposed metrics are:
+
+    * ``crawler_pages_total``, ``crawler_bytes_total`` and ``crawler_errors_total``: The counters of :obj:`CrawlMetrics`.
+    * ``crawler_pages_per_second`` and ``crawler_bytes_per_second``: The rates of the recent web requests.
+    * ``crawler_requests_in_flight``: The web requests being sent.
+    * ``crawler_frontier_size``, ``crawler_seen_size`` and ``crawler_works_in_flight``: The queued works, the seen works and the works got but not yet finished of the working list manager.
+    * ``crawler_host_requests_total``, ``crawler_host_errors_total`` and ``crawler_host_error_ratio``: The web requests and the errors of each host.
+    * ``crawler_records_total``: The records of each extractor.
+    * ``crawler_stage_seconds``: The time cost of each stage of the stage timer, with the 0.5, 0.95 and 0.99 quantiles. The parse time is the stage ``parse``.
+    * ``process_resident_memory_bytes``: The resident memory of the process.
+
+    Attributes:
+
+    * crawler (:obj:`Crawler`): The crawler whose metrics are exposed.
+    * server (:obj:`ThreadingHTTPServer`): The http server.
+    * url (:obj:`str`): The url of the metrics, for example ``http://127.0.0.1:9100/metrics``.
+
+    Args:
+
+    * crawler (:obj:`Crawler`): The crawler whose metrics are exposed.
+    * host (:obj:`str`): The address the server listens on. Default is ``127.0.0.1``.
+    * port (:obj:`int`): The port the server listens on. 0 means any free port. Default is 9100.
+    """
+    contentType = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, crawler, host='127.0.0.1', port=9100):
+        """The initial method of a metrics server.
+        """
+        self.crawler = crawler
+        metricsServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metricsServer.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', metricsServer.contentType)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_port}/metrics'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def render(self):
+        """The method of rendering the metrics of the crawler in the Prometheus text format. A gauge which could not be read at the moment is left out.
+
+        Return:
+
+        * :obj:`str`: The metrics text.
+        """
+        lines = []
+
+        def metric(name, kind, helpText, samples):
+            lines.append(f'# HELP {name} {helpText}')
+            lines.append(f'# TYPE {name} {kind}')
+            for suffix, labels, value in samples:
+                labelText = ','.join(f'{key}="{escapeLabel(v)}"' for key, v in labels.items())
+                lines.append(f'{name}{suffix}{{{labelText}}} {value}' if labelText else f'{name}{suffix} {value}')
+
+        def gauge(name, helpText, read):
+            try:
+                value = read()
+            except Exception:
+                return
+            if value is not None:
+                metric(name, 'gauge', helpText, [('', {}, value)])
+
+        crawler = self.crawler
+        metrics = crawler.metrics
+        pagesPerSecond, bytesPerSecond = metrics.rates()
+        with metrics.lock:
+            pages, size, errors, inFlight = metrics.pages, metrics.bytes, metrics.errors, metrics.inFlight
+            hostRequests, hostErrors = dict(metrics.hostRequests), dict(metrics.hostErrors)
+
+        metric('crawler_pages_total', 'counter', 'Web requests finished.', [('', {}, pages)])
+        metric('crawler_bytes_total', 'counter', 'Bytes downloaded.', [('', {}, size)])
+        metric('crawler_errors_total', 'counter', 'Web requests failed.', [('', {}, errors)])
+        metric('crawler_pages_per_second', 'gauge', 'Web requests finished per second recently.', [('', {}, pagesPerSecond)])
+        metric('crawler_bytes_per_second', 'gauge', 'Bytes downloaded per second recently.', [('', {}, bytesPerSecond)])
+        metric('crawler_requests_in_flight', 'gauge', 'Web requests being sent.', [('', {}, inFlight)])
+
+        gauge('crawler_frontier_size', 'Works queued.', crawler.WLM.remainedAmount)
+        gauge('crawler_seen_size', 'Works seen.', lambda: len(crawler.WLM.seen))
+        gauge('crawler_works_in_flight', 'Works got but not finished.', lambda: len(crawler.WLM.inFlight))
+
+        hosts = sorted(hostRequests)
+        metric('crawler_host_requests_total', 'counter', 'Web requests finished of each host.', [('', {'host': host}, hostRequests[host]) for host in hosts])
+        metric('crawler_host_errors_total', 'counter', 'Web requests failed of each host.', [('', {'host': host}, hostErrors.get(host, 0)) for host in hosts])
+        metric('crawler_host_error_ratio', 'gauge', 'Failed ratio of the web requests of each host.', [('', {'host': host}, hostErrors.get(host, 0) / hostRequests[host]) for host in hosts])
+
+        records = []
+        for extractor in crawler.extractors:
+            recorder = extractor.JsonRecorder
+            records.append(('', {'extractor': extractor.name}, recorder.count if hasattr(recorder, 'count') else recorder.recordAmount()))
+        metric('crawler_records_total', 'counter', 'Records added of each extractor.', records)
+
+        samples = []
+        for stage, summary in crawler.timer.summary().items():
+            for q in ('50', '95', '99'):
+                samples.append(('', {'stage': stage, 'quantile': f'0.{q}'}, summary[f'p{q}']))
+            samples.append(('_sum', {'stage': stage}, summary['total']))
+            samples.append(('_count', {'stage': stage}, summary['count']))
+        metric('crawler_stage_seconds', 'summary', 'Time cost of each stage of crawling a page.', samples)
+
+        gauge('process_resident_memory_bytes', 'Resident memory of the process.', residentMemory)
+
+        return '\n'.join(lines) + '\n'
+
+    def close(self):
+        """The method of shutting down the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
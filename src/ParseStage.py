@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: ParseStage
+   :synopsis: This module contains the parse stage parsing and extracting web pages in worker processes.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from bs4 import BeautifulSoup, UnicodeDammit
+
+from LinkParser import findLinks, findBase
+
+def parseContent(content, encoding, parser):
+    """The method of parsing the raw bytes of a web page with a parser backend.
+
+    Args:
+
+    * content (:obj:`bytes`): The raw bytes of the web page.
+    * encoding (:obj:`str`): The declared encoding of the web page. None if no encoding is declared.
+    * parser (:obj:`str` or :obj:`callable`): The name of a BeautifulSoup tree builder, or a callable called with the raw bytes and the encoding.
+
+    Return:
+
+    * :obj:`BeautifulSoup`: The BeautifulSoup object of the web page, or the object returned from the callable parser.
+    """
+    if callable(parser):
+        return parser(content, encoding)
+
+    return BeautifulSoup(content, parser, from_encoding=encoding)
+
+def decodeContent(content, encoding):
+    """The method of decoding the raw bytes of a web page into its html text without parsing it. The text is the same as the one a BeautifulSoup tree builder reads: the declared encoding is used, or else the encoding is detected from the byte order mark, the ``<meta>`` tag or the bytes themselves.
+
+    Args:
+
+    * content (:obj:`bytes`): The raw bytes of the web page.
+    * encoding (:obj:`str`): The declared encoding of the web page. None if no encoding is declared.
+
+    Return:
+
+    * :obj:`str`: The html text of the web page.
+    """
+    text = UnicodeDammit(content, [encoding] if encoding else [], is_html=True).unicode_markup
+    if text is None:
+        return content.decode('utf-8', errors='replace')
+
+    return text
+
+class ParseStage:
+    """The parsing and extracting work of a web page which could be done in a worker process. It parses the raw bytes of a web page, runs the extractors and finds the ``href`` of the links, but never records anything: the results are returned to the crawler, which owns the working list manager and the recorders.
+
+    A parse stage is sent to each worker process once by :obj:`initWorker`, so the extractors, their classes and the parser have to be picklable.
+
+    Attributes:
+
+    * extractors (:obj:`list`): The extractors of the crawler.
+    * parser (:obj:`str` or :obj:`callable`): The parser backend of the crawler.
+    * treeNeeded (:obj:`bool`): Whether the pages have to be parsed. If not, the html text is passed to the extractors.
+    * findLinks (:obj:`bool`): Whether to find the links.
+
+    Args:
+
+    * extractors (:obj:`list`): The extractors of the crawler.
+    * parser (:obj:`str` or :obj:`callable`): The parser backend of the crawler.
+    * treeNeeded (:obj:`bool`): Whether the pages have to be parsed.
+    * findLinks (:obj:`bool`): Whether to find the links.
+    """
+    def __init__(self, extractors, parser, treeNeeded, findLinks):
+        """The initial method of a parse stage.
+        """
+        self.extractors = extractors
+        self.parser = parser
+        self.treeNeeded = treeNeeded
+        self.findLinks = findLinks
+
+    def run(self, url, content, encoding, extract=True):
+        """The method of parsing and extracting a web page.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * content (:obj:`bytes`): The raw bytes of the web page.
+        * encoding (:obj:`str`): The declared encoding of the web page. None if no encoding is declared.
+        * extract (:obj:`bool`): Whether to run the extractors. It is False for a web page unchanged since the last crawl. Default is True.
+
+        Return:
+
+        * :obj:`list`: The pairs of extracted data and messages, one for each extractor. None if the extractors are not run.
+        * :obj:`list`: The ``href`` of the links.
+        * :obj:`str`: The ``href`` of the ``<base>`` tag. None if there is no ``<base>`` tag.
+        * :obj:`str`: The message of the exception raised when finding the links. It is empty if no exception is raised.
+        """
+        if self.treeNeeded:
+            bs = parseContent(content, encoding, self.parser)
+        else:
+            bs = decodeContent(content, encoding)
+
+        results = [extractor.extractData(url, bs) for extractor in self.extractors] if extract else None
+
+        links, base, linkError = [], None, ''
+        if self.findLinks:
+            try:
+                links = findLinks(bs)
+                base = findBase(bs)
+            except Exception as e:
+                linkError = str(e)
+
+        return results, links, base, linkError
+
+workerStage = None
+
+def initWorker(stage):
+    """The initializer of a worker process, keeping the parse stage for the following works.
+
+    Args:
+
+    * stage (:obj:`ParseStage`): The parse stage.
+    """
+    global workerStage
+    workerStage = stage
+
+def runStage(url, content, encoding, extract=True):
+    """The work sent to a worker process, running the parse stage of the worker.
+
+    Args:
+
+    * url (:obj:`str`): The url string of the web page.
+    * content (:obj:`bytes`): The raw bytes of the web page.
+    * encoding (:obj:`str`): The declared encoding of the web page.
+    * extract (:obj:`bool`): Whether to run the extractors. Default is True.
+
+    Return:
+
+    * :obj:`tuple`: The returned value of :obj:`ParseStage.run`.
+    """
+    return workerStage.run(url, content, encoding, extract)
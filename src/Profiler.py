@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: Profiler
+   :synopsis: This module contains the crawl profiler running a window of a crawl under cProfile or a sampling profiler.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from collections import Counter
+import threading
+import cProfile
+import time
+import sys
+import os
+
+class CrawlProfiler:
+    """The device to profile a window of a crawl, so a production crawl can be profiled without patching the crawler.
+
+    The profiling starts when the crawl starts, and stops after ``pages`` pages or ``seconds`` seconds, whichever comes first, or when the crawl finishes. Two kinds of output are written:
+
+    * ``{path}.pstats``: The deterministic profile of :mod:`cProfile`, which could be read by :obj:`pstats.Stats` or viewers such as snakeviz.
+    * ``{path}.collapsed``: The stacks of the crawl thread sampled every ``interval`` seconds, one line of ``frame;frame;frame count`` for each distinct stack with the root first, which could be drawn by ``flamegraph.pl`` or speedscope.
+
+    The sampler thread keeps the window of ``seconds`` by itself, so the stacks are not sampled after it even if no page finishes, for example when the crawl hangs on a slow page, and ``{path}.collapsed`` is written at once. :mod:`cProfile` can only be stopped on the crawl thread, so it stops at the first page finished after the window, or when the crawl finishes.
+
+    Only the thread running the crawl loop is profiled. The web requests of the :obj:`AsyncCrawler` are sent by worker threads, and are seen as waiting on the event loop.
+
+    Attributes:
+
+    * mode (:obj:`str`): ``cprofile``, ``sampling`` or ``both``.
+    * pages (:obj:`int`): The amount of pages profiled. None means no limit.
+    * seconds (:obj:`float`): The seconds profiled. None means no limit.
+    * interval (:obj:`float`): The seconds between two samples.
+    * path (:obj:`str`): The path of the output files without the extension.
+    * profile (:obj:`cProfile.Profile`): The deterministic profiler. None if it is not used.
+    * samples (:obj:`collections.Counter`): The amount of samples of each stack, keyed by the tuple of frames with the root first.
+    * pageCount (:obj:`int`): The amount of pages profiled.
+    * running (:obj:`bool`): Whether the profiling is running.
+
+    Args:
+
+    * mode (:obj:`str`): ``cprofile`` for the deterministic profile, ``sampling`` for the sampled stacks, or ``both``. Default is ``both``.
+    * pages (:obj:`int`): The amount of pages profiled. Default is None.
+    * seconds (:obj:`float`): The seconds profiled. Default is None.
+    * interval (:obj:`float`): The seconds between two samples. Default is 0.005.
+    * path (:obj:`str`): The path of the output files without the extension. Default is ``tmp/profile``.
+
+    Raise:
+
+    * ValueError: ``mode`` is not one of ``cprofile``, ``sampling`` and ``both``.
+    * TypeError: ``pages`` or ``seconds`` is defined and not a number.
+
+    Example::
+
+        c = Crawler(profiler=CrawlProfiler(pages=500), ...)
+        c.crawl()       # Writes tmp/profile.pstats and tmp/profile.collapsed after 500 pages
+    """
+    modes = ('cprofile', 'sampling', 'both')
+
+    def __init__(self, mode='both', pages=None, seconds=None, interval=0.005, path='tmp/profile'):
+        """The initial method of a crawl profiler.
+        """
+        if mode not in self.modes:
+            raise ValueError(f'Argument "mode" must be one of {", ".join(self.modes)}')
+        if pages is not None and (not isinstance(pages, int) or isinstance(pages, bool)):
+            raise TypeError('Argument "pages" must be an integer')
+        if seconds is not None and (not isinstance(seconds, (int, float)) or isinstance(seconds, bool)):
+            raise TypeError('Argument "seconds" must be a number')
+
+        self.mode = mode
+        self.pages = pages
+        self.seconds = seconds
+        self.interval = interval
+        self.path = path
+        self.profile = None
+        self.samples = Counter()
+        self.pageCount = 0
+        self.running = False
+        self.startTime = None
+        self.threadId = None
+        self.sampler = None
+        self.stopSampling = threading.Event()
+
+    def start(self):
+        """The method of starting the profiling on the calling thread. Nothing is done if it has run before.
+        """
+        if self.running or self.startTime is not None:
+            return
+
+        self.running = True
+        self.startTime = time.time()
+        self.threadId = threading.get_ident()
+
+        if self.mode in ('sampling', 'both'):
+            self.sampler = threading.Thread(target=self.sample, name='CrawlProfilerSampler', daemon=True)
+            self.sampler.start()
+
+        if self.mode in ('cprofile', 'both'):
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    @staticmethod
+    def frameName(frame):
+        """The method of naming a frame in a collapsed stack.
+
+        Args:
+
+        * frame (:obj:`frame`): The frame.
+
+        Return:
+
+        * :obj:`str`: The name with the function, the file and the line of the function.
+        """
+        code = frame.f_code
+        return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':')
+
+    def sample(self):
+        """The method run by the sampler thread, recording the stack of the profiled thread every ``interval`` seconds until the profiling stops or the window of seconds is over. ``{path}.collapsed`` is written when the window is over.
+        """
+        deadline = None if self.seconds is None else self.startTime + self.seconds
+        while not self.stopSampling.wait(self.interval):
+            if deadline is not None and time.time() >= deadline:
+                self.writeSamples()
+                return
+            frame = sys._current_frames().get(self.threadId)
+            stack = []
+            while frame is not None:
+                stack.append(self.frameName(frame))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def pageDone(self):
+        """The method of counting a profiled page. The profiling stops when the window of pages or seconds is over. It is called by the crawler on the profiled thread.
+        """
+        if not self.running:
+            return
+
+        self.pageCount += 1
+        if (self.pages is not None and self.pageCount >= self.pages) or (self.seconds is not None and time.time() - self.startTime >= self.seconds):
+            self.stop()
+
+    def stop(self):
+        """The method of stopping the profiling and writing the output files. Nothing is done if it is not running.
+        """
+        if not self.running:
+            return
+        self.running = False
+
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.stopSampling.set()
+            self.sampler.join()
+
+        self.write()
+
+    def write(self):
+        """The method of writing ``{path}.pstats`` and ``{path}.collapsed``.
+        """
+        if self.profile is not None:
+            self.makeDirectory()
+            try:
+                self.profile.dump_stats(f'{self.path}.pstats')
+            except Exception as e:
+                print(f'Failed to record on {self.path}.pstats: {e}')
+
+        if self.sampler is not None:
+            self.writeSamples()
+
+    def makeDirectory(self):
+        """The method of making the directory of the output files.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def writeSamples(self):
+        """The method of writing ``{path}.collapsed``.
+        """
+        self.makeDirectory()
+        try:
+            with open(f'{self.path}.collapsed', 'wt') as fout:
+                fout.write(''.join(f'{";".join(stack)} {count}\n' for stack, count in self.samples.most_common()))
+        except Exception as e:
+            print(f'Failed to record on {self.path}.collapsed: {e}')
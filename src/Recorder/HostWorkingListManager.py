@@ -0,0 +1,238 @@
+from urllib.parse import urlparse
+from collections import deque
+import heapq
+import time
+
+from .WorkingListManager import WorkingListManager
+
+class HostWorkingListManager(WorkingListManager):
+    """The working list manager keeping a queue for each host, so a burst of works of one host does not hold back the works of the other hosts, and each host is crawled politely.
+
+    A work of a host could be got only if ``minDelay`` seconds have passed since the last work of the host was got, and fewer than ``maxPerHost`` works of the host are in flight. The hosts which have works and are not at their concurrency limit are kept in a heap ordered by the time they become ready, so getting a work takes a heap pop instead of scanning the hosts. :obj:`getWork` returns None if no host is ready yet, and :obj:`waitTime` tells how long to wait.
+
+    The works are persisted the same as :obj:`WorkingListManager`, but the order of the works of different hosts is not kept.
+
+    Attributes:
+
+    * hostQueues (:obj:`dict`): The queue of works of each host, keyed by host.
+    * readyHeap (:obj:`list`): The heap of ``(readyTime, sequence, host)`` of the hosts which could be scheduled.
+    * scheduled (:obj:`set`): The hosts in the ready heap.
+    * nextTime (:obj:`dict`): The earliest time the next work of each host could be got.
+    * active (:obj:`dict`): The amount of works in flight of each host.
+    * queued (:obj:`int`): The amount of works in all queues.
+    * minDelay (:obj:`float`): The seconds between getting two works of the same host.
+    * maxPerHost (:obj:`int`): The maximum amount of works in flight of the same host.
+    * The other attributes are the same as :obj:`WorkingListManager`.
+
+    Args:
+
+    * workingList (:obj:`list`): A list of url string.
+    * minDelay (:obj:`float`): The seconds between getting two works of the same host. Default is 1.
+    * maxPerHost (:obj:`int`): The maximum amount of works in flight of the same host. Default is 1.
+    * The other arguments are the same as :obj:`WorkingListManager`.
+
+    Raise:
+
+    * TypeError: The input argument is not a list or a deque of strings, or ``minDelay`` is not a number, or ``maxPerHost`` is not an integer.
+    * ValueError: ``minDelay`` is negative or ``maxPerHost`` is less than 1.
+    """
+    def __init__(self, workingList=None, minDelay=1, maxPerHost=1, **kwargs):
+        """The initial method of a host working list manager.
+        """
+        if not isinstance(minDelay, (int, float)) or isinstance(minDelay, bool):
+            raise TypeError('Argument "minDelay" must be a number')
+        if minDelay < 0:
+            raise ValueError('Argument "minDelay" must not be negative')
+        if not isinstance(maxPerHost, int) or isinstance(maxPerHost, bool):
+            raise TypeError('Argument "maxPerHost" must be an integer')
+        if maxPerHost < 1:
+            raise ValueError('Argument "maxPerHost" must be at least 1')
+
+        self.minDelay = minDelay
+        self.maxPerHost = maxPerHost
+        self.hostQueues = {}
+        self.readyHeap = []
+        self.scheduled = set()
+        self.nextTime = {}
+        self.active = {}
+        self.queued = 0
+        self.sequence = 0
+
+        super().__init__(workingList, **kwargs)
+
+    @staticmethod
+    def hostOf(work):
+        """The method of getting the host of a work.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+
+        Return:
+
+        * :obj:`str`: The lowercased host of the url.
+        """
+        return (urlparse(work).hostname or '').lower()
+
+    def schedule(self, host):
+        """The method of pushing a host into the ready heap if it has works, is not at its concurrency limit and is not in the heap yet.
+
+        Args:
+
+        * host (:obj:`str`): The host.
+        """
+        if host in self.scheduled or not self.hostQueues.get(host) or self.active.get(host, 0) >= self.maxPerHost:
+            return
+
+        self.sequence += 1
+        heapq.heappush(self.readyHeap, (self.nextTime.get(host, 0), self.sequence, host))
+        self.scheduled.add(host)
+
+    def enqueue(self, work):
+        """The method of appending a work to the queue of its host.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+        """
+        host = self.hostOf(work)
+        self.hostQueues.setdefault(host, deque()).append(work)
+        self.queued += 1
+        self.schedule(host)
+
+    def shard(self):
+        """The method of moving the works of ``records``, for example the loaded ones, into the queues of their hosts.
+        """
+        while self.records:
+            self.enqueue(self.records.popleft())
+
+    def load(self):
+        """The method of rebuilding the working list from the files, and sharding the works into the queues of their hosts.
+        """
+        self.hostQueues, self.readyHeap, self.scheduled, self.queued = {}, [], set(), 0
+        super().load()
+        self.shard()
+
+    def requeueInFlight(self):
+        """The method of putting the in-flight works back to the front of the queues of their hosts.
+        """
+        inFlight = list(self.inFlight)
+        super().requeueInFlight()
+        self.records.clear()
+
+        for work in reversed(inFlight):
+            host = self.hostOf(work)
+            self.hostQueues.setdefault(host, deque()).appendleft(work)
+            self.queued += 1
+            self.schedule(host)
+
+    def outputRecord(self):
+        """The method of formatting the queued works as a string to write into a file, one work per line, grouped by host.
+
+        Return:
+
+        :obj:`str`: The ``'\\n'`` joined works.
+        """
+        return '\n'.join(work for queue in self.hostQueues.values() for work in queue)
+
+    def addRecord(self, newRecord, autoSave=True):
+        """The method of adding a work into the queue of its host. A work would not be added again if it has been added before.
+
+        Args:
+
+        * newRecord (:obj:`str`): A url string as a new work.
+        * autoSave (:obj:`bool`): A boolean value handling auto saving. The default value is ``True``.
+        """
+        if newRecord in self.seen:
+            return
+
+        self.seen.add(newRecord)
+
+        if self.journal:
+            self.journalBuffer.append(f'+{newRecord}')
+
+        self.enqueue(newRecord)
+
+        if autoSave:
+            self.requestSave()
+
+    def getWork(self):
+        """The method of getting a work of the host which becomes ready earliest, if it is ready now.
+
+        Return:
+
+        * work (:obj:`str`): The first work of the ready host. None if no host is ready now.
+        """
+        if not self.readyHeap or self.readyHeap[0][0] > time.monotonic():
+            return None
+
+        _, _, host = heapq.heappop(self.readyHeap)
+        self.scheduled.discard(host)
+
+        work = self.hostQueues[host].popleft()
+        if not self.hostQueues[host]:
+            del self.hostQueues[host]
+        self.queued -= 1
+
+        self.active[host] = self.active.get(host, 0) + 1
+        self.nextTime[host] = time.monotonic() + self.minDelay
+        self.schedule(host)
+
+        self.done.append(work)
+        self.inFlight[work] = None
+        if self.journal:
+            self.journalBuffer.append(f'-{work}')
+
+        self.requestSave('saveInFlight')
+        if self.journal:
+            self.requestSave()
+
+        return work
+
+    def finishWork(self, work):
+        """The method of marking a got work as finished. The host of the work could be scheduled again if it was at its concurrency limit.
+
+        Args:
+
+        * work (:obj:`str`): The finished work.
+        """
+        if work not in self.inFlight:
+            return
+
+        super().finishWork(work)
+
+        host = self.hostOf(work)
+        self.active[host] -= 1
+        if not self.active[host]:
+            del self.active[host]
+        self.schedule(host)
+
+    def waitTime(self):
+        """The method of getting the seconds to wait before the next host becomes ready.
+
+        Return:
+
+        * :obj:`float`: The seconds to wait. 0 if a host is ready now, or there is no work. None if every host having works is at its concurrency limit, so no work would be ready until a work in flight is finished.
+        """
+        if self.readyHeap:
+            return max(0, self.readyHeap[0][0] - time.monotonic())
+
+        return None if self.queued else 0
+
+    def workExists(self):
+        """The method of checking the existence of work in the queues.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if work exists in the queues, ``False`` otherwise.
+        """
+        return self.queued > 0
+
+    def remainedAmount(self):
+        """The method of getting the remained work amount.
+
+        Return:
+
+        * :obj:`int`: The amount of works in the queues.
+        """
+        return self.queued
@@ -0,0 +1,147 @@
+import json
+import os
+
+from .Recorder import Recorder
+
+class JsonLinesRecorder(Recorder):
+    """The device to record data into a :obj:`.jsonl` file. Each record is written as one line of json, and only the new records are appended to the file when saving, so the cost of saving does not grow with the amount of records.
+
+    Attributes:
+
+    * name (:obj:`str`): The name of the json lines recorder.
+    * path (:obj:`str`): The path of the record file. It has the format ``tmp/{recorderName}.jsonl``. The direction ``./tmp`` would be created at the initialization if it is not exists.
+    * records (:obj:`list`): The list of records not yet written into the record file.
+    * count (:obj:`int`): The number of adding records. It auto increases each time adding a record.
+
+    Args:
+
+    * name (:obj:`str`): The name of the json lines recorder.
+    * resume (:obj:`bool`): Whether to keep appending to the existing record file instead of overwriting it. The count continues from the amount of saved records. Default is False.
+
+    Raise:
+
+    * TypeError: The input name argument is not a string, or the resume argument is not a boolean value.
+
+    Every record is appended at once. To append the records in batches, set a :obj:`WriteBehind` policy by :obj:`setWriteBehind`, or pass it to the crawler, which sets it on the recorders of the extractors.
+    """
+    def __init__(self, name, resume=False):
+        """The initial method of a json lines recorder.
+        """
+        if not isinstance(name, str):
+            raise TypeError('Name must be a string')
+        if not isinstance(resume, bool):
+            raise TypeError('Argument "resume" must be a boolean value')
+
+        self.name = name
+        self.path = f'tmp/{self.name}.jsonl'
+        self.records = []
+        self.count = 0
+
+        if not os.path.exists('tmp'):
+            os.mkdir('tmp')
+
+        if resume and os.path.exists(self.path):
+            self.load()
+            return
+
+        try:
+            with open(self.path, 'wt') as fout:
+                fout.write('')
+
+        except Exception as e:
+            print(f'Failed to record on {self.path}\n{e}')
+
+    def load(self):
+        """The method of counting the saved records in the record file. The records are not kept in memory, since only the new records are appended when saving. A last line without ``'\\n'``, left by a crash while appending, is truncated, so the next record is not appended into it.
+        """
+        try:
+            count, end = 0, 0
+            with open(self.path, 'rb+') as fin:
+                for line in fin:
+                    if not line.endswith(b'\n'):
+                        break
+                    end += len(line)
+                    if line.strip():
+                        count += 1
+
+                if end < os.path.getsize(self.path):
+                    fin.truncate(end)
+                    print(f'Dropped a truncated record at the end of {self.path}')
+
+            self.count = count
+
+        except Exception as e:
+            print(f'Failed to load {self.path}\n{e}')
+
+    def save(self):
+        """The method of appending the unsaved records into the record file.
+        """
+        if not self.records:
+            return
+
+        try:
+            self.writeFile(self.path, self.outputRecord(), 'at', 'utf-8')
+
+        except Exception as e:
+            print(f'Failed to record on {self.path}\n{e}')
+            return
+
+        self.records.clear()
+
+    def outputRecord(self):
+        """The method of converting the unsaved records into json lines.
+
+        Return:
+
+        * :obj:`str`: The json lines of the unsaved records. Each line ends with ``'\\n'``.
+        """
+        return ''.join(f'{json.dumps(r, ensure_ascii=False)}\n' for r in self.records)
+
+    def addRecord(self, newRecord, autoSave=True):
+        """The method of adding a new record. The new record must be a :obj:`dict`. If the ``autoSave`` argument is set ``True``, the unsaved records are saved, or deferred in the write-behind mode.
+
+        Raise:
+
+        * TypeError: The new record is not a :obj:`dict`.
+        """
+        if not isinstance(newRecord, dict):
+            raise TypeError('Record must be a dict')
+
+        self.records.append(newRecord)
+        self.count += 1
+
+        if autoSave:
+            self.requestSave()
+
+    def recordExists(self):
+        """The method of checking whether any record has been added or not.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if there exists any record, False otherwise.
+        """
+        return bool(self.count)
+
+    def recordAmount(self):
+        """The method of checking the amount of added records.
+
+        Return:
+
+        * :obj:`int`: The amount of added records.
+        """
+        return self.count
+
+    def readRecords(self):
+        """The method of iterating the saved records lazily from the record file, one line at a time. In the write-behind mode, the deferred savings are flushed first.
+
+        Return:
+
+        * :obj:`generator`: The generator of the saved records.
+        """
+        if self.writeBehind is not None:
+            self.flush()
+
+        with open(self.path, 'rt', encoding='utf-8') as fin:
+            for line in fin:
+                if line.strip():
+                    yield json.loads(line)
@@ -16,22 +16,49 @@ class JsonRecorder(Recorder):
     Args:
 
     * name (:obj:`str`): The name of the json recorder.
+    * resume (:obj:`bool`): Whether to load the records and the count from the existing record file instead of overwriting it. Default is False.
 
     Raise:
 
-    * TypeError: The input name argument is not a string.
+    * TypeError: The input name argument is not a string, or the resume argument is not a boolean value.
     """
-    def __init__(self, name):
+    def __init__(self, name, resume=False):
         """The initial method of a json recorder.
         """
         if not isinstance(name, str):
             raise TypeError('Name must be a string')
+        if not isinstance(resume, bool):
+            raise TypeError('Argument "resume" must be a boolean value')
 
         self.name = name
         self.path = f'tmp/{self.name}.json'
         self.records = {}
         self.count = 0
-        self.save()
+
+        if not os.path.exists('tmp'):
+            os.mkdir('tmp')
+
+        if resume:
+            self.load()
+        else:
+            self.save()
+
+    def load(self):
+        """The method of loading the records from the record file. The count continues from the largest key of the loaded records, so the keys of the new records do not collide with them.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'rt') as fin:
+                records = json.loads(fin.read() or '{}')
+
+        except Exception as e:
+            print(f'Failed to load {self.path}\n{e}')
+            return
+
+        self.records = records
+        self.count = max((int(key) + 1 for key in records), default=0)
 
     def outputRecord(self):
         """The method of converting the :obj:`dict` of records into a json format string.
@@ -56,4 +83,4 @@ class JsonRecorder(Recorder):
         self.count += 1
 
         if autoSave:
-            self.save()
\ No newline at end of file
+            self.requestSave()
\ No newline at end of file
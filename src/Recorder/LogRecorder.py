@@ -0,0 +1,180 @@
+from collections import deque
+import time
+import os
+
+from .Recorder import Recorder
+
+class LogRecorder(Recorder):
+    """The device to record the crawling log into a plain text file. The new entries are appended to the log file instead of rewriting it, and only a bounded amount of recent entries is kept in memory.
+
+    The log file is rotated when it would grow larger than ``maxBytes`` or it has been written for ``rotateInterval`` seconds. When rotating, ``tmp/{name}.txt`` is renamed to ``tmp/{name}.txt.1``, the older ones are shifted as ``tmp/{name}.txt.2`` and so on, and only ``backupCount`` of them are kept.
+
+    Attributes:
+
+    * name (:obj:`str`): The name of the log recorder.
+    * path (:obj:`str`): The path of the log file. It has the format ``tmp/{recorderName}.txt``.
+    * records (:obj:`collections.deque`): The recent entries. At most ``bufferSize`` of them are kept.
+    * unsaved (:obj:`list`): The entries not yet appended to the log file.
+    * maxBytes (:obj:`int`): The size of the log file which triggers rotating. 0 means never rotating by size.
+    * rotateInterval (:obj:`float`): The seconds of writing a log file which triggers rotating. None means never rotating by time.
+    * backupCount (:obj:`int`): The amount of rotated log files kept.
+    * size (:obj:`int`): The size of the current log file in bytes.
+    * encoding (:obj:`str`): The encoding of the log file. Default is ``utf-8``.
+    * openedAt (:obj:`float`): The time the current log file was started.
+
+    Args:
+
+    * name (:obj:`str`): The name of the log recorder. Default is ``log``.
+    * maxBytes (:obj:`int`): The size of the log file which triggers rotating. Default is 0.
+    * rotateInterval (:obj:`float`): The seconds of writing a log file which triggers rotating. Default is None.
+    * backupCount (:obj:`int`): The amount of rotated log files kept. Default is 5.
+    * bufferSize (:obj:`int`): The amount of recent entries kept in memory. Default is 100.
+    * resume (:obj:`bool`): Whether to keep appending to the existing log file instead of overwriting it. Default is False.
+
+    Raise:
+
+    * TypeError: The input name argument is not a string, the resume argument is not a boolean value, or the other arguments are not numbers.
+    """
+    encoding = 'utf-8'
+
+    def __init__(self, name='log', maxBytes=0, rotateInterval=None, backupCount=5, bufferSize=100, resume=False):
+        """The initial method of a log recorder.
+        """
+        if not isinstance(name, str):
+            raise TypeError('Name must be a string')
+        if not isinstance(maxBytes, int):
+            raise TypeError('Argument "maxBytes" must be an integer')
+        if rotateInterval is not None and not isinstance(rotateInterval, (int, float)):
+            raise TypeError('Argument "rotateInterval" must be a number')
+        if not isinstance(backupCount, int):
+            raise TypeError('Argument "backupCount" must be an integer')
+        if not isinstance(bufferSize, int):
+            raise TypeError('Argument "bufferSize" must be an integer')
+        if not isinstance(resume, bool):
+            raise TypeError('Argument "resume" must be a boolean value')
+
+        self.name = name
+        self.path = f'tmp/{self.name}.txt'
+        self.records = deque(maxlen=bufferSize)
+        self.unsaved = []
+        self.maxBytes = maxBytes
+        self.rotateInterval = rotateInterval
+        self.backupCount = backupCount
+        self.size = 0
+        self.openedAt = time.time()
+
+        if not os.path.exists('tmp'):
+            os.mkdir('tmp')
+
+        if resume and os.path.exists(self.path):
+            self.load()
+            return
+
+        try:
+            with open(self.path, 'wt') as fout:
+                fout.write('')
+
+        except Exception as e:
+            print(f'Failed to record on {self.path}\n{e}')
+
+    def load(self):
+        """The method of continuing the existing log file. The new entries are appended after its end, and it is rotated as if it had been written since it was last modified.
+        """
+        try:
+            self.size = os.path.getsize(self.path)
+            self.openedAt = os.path.getmtime(self.path)
+
+        except Exception as e:
+            print(f'Failed to load {self.path}\n{e}')
+
+    def save(self):
+        """The method of appending the unsaved entries to the log file. The log file is rotated before writing if needed.
+        """
+        if not self.unsaved:
+            return
+
+        text = self.outputRecord()
+        length = len(text.encode(self.encoding))        # Bytes, as maxBytes and the size of a resumed log file
+        self.unsaved.clear()
+
+        if self.rotationNeeded(length):
+            self.rotate()
+
+        try:
+            self.writeFile(self.path, text, 'at', self.encoding)
+
+        except Exception as e:
+            print(f'Failed to record on {self.path}\n{e}')
+            return
+
+        self.size += length
+
+    def outputRecord(self):
+        """The method of formatting the unsaved entries as a string to append to the log file.
+
+        Return:
+
+        :obj:`str`: The unsaved entries, each followed by ``'\\n'``.
+        """
+        return ''.join(f'{entry}\n' for entry in self.unsaved)
+
+    def addRecord(self, newRecord, autoSave=True):
+        """The method of adding a new entry.
+
+        Args:
+
+        * newRecord (:obj:`str`): The new entry.
+        * autoSave (:obj:`bool`): Handle of auto saving.
+        """
+        self.records.append(newRecord)
+        self.unsaved.append(newRecord)
+
+        if autoSave:
+            self.requestSave()
+
+    def rotationNeeded(self, length):
+        """The method of checking whether the log file should be rotated before writing.
+
+        Args:
+
+        * length (:obj:`int`): The length in bytes of the text attempted to write.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if the log file should be rotated, ``False`` otherwise.
+        """
+        if not self.size:
+            return False
+
+        if self.maxBytes and self.size + length > self.maxBytes:
+            return True
+
+        if self.rotateInterval is not None and time.time() - self.openedAt >= self.rotateInterval:
+            return True
+
+        return False
+
+    def rotate(self):
+        """The method of rotating the log file.
+        """
+        try:
+            self.runFileOperation(self.rotateFiles)
+
+        except Exception as e:
+            print(f'Failed to rotate {self.path}\n{e}')
+
+        self.size = 0
+        self.openedAt = time.time()
+
+    def rotateFiles(self):
+        """The file operation of rotating the log file: shifting the rotated log files and emptying the log file.
+        """
+        for i in range(self.backupCount - 1, 0, -1):
+            if os.path.exists(f'{self.path}.{i}'):
+                os.replace(f'{self.path}.{i}', f'{self.path}.{i + 1}')
+
+        if self.backupCount > 0:
+            os.replace(self.path, f'{self.path}.1')
+
+        with open(self.path, 'wt') as fout:
+            fout.write('')
@@ -0,0 +1,206 @@
+from urllib.parse import urlparse
+import heapq
+
+from .WorkingListManager import WorkingListManager
+
+def inLinkScore(work, inLinks):
+    """The default scoring function. The works found by more pages, then the works of shallower paths, are got first.
+
+    Args:
+
+    * work (:obj:`str`): A url string.
+    * inLinks (:obj:`int`): The amount of times the work has been added.
+
+    Return:
+
+    * :obj:`tuple`: The score of the work. The larger score is got first.
+    """
+    return inLinks, -urlparse(work).path.rstrip('/').count('/')
+
+class PriorityWorkingListManager(WorkingListManager):
+    """The working list manager getting the work with the highest score first, instead of the oldest one.
+
+    The score of a work is computed by the scoring function from the url and the amount of times the work has been added, its in-links. When a queued work is added again, for example found on another page, its in-links increase and it is scored again. The works are kept in a heap, and the entries of a rescored work are left in the heap and skipped when popped. The works of the same score are got in the order they were added.
+
+    The works are persisted the same as :obj:`WorkingListManager`, but the in-links are not, so the loaded works start from one in-link.
+
+    Attributes:
+
+    * scorer (:obj:`callable`): The scoring function called with the url and the in-links of a work, returning a comparable score.
+    * heap (:obj:`list`): The heap of ``(Negated(score), sequence, work)``.
+    * inLinks (:obj:`dict`): The in-links of each queued work, in the order the works were added.
+    * entries (:obj:`dict`): The sequence of the current heap entry of each queued work.
+    * The other attributes are the same as :obj:`WorkingListManager`.
+
+    Args:
+
+    * workingList (:obj:`list`): A list of url string.
+    * scorer (:obj:`callable`): The scoring function. Default is :obj:`inLinkScore`.
+    * The other arguments are the same as :obj:`WorkingListManager`.
+
+    Raise:
+
+    * TypeError: The input argument is not a list or a deque of strings, or ``scorer`` is not callable.
+
+    Example::
+
+        WLM = PriorityWorkingListManager(scorer=lambda work, inLinks: ('/product/' in work, inLinks))
+    """
+    def __init__(self, workingList=None, scorer=inLinkScore, **kwargs):
+        """The initial method of a priority working list manager.
+        """
+        if not callable(scorer):
+            raise TypeError('Argument "scorer" must be callable')
+
+        self.scorer = scorer
+        self.heap = []
+        self.inLinks = {}
+        self.entries = {}
+        self.sequence = 0
+
+        super().__init__(workingList, **kwargs)
+
+    def push(self, work):
+        """The method of scoring a queued work and pushing a new entry of it into the heap. The old entry of the work becomes stale. The heap is rebuilt without the stale entries if they outnumber the queued works.
+
+        Args:
+
+        * work (:obj:`str`): A queued url string.
+        """
+        score = self.scorer(work, self.inLinks[work])
+        self.sequence += 1
+        self.entries[work] = self.sequence
+        heapq.heappush(self.heap, (Negated(score), self.sequence, work))
+
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [entry for entry in self.heap if self.entries.get(entry[2]) == entry[1]]
+            heapq.heapify(self.heap)
+
+    def enqueue(self, work, inLinks=1):
+        """The method of queuing a new work.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+        * inLinks (:obj:`int`): The in-links of the work. Default is 1.
+        """
+        self.inLinks[work] = inLinks
+        self.push(work)
+
+    def shard(self):
+        """The method of moving the works of ``records``, for example the loaded ones, into the heap.
+        """
+        while self.records:
+            self.enqueue(self.records.popleft())
+
+    def load(self):
+        """The method of rebuilding the working list from the files, and pushing the works into the heap.
+        """
+        self.heap, self.inLinks, self.entries = [], {}, {}
+        super().load()
+        self.shard()
+
+    def requeueInFlight(self):
+        """The method of putting the in-flight works back into the heap.
+        """
+        super().requeueInFlight()
+        self.shard()
+
+    def outputRecord(self):
+        """The method of formatting the queued works as a string to write into a file, one work per line, in the order they were added.
+
+        Return:
+
+        :obj:`str`: The ``'\\n'`` joined works.
+        """
+        return '\n'.join(self.inLinks)
+
+    def addRecord(self, newRecord, autoSave=True):
+        """The method of adding a work. A queued work added again is scored again with one more in-link, while a processed work would not be added again.
+
+        Args:
+
+        * newRecord (:obj:`str`): A url string as a new work.
+        * autoSave (:obj:`bool`): A boolean value handling auto saving. The default value is ``True``.
+        """
+        if newRecord in self.inLinks:
+            self.inLinks[newRecord] += 1
+            self.push(newRecord)
+            return
+
+        if newRecord in self.seen:
+            return
+
+        self.seen.add(newRecord)
+
+        if self.journal:
+            self.journalBuffer.append(f'+{newRecord}')
+
+        self.enqueue(newRecord)
+
+        if autoSave:
+            self.requestSave()
+
+    def getWork(self):
+        """The method of getting the work with the highest score.
+
+        Return:
+
+        * work (:obj:`str`): The work with the highest score. None if there is no work.
+        """
+        while self.heap:
+            _, sequence, work = heapq.heappop(self.heap)
+            if self.entries.get(work) == sequence:
+                break
+        else:
+            return None
+
+        del self.entries[work]
+        del self.inLinks[work]
+
+        self.done.append(work)
+        self.inFlight[work] = None
+        if self.journal:
+            self.journalBuffer.append(f'-{work}')
+
+        self.requestSave('saveInFlight')
+        if self.journal:
+            self.requestSave()
+
+        return work
+
+    def workExists(self):
+        """The method of checking the existence of work in the heap.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if work exists, ``False`` otherwise.
+        """
+        return bool(self.inLinks)
+
+    def remainedAmount(self):
+        """The method of getting the remained work amount.
+
+        Return:
+
+        * :obj:`int`: The amount of queued works.
+        """
+        return len(self.inLinks)
+
+class Negated:
+    """The wrapper reversing the order of a score, so that the min-heap pops the largest score first. Any comparable score, such as a tuple, could be wrapped.
+
+    Args:
+
+    * score (:obj:`object`): The score.
+    """
+    __slots__ = ('score',)
+
+    def __init__(self, score):
+        self.score = score
+
+    def __lt__(self, other):
+        return other.score < self.score
+
+    def __eq__(self, other):
+        return self.score == other.score
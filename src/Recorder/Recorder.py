@@ -1,27 +1,41 @@
 import os
 
+from .WriteBehind import WriteBehind
+
 class Recorder:
     """The device to record data into a file. The records are saved as a plain text file. The name of the record file is the same as the name of the recorder.
 
+    By default the records are saved each time they are changed. In the write-behind mode set by :obj:`setWriteBehind`, the savings are deferred and done together with the ones of the other recorders sharing the policy, see :obj:`WriteBehind`. A recorder is a context manager, which flushes the deferred savings when exiting.
+
     Attributes:
 
     * name (:obj:`str`): The name of the recorder.
     * path (:obj:`str`): The path of the record file. It has the format ``tmp/{recorderName}.txt``. The direction ``./tmp`` would be created at the initialization if it is not exists.
     * records (:obj:`list`): The list of records.
+    * writeBehind (:obj:`WriteBehind`): The write-behind policy. None means saving at once.
+    * pendingSaves (:obj:`dict`): The names of the saving methods requested and not yet done in the write-behind mode, in the order of requesting. Only the keys are used. The amount and the time of the requested savings are counted as ``pendingCount`` and ``pendingSince`` of the policy, shared by the recorders using it.
+    * flushLast (:obj:`bool`): Whether the deferred savings are done after the ones of the other recorders sharing the write-behind policy. Default is False.
 
     Args:
 
     * name (:obj:`str`): The name of the recorder.
+    * resume (:obj:`bool`): Whether to load the records from the existing record file instead of overwriting it. Default is False.
 
     Raise:
 
     * TypeError: The input name argument is not a string.
     """
-    def __init__(self, name):
+    writeBehind = None
+    pendingSaves = None
+    flushLast = False
+
+    def __init__(self, name, resume=False):
         """The initial method of the :obj:`Recorder`.
         """
         if not isinstance(name, str):
             raise TypeError('Name must be a string')
+        if not isinstance(resume, bool):
+            raise TypeError('Argument "resume" must be a boolean value')
 
         self.name = name
         self.path = f'tmp/{self.name}.txt'
@@ -30,18 +44,143 @@ class Recorder:
         if not os.path.exists('tmp'):
             os.mkdir('tmp')
         
-        self.save()
+        if resume:
+            self.load()
+        else:
+            self.save()
 
     def save(self):
         """The method of saving the records as a file.
         """
         try:
-            with open(self.path, 'wt') as fout:
-                fout.write(self.outputRecord())                
+            self.writeFile(self.path, self.outputRecord())
 
         except Exception as e:
             print(f'Failed to record on {self.path}\n{e}')
 
+    def writeFile(self, path, text, mode='wt', encoding=None, atomic=False):
+        """The method of writing a text into a file. In the write-behind mode, the text is written following the write-behind policy, possibly later by its writer thread.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+        * text (:obj:`str`): The text.
+        * mode (:obj:`str`): The mode of opening the file, ``wt`` or ``at``. Default is ``wt``.
+        * encoding (:obj:`str`): The encoding of the file. Default is None.
+        * atomic (:obj:`bool`): Whether to write the text into ``{path}.tmp`` and rename it to ``path``, so a crash while writing leaves the former file intact. Default is False.
+        """
+        if self.writeBehind is not None:
+            self.writeBehind.write(path, text, mode, encoding, atomic)
+            return
+
+        target = f'{path}.tmp' if atomic else path
+        with open(target, mode, encoding=encoding) as fout:
+            fout.write(text)
+        if atomic:
+            os.replace(target, path)
+
+    def setWriteBehind(self, writeBehind):
+        """The method of setting the write-behind policy. The savings deferred by the former policy are flushed first.
+
+        Args:
+
+        * writeBehind (:obj:`WriteBehind`): The write-behind policy. None means saving at once.
+
+        Return:
+
+        * :obj:`Recorder`: The recorder itself.
+
+        Raise:
+
+        * TypeError: ``writeBehind`` is defined and not a write-behind policy.
+        """
+        if writeBehind is not None and not isinstance(writeBehind, WriteBehind):
+            raise TypeError('Argument "writeBehind" must be a write-behind policy')
+
+        if self.writeBehind is not None:
+            self.flush()
+
+        self.writeBehind = writeBehind
+        self.pendingSaves = {}
+        return self
+
+    def requestSave(self, method='save'):
+        """The method of requesting a routine saving. The saving method is called at once, or deferred in the write-behind mode until the savings are due.
+
+        Args:
+
+        * method (:obj:`str`): The name of the saving method. Default is ``save``.
+        """
+        if self.writeBehind is None:
+            getattr(self, method)()
+            return
+
+        self.pendingSaves[method] = None
+        self.writeBehind.request(self)
+
+    def savePending(self):
+        """The method of doing the deferred savings of the recorder, each requested saving method once. It is called by the write-behind policy.
+        """
+        methods = list(self.pendingSaves)
+        self.pendingSaves.clear()
+
+        for method in methods:
+            getattr(self, method)()
+
+    def flush(self):
+        """The method of doing the deferred savings and waiting until the files are written. The deferred savings of the other recorders sharing the write-behind policy are done as well, so they stay in step. Without the write-behind mode, the records are saved.
+        """
+        if self.writeBehind is None:
+            self.save()
+            return
+
+        self.writeBehind.savePending()
+        self.writeBehind.drain()
+
+    def close(self):
+        """The method of flushing the recorder and closing its write-behind policy, which stops the writer thread and applies the fsync policy.
+        """
+        self.flush()
+
+        if self.writeBehind is not None:
+            self.writeBehind.close()
+
+    def runFileOperation(self, func, *args):
+        """The method of running a file operation other than writing, such as renaming a file. In the write-behind mode, it is run in order with the written files, possibly later by the writer thread.
+
+        Args:
+
+        * func (:obj:`callable`): The file operation.
+        * args: The arguments of the file operation.
+        """
+        if self.writeBehind is not None:
+            self.writeBehind.submit(func, *args)
+        else:
+            func(*args)
+
+    def __enter__(self):
+        """The method of entering the recorder as a context manager.
+        """
+        return self
+
+    def __exit__(self, *excInfo):
+        """The method of exiting the recorder as a context manager, which closes the recorder.
+        """
+        self.close()
+
+    def load(self):
+        """The method of loading the records from the record file, each line as a record. Nothing is loaded if the record file does not exist.
+        """
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'rt') as fin:
+                self.records = [line for line in fin.read().split('\n') if line]
+
+        except Exception as e:
+            print(f'Failed to load {self.path}\n{e}')
+
     def outputRecord(self):
         """The method of formatting the records as a string to write into a file. It would convert each record into a string presentation, and join all record with ``'\\n'``.
 
@@ -63,7 +202,7 @@ class Recorder:
         self.records.append(newRecord)
 
         if autoSave:
-            self.save()
+            self.requestSave()
 
     def addRecords(self, newRecords, autoSave=True):
         """The method of adding serveral new records.
@@ -77,7 +216,7 @@ class Recorder:
             self.addRecord(r, False)
         
         if autoSave:
-            self.save()
+            self.requestSave()
 
     def recordExists(self):
         """The method of checking whether any record exists or not.
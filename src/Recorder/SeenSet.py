@@ -0,0 +1,375 @@
+from array import array
+import hashlib
+import struct
+import json
+import math
+
+def fingerprint(work):
+    """The method of hashing a work into two 64-bit integers.
+
+    Args:
+
+    * work (:obj:`str`): A url string.
+
+    Return:
+
+    * :obj:`tuple`: The two 64-bit hashes of the work.
+    """
+    digest = hashlib.blake2b(work.encode('utf-8'), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+class FingerprintSeenSet:
+    """The exact set of seen works keeping a 64-bit fingerprint of each work instead of the work itself. The fingerprints are kept in an open addressing table of an :obj:`array.array`, which takes 16 to 32 bytes for each work, while a python string of a url takes 100 bytes or more. Two different works are taken as the same one only if their fingerprints collide, which is negligible below billions of works.
+
+    Attributes:
+
+    * table (:obj:`array.array`): The open addressing table of fingerprints. 0 means an empty slot.
+    * count (:obj:`int`): The amount of added works.
+
+    Args:
+
+    * capacity (:obj:`int`): The amount of works expected, used to size the table at the beginning. The table grows when it is half full. Default is 1024.
+    """
+    magic = b'SEENFP1\n'
+
+    def __init__(self, capacity=1024):
+        """The initial method of a fingerprint seen set.
+        """
+        size = 16
+        while size < capacity * 2:
+            size *= 2
+
+        self.table = array('Q', bytes(8 * size))
+        self.count = 0
+
+    @staticmethod
+    def key(work):
+        """The method of getting the fingerprint of a work. 0 is reserved for the empty slots.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+
+        Return:
+
+        * :obj:`int`: The non-zero 64-bit fingerprint.
+        """
+        return fingerprint(work)[0] or 1
+
+    def slot(self, key):
+        """The method of finding the slot of a fingerprint by linear probing.
+
+        Args:
+
+        * key (:obj:`int`): The fingerprint.
+
+        Return:
+
+        * :obj:`int`: The index of the slot holding the fingerprint, or the empty slot it would be put in.
+        """
+        mask = len(self.table) - 1
+        i = key & mask
+        while self.table[i] and self.table[i] != key:
+            i = (i + 1) & mask
+        return i
+
+    def __contains__(self, work):
+        return self.table[self.slot(self.key(work))] != 0
+
+    def __len__(self):
+        return self.count
+
+    def addKey(self, key):
+        """The method of adding a fingerprint. The table is doubled when it is half full.
+
+        Args:
+
+        * key (:obj:`int`): The fingerprint.
+        """
+        i = self.slot(key)
+        if self.table[i]:
+            return
+
+        self.table[i] = key
+        self.count += 1
+
+        if self.count * 2 >= len(self.table):
+            keys = [k for k in self.table if k]
+            self.table = array('Q', bytes(16 * len(self.table)))
+            for k in keys:
+                self.table[self.slot(k)] = k
+
+    def add(self, work):
+        """The method of adding a work.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+        """
+        self.addKey(self.key(work))
+
+    def update(self, works):
+        """The method of adding several works.
+
+        Args:
+
+        * works (:obj:`iterable`): The url strings.
+        """
+        for work in works:
+            self.add(work)
+
+    def save(self, path):
+        """The method of writing the set into a binary file.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+        """
+        with open(path, 'wb') as fout:
+            fout.write(self.magic)
+            fout.write(struct.pack('<QQ', len(self.table), self.count))
+            self.table.tofile(fout)
+
+    @classmethod
+    def load(cls, path):
+        """The method of reading a set from a binary file written by :obj:`save`.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+
+        Return:
+
+        * :obj:`FingerprintSeenSet`: The set read from the file.
+
+        Raise:
+
+        * ValueError: The file is not written by :obj:`save`.
+        """
+        with open(path, 'rb') as fin:
+            if fin.read(len(cls.magic)) != cls.magic:
+                raise ValueError(f'{path} is not a fingerprint seen set file')
+            size, count = struct.unpack('<QQ', fin.read(16))
+            seen = cls(0)
+            seen.table = array('Q')
+            seen.table.fromfile(fin, size)
+            seen.count = count
+
+        return seen
+
+class BloomSeenSet:
+    """The probabilistic set of seen works. It is a scalable Bloom filter: a work is never missed, but a work not added may be taken as seen with a probability below ``errorRate``, so a few urls would not be crawled. A single Bloom filter needs about 14.4 bits (1.8 bytes) for each work at 0.1% error rate. The stages of this filter are sized for tighter error rates, so that their sum stays below ``errorRate``, and it takes about 2 bytes for each work in the first stage and about 2.4 bytes after a few stages have been added.
+
+    The filter starts with one stage sized for ``capacity`` works. When a stage is full, a new stage twice as large with half the error rate is added, so the overall error rate stays below ``errorRate`` however many works are added. With ``exact`` set, the works passing the filter are confirmed by a :obj:`FingerprintSeenSet`, which makes the set exact; the filter then only saves most lookups of the fingerprint table.
+
+    Attributes:
+
+    * capacity (:obj:`int`): The amount of works of the first stage.
+    * errorRate (:obj:`float`): The upper bound of the false positive rate.
+    * stages (:obj:`list`): The stages. Each stage is a :obj:`dict` of ``bits`` (:obj:`bytearray`), ``size`` (the amount of bits), ``hashes`` (the amount of hash functions), ``capacity`` and ``count``.
+    * fingerprints (:obj:`FingerprintSeenSet`): The exact fingerprints confirming the filter. None if ``exact`` is not set.
+    * count (:obj:`int`): The amount of added works.
+
+    Args:
+
+    * capacity (:obj:`int`): The amount of works of the first stage. Default is 1000000.
+    * errorRate (:obj:`float`): The upper bound of the false positive rate. Default is 0.001.
+    * exact (:obj:`bool`): Whether to confirm the filter with the exact fingerprints. Default is False.
+
+    Raise:
+
+    * TypeError: ``capacity`` is not an integer, ``errorRate`` is not a number, or ``exact`` is not a boolean value.
+    * ValueError: ``capacity`` is less than 1, or ``errorRate`` is not between 0 and 1.
+
+    Example::
+
+        WLM = SpillingWorkingListManager(seenClass=BloomSeenSet)
+    """
+    magic = b'SEENBF1\n'
+    growth = 2
+    tightening = 0.5
+
+    def __init__(self, capacity=1000000, errorRate=0.001, exact=False):
+        """The initial method of a bloom seen set.
+        """
+        if not isinstance(capacity, int) or isinstance(capacity, bool):
+            raise TypeError('Argument "capacity" must be an integer')
+        if capacity < 1:
+            raise ValueError('Argument "capacity" must be at least 1')
+        if not isinstance(errorRate, (int, float)) or isinstance(errorRate, bool):
+            raise TypeError('Argument "errorRate" must be a number')
+        if not 0 < errorRate < 1:
+            raise ValueError('Argument "errorRate" must be between 0 and 1')
+        if not isinstance(exact, bool):
+            raise TypeError('Argument "exact" must be a boolean value')
+
+        self.capacity = capacity
+        self.errorRate = errorRate
+        self.stages = []
+        self.fingerprints = FingerprintSeenSet(capacity) if exact else None
+        self.count = 0
+        self.addStage()
+
+    def addStage(self):
+        """The method of adding a new stage, larger and stricter than the last one.
+        """
+        i = len(self.stages)
+        capacity = self.capacity * self.growth ** i
+        errorRate = self.errorRate * (1 - self.tightening) * self.tightening ** i
+        size = max(8, math.ceil(-capacity * math.log(errorRate) / math.log(2) ** 2))
+        hashes = max(1, round(size / capacity * math.log(2)))
+
+        self.stages.append({
+            'bits': bytearray((size + 7) // 8),
+            'size': size,
+            'hashes': hashes,
+            'capacity': capacity,
+            'count': 0,
+        })
+
+    @staticmethod
+    def positions(stage, h1, h2):
+        """The method of getting the bit positions of a work in a stage by double hashing.
+
+        Args:
+
+        * stage (:obj:`dict`): The stage.
+        * h1 (:obj:`int`): The first hash of the work.
+        * h2 (:obj:`int`): The second hash of the work.
+
+        Return:
+
+        * :obj:`generator`: The bit positions.
+        """
+        size = stage['size']
+        return ((h1 + i * h2) % size for i in range(stage['hashes']))
+
+    def inFilter(self, h1, h2):
+        """The method of checking whether a work passes the filter.
+
+        Args:
+
+        * h1 (:obj:`int`): The first hash of the work.
+        * h2 (:obj:`int`): The second hash of the work.
+
+        Return:
+
+        * :obj:`bool`: True if any stage has all the bits of the work.
+        """
+        for stage in self.stages:
+            bits = stage['bits']
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in self.positions(stage, h1, h2)):
+                return True
+        return False
+
+    def __contains__(self, work):
+        h1, h2 = fingerprint(work)
+        if not self.inFilter(h1, h2):
+            return False
+        if self.fingerprints is None:
+            return True
+        return self.fingerprints.table[self.fingerprints.slot(h1 or 1)] != 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, work):
+        """The method of adding a work. Nothing is changed if the work is taken as seen.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+        """
+        h1, h2 = fingerprint(work)
+        if self.inFilter(h1, h2):
+            if self.fingerprints is None:
+                return
+            before = len(self.fingerprints)
+            self.fingerprints.addKey(h1 or 1)
+            if len(self.fingerprints) == before:
+                return
+            self.count += 1
+            return
+
+        stage = self.stages[-1]
+        if stage['count'] >= stage['capacity']:
+            self.addStage()
+            stage = self.stages[-1]
+
+        bits = stage['bits']
+        for p in self.positions(stage, h1, h2):
+            bits[p >> 3] |= 1 << (p & 7)
+        stage['count'] += 1
+        self.count += 1
+
+        if self.fingerprints is not None:
+            self.fingerprints.addKey(h1 or 1)
+
+    def update(self, works):
+        """The method of adding several works.
+
+        Args:
+
+        * works (:obj:`iterable`): The url strings.
+        """
+        for work in works:
+            self.add(work)
+
+    def save(self, path):
+        """The method of writing the set into a binary file. The fingerprints, if any, are written into ``{path}.fp``.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+        """
+        header = json.dumps({
+            'capacity': self.capacity,
+            'errorRate': self.errorRate,
+            'count': self.count,
+            'exact': self.fingerprints is not None,
+            'stages': [{key: stage[key] for key in ('size', 'hashes', 'capacity', 'count')} for stage in self.stages],
+        }).encode('utf-8')
+
+        with open(path, 'wb') as fout:
+            fout.write(self.magic)
+            fout.write(struct.pack('<Q', len(header)))
+            fout.write(header)
+            for stage in self.stages:
+                fout.write(stage['bits'])
+
+        if self.fingerprints is not None:
+            self.fingerprints.save(f'{path}.fp')
+
+    @classmethod
+    def load(cls, path):
+        """The method of reading a set from a binary file written by :obj:`save`.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+
+        Return:
+
+        * :obj:`BloomSeenSet`: The set read from the file.
+
+        Raise:
+
+        * ValueError: The file is not written by :obj:`save`.
+        """
+        with open(path, 'rb') as fin:
+            if fin.read(len(cls.magic)) != cls.magic:
+                raise ValueError(f'{path} is not a bloom seen set file')
+            length, = struct.unpack('<Q', fin.read(8))
+            header = json.loads(fin.read(length).decode('utf-8'))
+
+            seen = cls(header['capacity'], header['errorRate'])
+            seen.count = header['count']
+            seen.stages = []
+            for stage in header['stages']:
+                stage['bits'] = bytearray(fin.read((stage['size'] + 7) // 8))
+                seen.stages.append(stage)
+
+        if header['exact']:
+            seen.fingerprints = FingerprintSeenSet.load(f'{path}.fp')
+
+        return seen
@@ -0,0 +1,379 @@
+from collections import deque
+import sqlite3
+import shutil
+import json
+import os
+
+from .WorkingListManager import WorkingListManager
+
+class DiskSeenSet:
+    """The set of seen works kept in a sqlite database on disk instead of in memory. The database is committed by :obj:`commit`, but the works added before committing are already seen.
+
+    Attributes:
+
+    * path (:obj:`str`): The path of the database file.
+    * connection (:obj:`sqlite3.Connection`): The connection to the database.
+    * count (:obj:`int`): The amount of works in the database. It is counted once when the database is opened and kept in step with adding, so the size is known without querying.
+    * closed (:obj:`bool`): Whether the database has been closed.
+
+    Args:
+
+    * path (:obj:`str`): The path of the database file. Default is ``tmp/seen.sqlite``.
+    """
+    def __init__(self, path='tmp/seen.sqlite'):
+        """The initial method of a disk seen set.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS seen (work TEXT PRIMARY KEY) WITHOUT ROWID')
+        self.count = self.connection.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        self.closed = False
+
+    def __contains__(self, work):
+        return self.connection.execute('SELECT 1 FROM seen WHERE work = ?', (work,)).fetchone() is not None
+
+    def __len__(self):
+        return self.count
+
+    def add(self, work):
+        """The method of adding a work.
+
+        Args:
+
+        * work (:obj:`str`): A url string.
+        """
+        self.count += self.connection.execute('INSERT OR IGNORE INTO seen VALUES (?)', (work,)).rowcount
+
+    def update(self, works):
+        """The method of adding several works.
+
+        Args:
+
+        * works (:obj:`iterable`): The url strings.
+        """
+        self.count += self.connection.executemany('INSERT OR IGNORE INTO seen VALUES (?)', ((work,) for work in works)).rowcount
+
+    def commit(self):
+        """The method of committing the added works to the database file. Nothing is done if it has been closed.
+        """
+        if not self.closed:
+            self.connection.commit()
+
+    def close(self):
+        """The method of committing and closing the database. Nothing is done if it has been closed.
+        """
+        if self.closed:
+            return
+
+        self.connection.commit()
+        self.connection.close()
+        self.closed = True
+
+class SpillingWorkingListManager(WorkingListManager):
+    """The working list manager keeping the works on disk, so the memory stays flat however many works are queued.
+
+    The queued works are written into segment files of ``segmentSize`` works in ``tmp/frontier``, in the order they were added. Only the head segment, which the works are got from, and the works not yet written into the newest segment are kept in memory. A segment file is removed once all its works have been got. The done list is appended to the done list file instead of being kept in memory, and the seen set is a :obj:`DiskSeenSet`.
+
+    The position of the head and the amount of queued works are written into a small cursor file on each saving, replaced atomically, so the working list could be resumed from the segment files. The works still in flight when the last crawl stopped are got again first when resuming.
+
+    Attributes:
+
+    * segmentSize (:obj:`int`): The amount of works in a segment file.
+    * segmentDir (:obj:`str`): The directory of the segment files.
+    * cursorPath (:obj:`str`): The path of the cursor file.
+    * seenPath (:obj:`str`): The path of the binary file of a seen set other than :obj:`DiskSeenSet`, written by its ``save`` when closing.
+    * head (:obj:`collections.deque`): The works of the head segment not yet got.
+    * headSegment (:obj:`int`): The index of the head segment.
+    * headOffset (:obj:`int`): The amount of works got from the head segment.
+    * tail (:obj:`list`): The works not yet written into the newest segment.
+    * tailSegment (:obj:`int`): The index of the newest segment.
+    * tailLength (:obj:`int`): The amount of works written into the newest segment.
+    * retry (:obj:`collections.deque`): The works in flight when the last crawl stopped, got again before the head.
+    * queued (:obj:`int`): The amount of queued works.
+    * done (:obj:`list`): The processed works not yet appended to the done list file.
+    * The other attributes are the same as :obj:`WorkingListManager`.
+
+    Args:
+
+    * workingList (:obj:`list`): A list of url string.
+    * segmentSize (:obj:`int`): The amount of works in a segment file. Default is 10000.
+    * resume (:obj:`bool`): Whether to resume from the segment files, the cursor file, the seen set and the in-flight work list. Default is False.
+    * seenClass (:obj:`callable`): The class or factory of the seen set, for example :obj:`BloomSeenSet` to keep the seen set in a compact form in memory. A seen set other than :obj:`DiskSeenSet` having ``save`` and ``load`` is written into ``seenPath`` when closing, and read from it when resuming. The file is removed once it is read, so after a crash, or for a seen set without ``save``, the seen set is rebuilt from the done list file and the segment files instead. Default is :obj:`DiskSeenSet`.
+
+    Raise:
+
+    * TypeError: The input argument is not a list or a deque of strings, or ``segmentSize`` is not an integer.
+    * ValueError: ``segmentSize`` is less than 1.
+    """
+    seenClass = DiskSeenSet
+
+    def __init__(self, workingList=None, segmentSize=10000, resume=False, seenClass=None):
+        """The initial method of a spilling working list manager.
+        """
+        if not isinstance(segmentSize, int) or isinstance(segmentSize, bool):
+            raise TypeError('Argument "segmentSize" must be an integer')
+        if segmentSize < 1:
+            raise ValueError('Argument "segmentSize" must be at least 1')
+
+        self.segmentSize = segmentSize
+        self.segmentDir = 'tmp/frontier'
+        self.cursorPath = f'{self.segmentDir}/cursor.json'
+        self.seenPath = 'tmp/seen.bin'
+        self.head = deque()
+        self.headSegment = 0
+        self.headOffset = 0
+        self.tail = []
+        self.tailSegment = 0
+        self.tailLength = 0
+        self.retry = deque()
+        self.queued = 0
+
+        if not resume:
+            shutil.rmtree(self.segmentDir, ignore_errors=True)
+            for path in ('tmp/seen.sqlite', 'tmp/seen.sqlite-wal', 'tmp/seen.sqlite-shm', self.seenPath, f'{self.seenPath}.fp', 'tmp/done.txt', 'tmp/inFlight.txt'):
+                if os.path.exists(path):
+                    os.remove(path)
+        os.makedirs(self.segmentDir, exist_ok=True)
+
+        super().__init__(workingList, resume=resume, seenClass=seenClass)
+
+    def segmentPath(self, index):
+        """The method of getting the path of a segment file.
+
+        Args:
+
+        * index (:obj:`int`): The index of the segment.
+
+        Return:
+
+        * :obj:`str`: The path of the segment file.
+        """
+        return f'{self.segmentDir}/{index:08d}.txt'
+
+    def flushTail(self):
+        """The method of appending the unwritten works to the newest segment file. A new segment is started once the newest one is full.
+        """
+        if not self.tail:
+            return
+
+        try:
+            self.writeFile(self.segmentPath(self.tailSegment), ''.join(f'{work}\n' for work in self.tail), 'at')
+
+        except Exception as e:
+            print(f'Failed to record on {self.segmentPath(self.tailSegment)}: {e}')
+            return
+
+        self.tailLength += len(self.tail)
+        self.tail.clear()
+
+        if self.tailLength >= self.segmentSize:
+            self.tailSegment += 1
+            self.tailLength = 0
+
+    def loadHead(self):
+        """The method of loading the works not yet got of the head segment. A consumed segment file is removed and the next one is loaded. The newest segment is closed before it becomes the head, so a segment is never read and written at the same time. If the newest segment is reached with nothing written in it, no work is left on disk, and the amount of queued works is corrected.
+        """
+        while not self.head and self.queued > len(self.retry):
+            if self.headSegment == self.tailSegment:
+                self.flushTail()
+                if self.headSegment == self.tailSegment:
+                    if not self.tailLength:
+                        print(f'Failed to find {self.queued - len(self.retry)} queued works in {self.segmentDir}')
+                        self.queued = len(self.retry)
+                        return
+                    self.tailSegment += 1
+                    self.tailLength = 0
+
+            if self.writeBehind is not None:
+                self.writeBehind.drain()        # The segment may be written by the writer thread
+
+            path = self.segmentPath(self.headSegment)
+            if os.path.exists(path):
+                with open(path, 'rt') as fin:
+                    self.head = deque(line for i, line in enumerate(fin.read().split('\n')) if line and i >= self.headOffset)
+            if self.head:
+                return
+
+            if os.path.exists(path):
+                os.remove(path)
+            self.headSegment += 1
+            self.headOffset = 0
+
+    def save(self):
+        """The method of writing the unwritten works into the newest segment, appending the processed works to the done list file, committing the seen set and rewriting the cursor file.
+        """
+        self.flushTail()
+
+        if self.done:
+            try:
+                self.writeFile(self.donePath, ''.join(f'{work}\n' for work in self.done), 'at')
+
+            except Exception as e:
+                print(f'Failed to record on done.txt: {e}')
+
+            self.done.clear()
+
+        if isinstance(self.seen, DiskSeenSet):
+            self.seen.commit()
+
+        try:
+            self.writeFile(self.cursorPath, json.dumps({
+                'headSegment': self.headSegment,
+                'headOffset': self.headOffset,
+                'tailSegment': self.tailSegment,
+                'queued': self.queued - len(self.retry),
+            }), atomic=True)
+
+        except Exception as e:
+            print(f'Failed to record on {self.cursorPath}: {e}')
+
+    def load(self):
+        """The method of loading the cursor and the in-flight works. The head segment is loaded when a work is got.
+        """
+        self.head, self.retry, self.tail, self.done = deque(), deque(), [], []
+
+        if os.path.exists(self.cursorPath):
+            with open(self.cursorPath, 'rt') as fin:
+                cursor = json.loads(fin.read())
+            self.headSegment = cursor['headSegment']
+            self.headOffset = cursor['headOffset']
+            self.tailSegment = cursor['tailSegment']
+            self.queued = cursor['queued']
+
+        tailPath = self.segmentPath(self.tailSegment)
+        if os.path.exists(tailPath):
+            with open(tailPath, 'rt') as fin:
+                self.tailLength = sum(1 for line in fin if line.strip())
+
+        if os.path.exists(self.inFlightPath):
+            with open(self.inFlightPath, 'rt') as fin:
+                self.inFlight = dict.fromkeys(line for line in fin.read().split('\n') if line)
+
+        if not isinstance(self.seen, DiskSeenSet) and not self.loadSeen():
+            paths = [self.donePath] + [self.segmentPath(i) for i in range(self.headSegment, self.tailSegment + 1)]
+            for path in paths:
+                if os.path.exists(path):
+                    with open(path, 'rt') as fin:
+                        self.seen.update(line.rstrip('\n') for line in fin if line.strip())
+
+    def loadSeen(self):
+        """The method of reading the seen set from the binary file written when the last crawl was closed. The file is removed after reading, since the seen set would be ahead of it once a work is added.
+
+        Return:
+
+        * :obj:`bool`: True if the seen set is read, False if it should be rebuilt.
+        """
+        if not os.path.exists(self.seenPath) or not hasattr(type(self.seen), 'load'):
+            return False
+
+        try:
+            self.seen = type(self.seen).load(self.seenPath)
+
+        except Exception as e:
+            print(f'Failed to load {self.seenPath}: {e}')
+            return False
+
+        finally:
+            for path in (self.seenPath, f'{self.seenPath}.fp'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return True
+
+    def saveSeen(self):
+        """The method of writing the seen set into the binary file by its ``save``. The files are written under temporary names and renamed, the main file last, so the file is never read half written.
+        """
+        if isinstance(self.seen, DiskSeenSet) or not hasattr(self.seen, 'save'):
+            return
+
+        tmpPath = f'{self.seenPath}.tmp'
+        try:
+            self.seen.save(tmpPath)
+            if os.path.exists(f'{tmpPath}.fp'):        # The fingerprints of an exact bloom seen set
+                os.replace(f'{tmpPath}.fp', f'{self.seenPath}.fp')
+            os.replace(tmpPath, self.seenPath)
+
+        except Exception as e:
+            print(f'Failed to record on {self.seenPath}: {e}')
+
+    def requeueInFlight(self):
+        """The method of getting the in-flight works again before the head. They stay in flight until they are finished, so they are not lost if the crawl stops again.
+        """
+        self.retry.extend(self.inFlight)
+        self.queued += len(self.inFlight)
+
+    def addRecord(self, newRecord, autoSave=True):
+        """The method of adding a work after the newest queued one. A work would not be added again if it has been added before.
+
+        Args:
+
+        * newRecord (:obj:`str`): A url string as a new work.
+        * autoSave (:obj:`bool`): A boolean value handling auto saving. The default value is ``True``.
+        """
+        if newRecord in self.seen:
+            return
+
+        self.seen.add(newRecord)
+        self.tail.append(newRecord)
+        self.queued += 1
+
+        if len(self.tail) >= self.segmentSize:
+            self.flushTail()
+
+        if autoSave:
+            self.requestSave()
+
+    def getWork(self):
+        """The method of getting the oldest queued work.
+
+        Return:
+
+        * work (:obj:`str`): The oldest queued work. None if there is no work.
+        """
+        if self.retry:
+            work = self.retry.popleft()     # Already in flight and in the done list file
+        else:
+            self.loadHead()
+            if not self.head:
+                return None
+            work = self.head.popleft()
+            self.headOffset += 1
+            self.done.append(work)
+            self.inFlight[work] = None
+
+        self.queued -= 1
+
+        self.requestSave('saveInFlight')        # Before the cursor passes the work, so a crash between the two writes does not lose it
+        self.requestSave()
+
+        return work
+
+    def close(self):
+        """The method of flushing the working list manager, closing its write-behind policy, and committing and closing the seen set if it is a :obj:`DiskSeenSet`, or writing it into ``seenPath`` otherwise.
+        """
+        super().close()
+
+        if isinstance(self.seen, DiskSeenSet):
+            self.seen.close()
+        else:
+            self.saveSeen()
+
+    def workExists(self):
+        """The method of checking the existence of queued work.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if work exists, ``False`` otherwise.
+        """
+        return self.queued > 0
+
+    def remainedAmount(self):
+        """The method of getting the remained work amount.
+
+        Return:
+
+        * :obj:`int`: The amount of queued works.
+        """
+        return self.queued
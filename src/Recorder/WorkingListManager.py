@@ -1,4 +1,5 @@
 from collections import deque
+import os
 
 from .Recorder import Recorder
 
@@ -12,20 +13,57 @@ class WorkingListManager(Recorder):
     * records (:obj:`list`): The list of works.
     * done (:obj:`list`): The list of processed works.
     * donePath (:obj:`str`): The file path of the processed work list.
+    * seen (:obj:`set`): The set of every work in the working list or the done list. It is kept in step with both lists so that checking whether a work has been added before takes constant time.
+    * journal (:obj:`bool`): Whether the journaled persistence mode is used.
+    * journalPath (:obj:`str`): The file path of the journal. It has the format ``tmp/{name}.journal``.
+    * compactInterval (:obj:`int`): The amount of journal entries written before the journal is compacted into the working list file and the done list file.
+    * inFlight (:obj:`dict`): The works which have been got but not yet finished, in the order of getting. Only the keys are used.
+    * inFlightPath (:obj:`str`): The file path of the in-flight work list.
+    * flushLast (:obj:`bool`): Set True, so in the write-behind mode the works are marked as got or finished on disk only after the records of the extractors sharing the policy are written.
+    * seenClass (:obj:`type`): The class of the seen set. It is called without arguments and has to support ``in``, ``add`` and ``update``, for example :obj:`BloomSeenSet` or :obj:`FingerprintSeenSet` to save memory. Default is :obj:`set`. The seen set is rebuilt from the working list file and the done list file when resuming. The done list is still kept in memory as strings, so a compact seen set only saves the memory of the set itself. A compact seen set is meant for :obj:`SpillingWorkingListManager`, which appends the done list to its file instead of keeping it, and saves and loads the seen set by its own ``save`` and ``load``.
+
+    In the journaled persistence mode, adding a work and getting a work are appended to the journal as a line of ``+{work}`` and ``-{work}`` respectively, instead of rewriting the whole working list file and done list file. The two files are rewritten as a snapshot only when the journal is compacted. The working list and the done list can be rebuilt from the snapshot and the journal by :obj:`load`. The snapshot files are replaced atomically before the journal is emptied, and replaying a journal entry already folded into the snapshot does nothing, so a crawl crashed at any point, even while compacting, is recovered with ``resume=True``. Without resuming, the files and the journal of the last crawl are overwritten at the initialization.
+
+    A got work stays in flight until :obj:`finishWork` is called, and the in-flight works are written into their own small file. Getting a work only rewrites the in-flight work list file; without the journal, the work leaves the working list file at the next saving, such as adding the links of its page, or closing. A work finished before that is processed again when resuming. In the resume mode, the working list, the done list and the in-flight works are loaded from the files instead of being overwritten, and the works still in flight when the last crawl stopped are put back to the front of the working list, so they are processed again while the finished works are not.
 
     Args:
 
     * workingList (:obj:`list`): A list of url string.
+    * journal (:obj:`bool`): Whether to use the journaled persistence mode. Default is False.
+    * compactInterval (:obj:`int`): The amount of journal entries written before compacting. Default is 10000.
+    * resume (:obj:`bool`): Whether to resume from the working list file, the done list file, the journal and the in-flight work list. The works of ``workingList`` not seen before are added after the loaded ones. Default is False.
+    * seenClass (:obj:`callable`): The class or factory of the seen set, used instead of the class attribute. Default is None.
 
     Raise:
 
-    * TypeError: The input argument is not a list or a deque of strings.
+    * TypeError: The input argument is not a list or a deque of strings, or ``seenClass`` is not callable.
     """
-    def __init__(self, workingList=None):
+    seenClass = set
+    flushLast = True
+
+    def __init__(self, workingList=None, journal=False, compactInterval=10000, resume=False, seenClass=None):
+        if seenClass is not None:
+            if not callable(seenClass):
+                raise TypeError('Argument "seenClass" must be callable')
+            self.seenClass = seenClass
+
         self.donePath = 'tmp/done.txt'
         self.done = []
+        self.seen = self.seenClass()
+        self.inFlight = {}
+        self.inFlightPath = 'tmp/inFlight.txt'
+
+        if not isinstance(journal, bool):
+            raise TypeError('Argument "journal" must be a boolean value')
+        if not isinstance(compactInterval, int):
+            raise TypeError('Argument "compactInterval" must be an integer')
+        self.journal = journal
+        self.journalPath = 'tmp/workingList.journal'
+        self.compactInterval = compactInterval
+        self.journalBuffer = []
+        self.journalLength = 0
         
-        super().__init__('workingList')        
+        super().__init__('workingList', resume)
 
         if workingList is None:
             workingList = deque()
@@ -45,21 +83,140 @@ class WorkingListManager(Recorder):
         else:
             raise TypeError('Input working list must be a list or deque.')
 
-        self.records = workingList
-        self.save()
+        if resume:
+            self.requeueInFlight()
+        else:
+            self.records = deque()
+        self.addRecords(workingList, False)
+
+        if self.journal:
+            self.compact()
+        else:
+            self.save()
 
     def save(self):
-        """The method of saving the working list and done list.
+        """The method of saving the working list and done list. In the journaled persistence mode, only the unsaved journal entries are appended to the journal, and the journal is compacted if it has reached the compacting interval. The in-flight works are saved on their own by :obj:`saveInFlight`.
         """
-        super().save()
+        if not self.journal:
+            self.saveLists()
+            return
 
+        if self.journalBuffer:
+            try:
+                self.writeFile(self.journalPath, ''.join(f'{entry}\n' for entry in self.journalBuffer), 'at')
+
+            except Exception as e:
+                print(f'Failed to record on {self.journalPath}: {e}')
+
+            self.journalLength += len(self.journalBuffer)
+            self.journalBuffer.clear()
+
+        if self.journalLength >= self.compactInterval:
+            self.compact()
+
+    def saveSnapshot(self):
+        """The method of rewriting the whole in-flight work list file, working list file and done list file. The in-flight works are written first, so a got work is never missing from both the working list file and the in-flight work list file.
+        """
+        self.saveInFlight()
+        self.saveLists()
+
+    def saveLists(self):
+        """The method of rewriting the whole done list file and working list file. Each file is replaced atomically. The done list is written first, so a crash between the two writes leaves a work in both files, and :obj:`load` drops the finished works from the working list.
+        """
         try:
-            with open(self.donePath, 'wt') as fout:
-                fout.write('\n'.join(self.done))
+            self.writeFile(self.donePath, '\n'.join(self.done), atomic=True)
 
         except Exception as e:
             print(f'Failed to record on done.txt: {e}')
 
+        try:
+            self.writeFile(self.path, self.outputRecord(), atomic=True)
+
+        except Exception as e:
+            print(f'Failed to record on {self.path}\n{e}')
+
+    def saveInFlight(self):
+        """The method of rewriting the in-flight work list file.
+        """
+        try:
+            self.writeFile(self.inFlightPath, '\n'.join(self.inFlight), atomic=True)
+
+        except Exception as e:
+            print(f'Failed to record on {self.inFlightPath}: {e}')
+
+    def compact(self):
+        """The method of compacting the journal. The working list file and done list file are rewritten as a snapshot, and the journal is emptied.
+        """
+        self.saveSnapshot()
+        self.journalBuffer.clear()
+        self.journalLength = 0
+
+        try:
+            self.writeFile(self.journalPath, '')
+
+        except Exception as e:
+            print(f'Failed to record on {self.journalPath}: {e}')
+
+    def load(self):
+        """The method of rebuilding the working list, the done list and the in-flight works from the working list file, the done list file, the journal and the in-flight work list file. The works of the working list file already in the done list file are dropped, and the journal entries already in the snapshot, left by a crash between writing the snapshot and emptying the journal, are skipped.
+        """
+        def readLines(path):
+            if not os.path.exists(path):
+                return []
+            with open(path, 'rt') as fin:
+                return [line for line in fin.read().split('\n') if line]
+
+        done = readLines(self.donePath)
+        finished = set(done)
+        records = deque(work for work in readLines(self.path) if work not in finished)
+        queued = set(records)
+
+        for entry in readLines(self.journalPath):
+            op, work = entry[0], entry[1:]
+
+            if op == '+':
+                if work in queued or work in finished:
+                    continue
+                records.append(work)
+                queued.add(work)
+
+            elif op == '-':
+                if work in finished:
+                    continue
+                if records and records[0] == work:
+                    records.popleft()
+                elif work in queued:
+                    records.remove(work)
+                queued.discard(work)
+                done.append(work)
+                finished.add(work)
+
+        self.records = records
+        self.done = done
+        self.seen = self.seenClass()
+        self.seen.update(records)
+        self.seen.update(done)
+        self.inFlight = dict.fromkeys(work for work in readLines(self.inFlightPath) if work in self.seen)
+        self.journalBuffer.clear()
+
+    def savePending(self):
+        """The method of doing the deferred savings. The in-flight works are always written first, whichever saving was requested first, so a got work is never missing from both the in-flight work list file and the working list on disk.
+        """
+        if 'saveInFlight' in self.pendingSaves:
+            self.pendingSaves = {'saveInFlight': None, **self.pendingSaves}
+
+        super().savePending()
+
+    def requeueInFlight(self):
+        """The method of putting the in-flight works back to the front of the working list, in the order they were got, and removing them from the done list.
+        """
+        if not self.inFlight:
+            return
+
+        self.done = [work for work in self.done if work not in self.inFlight]
+        self.records = deque(work for work in self.inFlight if work not in self.records) + self.records
+        self.inFlight = {}
+
     def addRecord(self, newRecord, autoSave=True):
         """The method of adding a work as a new record. A record would not be added into the working list again if it has been added before.
 
@@ -68,13 +225,15 @@ class WorkingListManager(Recorder):
         * newRecord (:obj:`str`): A url string as a new work.
         * autoSave (:obj:`bool`): A boolean value handling auto saving. The default value is ``True``.
         """
-        if newRecord in self.records:
-            return
-        
-        if newRecord in self.done:
+        if newRecord in self.seen:
             return
 
-        super().addRecord(newRecord)
+        self.seen.add(newRecord)
+
+        if self.journal:
+            self.journalBuffer.append(f'+{newRecord}')
+
+        super().addRecord(newRecord, autoSave)
 
     def addWork(self, work):
         """The method of adding a work into the working list.
@@ -104,14 +263,39 @@ class WorkingListManager(Recorder):
         try:
             work = self.records.popleft()
             self.done.append(work)
+            self.inFlight[work] = None
+
+            if self.journal:
+                self.journalBuffer.append(f'-{work}')
             
         except IndexError:
             return None        
         
-        self.save()
+        self.requestSave('saveInFlight')        # Before the journal marks the work as got
+        if self.journal:
+            self.requestSave()
         
         return work
 
+    def close(self):
+        """The method of saving the working list and done list, flushing the working list manager and closing its write-behind policy. The works got since the last saving are still in the working list file until it is saved.
+        """
+        self.requestSave()
+        super().close()
+
+    def finishWork(self, work):
+        """The method of marking a got work as finished, so it would not be processed again when resuming.
+
+        Args:
+
+        * work (:obj:`str`): The finished work.
+        """
+        if work not in self.inFlight:
+            return
+
+        del self.inFlight[work]
+        self.requestSave('saveInFlight')
+
     def workExists(self):
         """The method of checking the existence of work in working list.
 
@@ -121,6 +305,15 @@ class WorkingListManager(Recorder):
         """
         return self.recordExists()
 
+    def waitTime(self):
+        """The method of getting the seconds to wait before a work could be got. The works of a working list manager could always be got at once, but a subclass may hold the works back, and :obj:`getWork` returns None while waiting.
+
+        Return:
+
+        * :obj:`float`: The seconds to wait. None if no work would be ready until a work in flight is finished.
+        """
+        return 0
+
     def remainedAmount(self):
         """The method of getting the remained work amount.
 
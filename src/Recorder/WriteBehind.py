@@ -0,0 +1,192 @@
+import threading
+import queue
+import time
+import os
+
+class WriteBehind:
+    """The policy of deferring the saving of recorders, so the crawl loop does not wait for the disk on every added record or got work.
+
+    A recorder set with a write-behind policy by :obj:`Recorder.setWriteBehind` does not save at once when a record is added. The saving is remembered, and the remembered savings are done together when ``flushSize`` of them have been requested, when ``flushInterval`` seconds have passed since the first of them, or when :obj:`Recorder.flush` or :obj:`Recorder.close` is called. The time is checked when a saving is requested.
+
+    The savings requested by all the recorders sharing a policy are counted together, and they are all done in the same flush, so a recorder requesting savings rarely does not lag behind a busy one. The recorders with ``flushLast`` set, such as the working list manager, are saved after the others, so the progress of a crawl is never written ahead of the records of its pages.
+
+    The text of the record files is always formatted on the calling thread, so the records are never read by two threads at the same time. If ``background`` is set, the files are written by a writer thread in the order they are submitted, and the calling thread does not wait for the disk at all. A policy could be shared by several recorders, and they share the writer thread.
+
+    Attributes:
+
+    * flushSize (:obj:`int`): The amount of requested savings which triggers flushing.
+    * flushInterval (:obj:`float`): The seconds since the first requested saving which triggers flushing. None means never flushing by time.
+    * background (:obj:`bool`): Whether the files are written by the writer thread.
+    * fsync (:obj:`str`): The fsync policy. ``never`` leaves the written files to the operating system, ``write`` fsyncs each file after it is written, and ``close`` fsyncs every written file once when the policy is closed.
+    * written (:obj:`set`): The paths written since the policy was closed, which are fsynced when closing if ``fsync`` is ``close``.
+    * pending (:obj:`dict`): The recorders with requested savings not yet done, in the order of their first request. Only the keys are used.
+    * pendingCount (:obj:`int`): The amount of requested savings not yet done.
+    * pendingSince (:obj:`float`): The time of the first requested saving not yet done. None if no saving is requested.
+
+    Args:
+
+    * flushSize (:obj:`int`): The amount of requested savings which triggers flushing. Default is 1000.
+    * flushInterval (:obj:`float`): The seconds since the first requested saving which triggers flushing. Default is 1.
+    * background (:obj:`bool`): Whether to write the files by a writer thread. Default is False.
+    * fsync (:obj:`str`): The fsync policy, ``never``, ``write`` or ``close``. Default is ``never``.
+
+    Raise:
+
+    * TypeError: ``flushSize`` is not an integer, ``flushInterval`` is defined and not a number, or ``background`` is not a boolean value.
+    * ValueError: ``flushSize`` is less than 1, or ``fsync`` is not one of ``never``, ``write`` and ``close``.
+    """
+    fsyncPolicies = ('never', 'write', 'close')
+
+    def __init__(self, flushSize=1000, flushInterval=1, background=False, fsync='never'):
+        """The initial method of a write-behind policy.
+        """
+        if not isinstance(flushSize, int) or isinstance(flushSize, bool):
+            raise TypeError('Argument "flushSize" must be an integer')
+        if flushSize < 1:
+            raise ValueError('Argument "flushSize" must be at least 1')
+        if flushInterval is not None and (not isinstance(flushInterval, (int, float)) or isinstance(flushInterval, bool)):
+            raise TypeError('Argument "flushInterval" must be a number')
+        if not isinstance(background, bool):
+            raise TypeError('Argument "background" must be a boolean value')
+        if fsync not in self.fsyncPolicies:
+            raise ValueError(f'Argument "fsync" must be one of {", ".join(self.fsyncPolicies)}')
+
+        self.flushSize = flushSize
+        self.flushInterval = flushInterval
+        self.background = background
+        self.fsync = fsync
+        self.written = set()
+        self.pending = {}
+        self.pendingCount = 0
+        self.pendingSince = None
+        self.queue = queue.Queue()
+        self.writer = None
+        self.lock = threading.Lock()
+
+    def isDue(self):
+        """The method of checking whether the requested savings should be done now.
+
+        Return:
+
+        * :obj:`bool`: ``True`` if the savings should be done, ``False`` otherwise.
+        """
+        if self.pendingCount >= self.flushSize:
+            return True
+
+        return self.flushInterval is not None and self.pendingSince is not None and time.time() - self.pendingSince >= self.flushInterval
+
+    def request(self, recorder):
+        """The method of counting a saving requested by a recorder, and doing all the requested savings if they are due.
+
+        Args:
+
+        * recorder (:obj:`Recorder`): The recorder requesting the saving.
+        """
+        self.pending[recorder] = None
+        self.pendingCount += 1
+        if self.pendingSince is None:
+            self.pendingSince = time.time()
+
+        if self.isDue():
+            self.savePending()
+
+    def savePending(self):
+        """The method of doing the requested savings of all the recorders, the ones with ``flushLast`` set after the others.
+        """
+        recorders = sorted(self.pending, key=lambda recorder: recorder.flushLast)
+        self.pending.clear()
+        self.pendingCount = 0
+        self.pendingSince = None
+
+        for recorder in recorders:
+            recorder.savePending()
+
+    def submit(self, func, *args):
+        """The method of running a file operation, on the writer thread if ``background`` is set, or at once otherwise. An exception raised on the writer thread is printed.
+
+        Args:
+
+        * func (:obj:`callable`): The file operation.
+        * args: The arguments of the file operation.
+        """
+        if not self.background:
+            func(*args)
+            return
+
+        with self.lock:
+            if self.writer is None:
+                self.writer = threading.Thread(target=self.run, name='RecorderWriter', daemon=True)
+                self.writer.start()
+        self.queue.put((func, args))
+
+    def write(self, path, text, mode='wt', encoding=None, atomic=False):
+        """The method of writing a text into a file following the policy.
+
+        Args:
+
+        * path (:obj:`str`): The path of the file.
+        * text (:obj:`str`): The text.
+        * mode (:obj:`str`): The mode of opening the file, ``wt`` or ``at``. Default is ``wt``.
+        * encoding (:obj:`str`): The encoding of the file. Default is None.
+        * atomic (:obj:`bool`): Whether to write the text into ``{path}.tmp`` and rename it to ``path``. Default is False.
+        """
+        self.submit(self.writeText, path, text, mode, encoding, atomic)
+
+    def writeText(self, path, text, mode, encoding, atomic=False):
+        """The file operation of writing a text, with the fsync policy applied.
+        """
+        target = f'{path}.tmp' if atomic else path
+        with open(target, mode, encoding=encoding) as fout:
+            fout.write(text)
+            if self.fsync == 'write':
+                fout.flush()
+                os.fsync(fout.fileno())
+        if atomic:
+            os.replace(target, path)
+
+        if self.fsync == 'close':
+            self.written.add(path)
+
+    def run(self):
+        """The method run by the writer thread, doing the submitted file operations in order until it is stopped.
+        """
+        while True:
+            func, args = self.queue.get()
+            try:
+                if func is None:
+                    return
+                func(*args)
+
+            except Exception as e:
+                print(f'Failed to record in the background\n{e}')
+
+            finally:
+                self.queue.task_done()
+
+    def drain(self):
+        """The method of waiting until the submitted file operations are done.
+        """
+        if self.writer is not None:
+            self.queue.join()
+
+    def close(self):
+        """The method of stopping the writer thread after the submitted file operations are done, and fsyncing the written files if ``fsync`` is ``close``. The writer thread is started again if a file operation is submitted later.
+        """
+        with self.lock:
+            writer, self.writer = self.writer, None
+        if writer is not None:
+            self.queue.put((None, ()))
+            writer.join()
+
+        if self.fsync == 'close':
+            for path in self.written:
+                if not os.path.exists(path):
+                    continue
+                try:
+                    with open(path, 'ab') as fout:
+                        os.fsync(fout.fileno())
+
+                except Exception as e:
+                    print(f'Failed to fsync {path}\n{e}')
+
+        self.written.clear()
@@ -1,18 +1,34 @@
 # -*- coding: utf-8 -*-
 """
 .. module:: Recorder
-   :synopsis: This module contains three kinds of recorders: Recorder, WorkingListManager, and JsonRecorder.
+   :synopsis: This module contains the recorders: Recorder, WorkingListManager, HostWorkingListManager, PriorityWorkingListManager, SpillingWorkingListManager, BloomSeenSet, FingerprintSeenSet, JsonRecorder, JsonLinesRecorder, LogRecorder, and the WriteBehind policy of the recorders.
 
 .. moduleauthor:: Su, Yeh-Tarn
 
 """
 
 from .Recorder import Recorder
+from .WriteBehind import WriteBehind
 from .WorkingListManager import WorkingListManager
+from .HostWorkingListManager import HostWorkingListManager
+from .PriorityWorkingListManager import PriorityWorkingListManager
+from .SpillingWorkingListManager import SpillingWorkingListManager, DiskSeenSet
+from .SeenSet import BloomSeenSet, FingerprintSeenSet
 from .JsonRecorder import JsonRecorder
+from .JsonLinesRecorder import JsonLinesRecorder
+from .LogRecorder import LogRecorder
 
 __all__ = [
     'Recorder',
+    'WriteBehind',
     'WorkingListManager',
-    'JsonRecorder'
+    'HostWorkingListManager',
+    'PriorityWorkingListManager',
+    'SpillingWorkingListManager',
+    'DiskSeenSet',
+    'BloomSeenSet',
+    'FingerprintSeenSet',
+    'JsonRecorder',
+    'JsonLinesRecorder',
+    'LogRecorder'
 ]
\ No newline at end of file
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: RuleUrlMatcher
+   :synopsis: This module contains the url matcher checking urls with many include and exclude rules.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from urllib.parse import urlparse
+import re
+
+from UrlMatcher import UrlMatcher
+
+class RuleUrlMatcher(UrlMatcher):
+    """The url matcher checking urls with many include and exclude rules. A url is included if it matches the scheme, domain and path patterns of :obj:`UrlMatcher`, and the rule with the highest priority among the rules it matches is an include rule. When two matched rules have the same priority, the exclude rule wins, then the earlier added rule.
+
+    A rule has a scheme, a host, and a path prefix or a path regular expression, and each of them may be left None to match anything. The host ``example.com`` matches only the host itself, while ``.example.com`` matches the host and all its subdomains.
+
+    The rules are not tested one by one. They are indexed by host: the exact hosts are kept in a :obj:`dict` and the host suffixes in a trie of reversed labels, so finding the rules of a host takes a few lookups. The rules sharing the same host are merged into one regular expression, whose alternatives are ordered by priority, so one match finds the winning rule. A rule whose ``pathRegex`` has groups is compiled on its own instead, so its group names and numbered backreferences are kept as they are written.
+
+    Attributes:
+
+    * rules (:obj:`list`): The list of rules. Each rule is a :obj:`dict` with the keys ``include``, ``scheme``, ``host``, ``path``, ``pathRegex`` and ``priority``.
+    * default (:obj:`bool`): The verdict of a url matching no rule. None means True if there is no include rule and False otherwise.
+
+    Args:
+
+    * rules (:obj:`list`): A list of rules. Each rule is a :obj:`dict` of the arguments of :obj:`addRule`. Default is an empty list.
+    * default (:obj:`bool`): The verdict of a url matching no rule. Default is None.
+    * The other arguments are the same as :obj:`UrlMatcher`.
+
+    Example::
+
+        UM = RuleUrlMatcher(rules=[
+            {'host': '.example.com'},
+            {'host': '.example.com', 'path': '/private', 'include': False, 'priority': 1},
+            {'host': 'blog.example.com', 'pathRegex': r'/\\d{4}/', 'scheme': 'https', 'priority': 2},
+        ])
+    """
+    def __init__(self, rules=None, default=None, **kwargs):
+        """The initial method of a rule url matcher.
+        """
+        self.rules = []
+        self.default = default
+        self.compiled = False
+        super().__init__(**kwargs)
+
+        if rules is None:
+            rules = []
+        elif not isinstance(rules, list):
+            raise TypeError('Rules must be a list of dicts')
+
+        for rule in rules:
+            if not isinstance(rule, dict):
+                raise TypeError('Rules must be a list of dicts')
+            self.addRule(**rule)
+
+    def addRule(self, include=True, host=None, path=None, pathRegex=None, scheme=None, priority=0):
+        """The method of adding a rule. The memorized verdicts are cleared.
+
+        Args:
+
+        * include (:obj:`bool`): Whether the matched urls are included or excluded. Default is True.
+        * host (:obj:`str`): The host of the rule. A host starting with ``'.'`` matches its subdomains as well. Default is None, which matches any host.
+        * path (:obj:`str`): The prefix of the path. Default is None.
+        * pathRegex (:obj:`str`): The regular expression string matching the start of the path. Default is None. Only one of ``path`` and ``pathRegex`` could be set.
+        * scheme (:obj:`str`): The scheme of the rule. Default is None, which matches any scheme.
+        * priority (:obj:`int`): The priority of the rule. Default is 0.
+
+        Raise:
+
+        * TypeError: Some arguments are of wrong types.
+        * ValueError: Both ``path`` and ``pathRegex`` are set, or ``pathRegex`` is not a valid regular expression.
+        """
+        if not isinstance(include, bool):
+            raise TypeError('Argument "include" must be a boolean value')
+        for name, value in (('host', host), ('path', path), ('pathRegex', pathRegex), ('scheme', scheme)):
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f'Argument "{name}" must be a string')
+        if not isinstance(priority, int):
+            raise TypeError('Argument "priority" must be an integer')
+        if path is not None and pathRegex is not None:
+            raise ValueError('Only one of "path" and "pathRegex" could be set')
+        if pathRegex is not None:
+            try:
+                re.compile(pathRegex)
+            except re.error as e:
+                raise ValueError(f'Argument "pathRegex" is not a valid regular expression: {e}')
+
+        self.rules.append({
+            'include': include,
+            'scheme': scheme.lower() if scheme else None,
+            'host': host.lower() if host else None,
+            'path': path,
+            'pathRegex': pathRegex,
+            'priority': priority,
+        })
+        self.compiled = False
+        self.verdicts.cache_clear()
+
+    def compile(self):
+        """The method of indexing the rules by host and merging the rules of each host into one regular expression.
+        """
+        groups = {}
+        for i, rule in enumerate(self.rules):
+            groups.setdefault(rule['host'], []).append(i)
+
+        self.regexes = {host: self.mergeRules(ids) for host, ids in groups.items()}
+        self.anyHost = self.regexes.pop(None, None)
+        self.exactHosts = {host: regex for host, regex in self.regexes.items() if not host.startswith('.')}
+        self.suffixTrie = {}
+
+        for host, regex in self.regexes.items():
+            if not host.startswith('.'):
+                continue
+            node = self.suffixTrie
+            for label in reversed(host[1:].split('.')):
+                node = node.setdefault(label, {})
+            node[None] = regex
+
+        self.compiled = True
+
+    def mergeRules(self, ids):
+        """The method of merging rules into one regular expression matching ``{scheme}:{path}``. The alternatives are ordered by priority, so the first matched alternative is the winning rule. The rules whose ``pathRegex`` has groups are compiled on their own, since their group names could collide and their numbered backreferences would be shifted in the merged one.
+
+        Args:
+
+        * ids (:obj:`list`): The indices of the rules.
+
+        Return:
+
+        * :obj:`list`: The pairs of a regular expression and the index of its rule. The index is None for the merged regular expression, whose matched group is named ``r{index}``.
+        """
+        ids = sorted(ids, key=lambda i: (-self.rules[i]['priority'], self.rules[i]['include'], i))
+        alternatives, regexes = [], []
+
+        for i in ids:
+            rule = self.rules[i]
+            scheme = re.escape(rule['scheme']) if rule['scheme'] else '[^:]*'
+            if rule['path'] is not None:
+                path = re.escape(rule['path'])
+            elif rule['pathRegex'] is not None:
+                path = f'(?:{rule["pathRegex"]})'
+                if re.compile(rule['pathRegex']).groups:
+                    regexes.append((re.compile(f'{scheme}:{path}'), i))
+                    continue
+            else:
+                path = ''
+            alternatives.append(f'(?P<r{i}>{scheme}:{path})')
+
+        if alternatives:
+            regexes.append((re.compile('|'.join(alternatives)), None))
+
+        return regexes
+
+    def hostRegexes(self, host):
+        """The method of finding the merged regular expressions of the rules matching a host.
+
+        Args:
+
+        * host (:obj:`str`): The host of a url.
+
+        Return:
+
+        * :obj:`list`: The pairs of a regular expression and the index of its rule, as returned from :obj:`mergeRules`.
+        """
+        regexes = []
+        if self.anyHost is not None:
+            regexes.extend(self.anyHost)
+
+        if host in self.exactHosts:
+            regexes.extend(self.exactHosts[host])
+
+        node = self.suffixTrie
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            if None in node:
+                regexes.extend(node[None])
+
+        return regexes
+
+    def ruleVerdict(self, url):
+        """The method of finding the verdict of the rules for a url.
+
+        Args:
+
+        * url (:obj:`str`): The url attempted to check.
+
+        Returns:
+
+        :obj:`bool`: True if the winning rule is an include rule or the default verdict is True, False otherwise.
+        """
+        if not self.compiled:
+            self.compile()
+
+        parseResult = urlparse(url)
+        target = f'{parseResult.scheme.lower()}:{parseResult.path}'
+        winner = None
+
+        for regex, index in self.hostRegexes((parseResult.hostname or '').lower()):
+            m = regex.match(target)
+            if m is None:
+                continue
+            i = int(m.lastgroup[1:]) if index is None else index
+            if winner is None or self.outranks(i, winner):
+                winner = i
+
+        if winner is None:
+            if self.default is None:
+                return not any(rule['include'] for rule in self.rules)
+            return self.default
+
+        return self.rules[winner]['include']
+
+    def outranks(self, i, j):
+        """The method of comparing two rules.
+
+        Args:
+
+        * i (:obj:`int`): The index of a rule.
+        * j (:obj:`int`): The index of another rule.
+
+        Return:
+
+        * :obj:`bool`: True if the rule ``i`` wins the rule ``j``.
+        """
+        a, b = self.rules[i], self.rules[j]
+        return (-a['priority'], a['include'], i) < (-b['priority'], b['include'], j)
+
+    def match(self, url):
+        """The method of matching a given url with the patterns and the rules without memorizing.
+
+        Args:
+
+        * url (:obj:`str`): The url attempted to check.
+
+        Returns:
+
+        :obj:`bool`: True if the url is matched the patterns and included by the rules, False otherwise.
+        """
+        return super().match(url) and self.ruleVerdict(url)
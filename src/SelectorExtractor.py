@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: SelectorExtractor
+   :synopsis: This module contains the SelectorExtractor extracting data with declared css selectors.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from bs4.element import Tag
+import soupsieve
+import time
+
+from Extractor import Extractor
+
+class SelectorExtractor(Extractor):
+    """The extractor extracting data with css selectors declared in the class attribute ``fields``, instead of writing an extracting method for each attribute.
+
+    The selectors are compiled once when the subclass is created. When extracting, the tree of the web page is walked once, and each tag is matched with all the selectors not yet satisfied, so adding fields does not add more walks over the tree. The walk stops early once every field is satisfied.
+
+    A field is declared as a css selector string, or a :obj:`dict` with the keys:
+
+    * ``selector`` (:obj:`str`): The css selector.
+    * ``many`` (:obj:`bool`): Whether to collect all matched tags as a list, or only the first one. Default is False.
+    * ``attr`` (:obj:`str`): The attribute of the tag as the data. Default is None, which takes the stripped text of the tag.
+    * ``process`` (:obj:`callable`): The post-processor called with each matched tag, returning the data. It overrides ``attr``. Default is None.
+
+    The extracted fields are recorded together with the data of the extracting methods, if any, into the same record through the json recorder.
+
+    Attributes:
+
+    * fields (:obj:`dict`): The declared fields, keyed by attribute name.
+    * compiledFields (:obj:`list`): The fields with compiled selectors. It is built once when the subclass is created.
+
+    Example::
+
+        class myExtractor(SelectorExtractor):
+            fields = {
+                'title': 'head > title',
+                'links': {'selector': 'a[href]', 'many': True, 'attr': 'href'},
+                'price': {'selector': '#price', 'process': lambda tag: float(tag.get_text().strip('$'))},
+            }
+
+            def get_url(self, url, bs):     # Extracting methods could be used together
+                return url, ''
+    """
+    fields = {}
+    compiledFields = []
+
+    def __init_subclass__(cls, **kwargs):
+        """The hook compiling the declared fields once for each subclass.
+
+        Raise:
+
+        * TypeError: Some fields are neither a string nor a dict.
+        * soupsieve.SelectorSyntaxError: Some selectors are invalid.
+        """
+        super().__init_subclass__(**kwargs)
+        compiledFields = []
+
+        for attr, field in cls.fields.items():
+            if isinstance(field, str):
+                field = {'selector': field}
+            elif not isinstance(field, dict):
+                raise TypeError(f'Field {attr} must be a css selector string or a dict')
+
+            compiledFields.append({
+                'attr': attr,
+                'selector': soupsieve.compile(field['selector']),
+                'many': field.get('many', False),
+                'tagAttr': field.get('attr'),
+                'process': field.get('process'),
+            })
+
+        cls.compiledFields = compiledFields
+
+    def matchFields(self, bs):
+        """The method of walking the tree once and matching each tag with the selectors not yet satisfied.
+
+        Args:
+
+        * bs (:obj:`BeautifulSoup`): The :obj:`BeautifulSoup` object of the web page.
+
+        Return:
+
+        * :obj:`dict`: The lists of matched tags in document order, keyed by attribute name.
+        """
+        matches = {field['attr']: [] for field in self.compiledFields}
+        active = list(self.compiledFields)
+
+        for tag in bs.descendants:
+            if not active:
+                break
+            if not isinstance(tag, Tag):
+                continue
+
+            satisfied = False
+            for field in active:
+                if field['selector'].match(tag):
+                    matches[field['attr']].append(tag)
+                    satisfied = satisfied or not field['many']
+
+            if satisfied:
+                active = [field for field in active if field['many'] or not matches[field['attr']]]
+
+        return matches
+
+    def processTag(self, field, tag):
+        """The method of converting a matched tag into data.
+
+        Args:
+
+        * field (:obj:`dict`): The compiled field.
+        * tag (:obj:`bs4.element.Tag`): The matched tag.
+
+        Return:
+
+        * :obj:`object`: The data of the tag.
+        """
+        if field['process'] is not None:
+            return field['process'](tag)
+
+        if field['tagAttr'] is not None:
+            return tag.get(field['tagAttr'])
+
+        return tag.get_text(strip=True)
+
+    def extractData(self, url, bs):
+        """The method of extracting the declared fields and running the extracting methods without recording.
+
+        Args:
+
+        * url (:obj:`str`): The url string of the web page.
+        * bs (:obj:`BeautifulSoup`): The :obj:`BeautifulSoup` object of the web page.
+
+        Return:
+
+        * :obj:`dict`: The extracted data keyed by attribute name.
+        * :obj:`list`: The messages of each field and each data extracting method.
+        """
+        dataset, msgs = {}, []
+
+        start = time.perf_counter()
+        try:
+            matches = self.matchFields(bs)
+        except Exception as e:
+            matches = None
+            error = e
+        if self.timer is not None:
+            self.timer.add(f'extract.{self.name}.selectors', time.perf_counter() - start)
+
+        for field in self.compiledFields:
+            attr = field['attr']
+            data = ''
+
+            try:
+                if matches is None:
+                    raise error
+
+                tags = matches[attr]
+                if field['many']:
+                    data = [self.processTag(field, tag) for tag in tags]
+                elif tags:
+                    data = self.processTag(field, tags[0])
+                else:
+                    raise LookupError(f'no tag matches {field["selector"].pattern}')
+
+                if type(data) not in self.jsonSerializableTypes:
+                    data = str(data)        # If the returned data is not json serializable, convert it into a string.
+                msgs.append(f'Get {attr}: {data}')
+
+            except Exception as e:
+                data = ''
+                msgs.append(f'Failed to get {attr}: {e}')
+
+            dataset[attr] = data
+
+        methodData, methodMsgs = super().extractData(url, bs)
+        dataset.update(methodData)
+        msgs.extend(methodMsgs)
+
+        return dataset, msgs
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: StageTimer
+   :synopsis: This module contains the stage timer aggregating the time cost of each stage of crawling into histograms.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from contextlib import contextmanager
+import threading
+import json
+import math
+import time
+
+class Histogram:
+    """The histogram of the time costs of a stage. The time costs are counted in logarithmic buckets, so the memory does not grow with the amount of pages, and a percentile is accurate within about 6%.
+
+    Attributes:
+
+    * buckets (:obj:`dict`): The amount of time costs in each bucket, keyed by the index of the bucket.
+    * count (:obj:`int`): The amount of time costs.
+    * total (:obj:`float`): The sum of time costs in seconds.
+    * min (:obj:`float`): The smallest time cost.
+    * max (:obj:`float`): The largest time cost.
+    """
+    minValue = 1e-6
+    bucketsPerDecade = 20
+
+    def __init__(self):
+        """The initial method of a histogram.
+        """
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds):
+        """The method of counting a time cost.
+
+        Args:
+
+        * seconds (:obj:`float`): The time cost in seconds.
+        """
+        index = max(0, math.floor(math.log10(max(seconds, self.minValue) / self.minValue) * self.bucketsPerDecade))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        """The method of estimating a percentile of the time costs. It is the geometric middle of the bucket holding the percentile, bounded by the smallest and the largest time costs.
+
+        Args:
+
+        * p (:obj:`float`): The percentile between 0 and 100.
+
+        Return:
+
+        * :obj:`float`: The estimated time cost in seconds. 0 if nothing is counted.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                break
+
+        value = self.minValue * 10 ** ((index + 0.5) / self.bucketsPerDecade)
+        return min(max(value, self.min), self.max)
+
+    def summary(self):
+        """The method of summarizing the histogram.
+
+        Return:
+
+        * :obj:`dict`: The ``count``, ``total``, ``mean``, ``min``, ``max``, ``p50``, ``p95`` and ``p99`` of the time costs in seconds.
+        """
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+class StageTimer:
+    """The device to measure the time cost of each stage of crawling each page, and to aggregate them into a :obj:`Histogram` for each stage, so it can be told whether a crawl is bound by the network, the parsing or the disk.
+
+    The stages measured by the crawler are:
+
+    * ``queue``: Getting a work from the working list manager.
+    * ``fetch``: Sending the web request and downloading the page. It is split into ``fetch.ttfb``, the time until the headers are received, including resolving and connecting on a new connection, and ``fetch.download``, the rest.
+    * ``parse``: Parsing the page, or decoding it if the tree is not needed.
+    * ``extract.{name}``: Running the extractor ``name``, and ``extract.{name}.{attr}`` for each of its fields.
+    * ``record``: Adding the extracted data to the record files.
+    * ``links``: Finding and adding the links of the page, including ``frontier``.
+    * ``frontier``: Adding new works to the working list manager and marking the finished works.
+    * ``log``: Printing and recording the information of the page.
+    * ``stage``: Parsing, extracting and finding the links in a worker process, if the :obj:`AsyncCrawler` has worker processes.
+
+    The summary is written into ``dumpPath`` as json every ``dumpInterval`` seconds during crawling, and once more when the crawl finishes.
+
+    Attributes:
+
+    * histograms (:obj:`dict`): The histogram of each stage, keyed by the name of the stage.
+    * dumpPath (:obj:`str`): The path of the json file of the summary. None if the summary is not written.
+    * dumpInterval (:obj:`float`): The seconds between two writings of the summary.
+    * lastDump (:obj:`float`): The time the summary was last written.
+
+    Args:
+
+    * dumpPath (:obj:`str`): The path of the json file of the summary. Default is ``tmp/timing.json``.
+    * dumpInterval (:obj:`float`): The seconds between two writings of the summary. Default is 60.
+
+    Raise:
+
+    * TypeError: ``dumpPath`` is neither a string nor None, or ``dumpInterval`` is not a number.
+    """
+    def __init__(self, dumpPath='tmp/timing.json', dumpInterval=60):
+        """The initial method of a stage timer.
+        """
+        if dumpPath is not None and not isinstance(dumpPath, str):
+            raise TypeError('Argument "dumpPath" must be a string')
+        if not isinstance(dumpInterval, (int, float)) or isinstance(dumpInterval, bool):
+            raise TypeError('Argument "dumpInterval" must be a number')
+
+        self.histograms = {}
+        self.dumpPath = dumpPath
+        self.dumpInterval = dumpInterval
+        self.lastDump = time.time()
+        self.lock = threading.Lock()        # Web requests are timed on worker threads.
+
+    def add(self, stage, seconds):
+        """The method of counting a time cost of a stage.
+
+        Args:
+
+        * stage (:obj:`str`): The name of the stage.
+        * seconds (:obj:`float`): The time cost in seconds.
+        """
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.add(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        """The context manager measuring the time cost of the code in it as a stage.
+
+        Args:
+
+        * stage (:obj:`str`): The name of the stage.
+
+        Example::
+
+            with timer.measure('parse'):
+                bs = BeautifulSoup(html, 'html.parser')
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def summary(self):
+        """The method of summarizing the histograms.
+
+        Return:
+
+        * :obj:`dict`: The summary of each stage returned from :obj:`Histogram.summary`, keyed by the name of the stage.
+        """
+        with self.lock:
+            return {stage: histogram.summary() for stage, histogram in sorted(self.histograms.items())}
+
+    def dump(self):
+        """The method of writing the summary into ``dumpPath``.
+        """
+        self.lastDump = time.time()
+        if self.dumpPath is None:
+            return
+
+        try:
+            with open(self.dumpPath, 'wt') as fout:
+                fout.write(json.dumps(self.summary(), indent=2))
+
+        except Exception as e:
+            print(f'Failed to record on {self.dumpPath}: {e}')
+
+    def dumpIfDue(self):
+        """The method of writing the summary if ``dumpInterval`` seconds have passed since it was last written.
+        """
+        if time.time() - self.lastDump >= self.dumpInterval:
+            self.dump()
+
+    def reset(self):
+        """The method of removing all the histograms.
+        """
+        with self.lock:
+            self.histograms.clear()
@@ -0,0 +1,65 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import threading
+import hashlib
+
+class LocalServer:
+    """The local http server serving fixed html documents for testing, so that the test cases do not depend on the internet.
+
+    Attributes:
+
+    * pages (:obj:`dict`): The html documents served, keyed by path.
+    * server (:obj:`ThreadingHTTPServer`): The http server.
+    * root (:obj:`str`): The root url of the server, for example ``http://127.0.0.1:8000``.
+    * requestPaths (:obj:`list`): The paths requested, in order.
+    * requestHeaders (:obj:`list`): The headers of the requests, in order.
+
+    Each page is served with an ``ETag`` of its content, and ``304 Not Modified`` is answered if ``If-None-Match`` is the same ``ETag``.
+
+    Args:
+
+    * pages (:obj:`dict`): The html documents served, keyed by path.
+    """
+    def __init__(self, pages):
+        self.pages = pages
+        self.requestPaths = []
+        self.requestHeaders = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server.requestPaths.append(self.path)
+                server.requestHeaders.append(dict(self.headers))
+                body = server.pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                body = body.encode('utf-8')
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.root = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """The method of shutting down the server.
+        """
+        self.server.shutdown()
+        self.server.server_close()
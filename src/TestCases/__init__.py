@@ -8,15 +8,46 @@
 """
 
 from .test_Crawler import TestCrawler
+from .test_AsyncCrawler import TestAsyncCrawler
 from .test_Extractor import TestExtractor
-from .test_Recorder import TestRecorder, TestWorkingListManager, TestJsonRecorder
+from .test_SelectorExtractor import TestSelectorExtractor
+from .test_Recorder import TestRecorder, TestWorkingListManager, TestHostWorkingListManager, TestPriorityWorkingListManager, TestSpillingWorkingListManager, TestSeenSet, TestJsonRecorder, TestJsonLinesRecorder, TestLogRecorder, TestWriteBehind
 from .test_UrlMatcher import TestUrlMatcher
+from .test_RuleUrlMatcher import TestRuleUrlMatcher
+from .test_HttpPool import TestHttpPool
+from .test_HttpCache import TestHttpCache
+from .test_LinkParser import TestLinkParser
+from .test_ParseStage import TestParseStage
+from .test_UrlCanonicalizer import TestUrlCanonicalizer
+from .test_StageTimer import TestStageTimer
+from .test_MetricsServer import TestMetricsServer
+from .test_Benchmark import TestBenchmark
+from .test_Profiler import TestCrawlProfiler
 
 __all__ = [
     'TestCrawler',
+    'TestAsyncCrawler',
     'TestExtractor',
+    'TestSelectorExtractor',
     'TestRecorder',
     'TestWorkingListManager',
+    'TestHostWorkingListManager',
+    'TestPriorityWorkingListManager',
+    'TestSpillingWorkingListManager',
+    'TestSeenSet',
     'TestJsonRecorder',
-    'TestUrlMatcher'
+    'TestJsonLinesRecorder',
+    'TestLogRecorder',
+    'TestWriteBehind',
+    'TestUrlMatcher',
+    'TestRuleUrlMatcher',
+    'TestHttpPool',
+    'TestHttpCache',
+    'TestLinkParser',
+    'TestParseStage',
+    'TestUrlCanonicalizer',
+    'TestStageTimer',
+    'TestMetricsServer',
+    'TestBenchmark',
+    'TestCrawlProfiler'
 ]
\ No newline at end of file
@@ -0,0 +1,417 @@
+import unittest
+import shutil
+import json
+import sys
+import io
+import os
+
+from AsyncCrawler import AsyncCrawler
+from Crawler import Crawler
+from Extractor import Extractor
+from HttpPool import HttpPool
+from HttpCache import HttpCache
+from Profiler import CrawlProfiler
+from Recorder import HostWorkingListManager, SpillingWorkingListManager, WriteBehind
+from .LocalServer import LocalServer
+
+class TestAsyncCrawler(unittest.TestCase):
+    """The test case of the module `AsyncCrawler`. The web pages are served by a local http server.
+
+    Attributes:
+
+    * pages (:obj:`dict`): The html documents served by the local http server, keyed by path.
+    * paths (:obj:`list`): The list of paths of files created during the test.
+    """
+    class TitleExtractor(Extractor):
+        """The testing extractor.
+        """
+        def get_title(self, url, bs):
+            data = bs.head.title.get_text()
+            msg  = ''
+            return data, msg
+
+    pages = {
+        '/index.html': '<html><head><title>index</title></head><body><a href="/a.html"></a><a href="/b.html"></a><a href="/c.html"></a></body></html>',
+        '/a.html': '<html><head><title>a</title></head><body><a href="/index.html"></a><a href="/d.html"></a></body></html>',
+        '/b.html': '<html><head><title>b</title></head><body><a href="/d.html"></a></body></html>',
+        '/c.html': '<html><head><title>c</title></head><body></body></html>',
+        '/d.html': '<html><head><title>d</title></head><body></body></html>',
+    }
+
+    paths = [
+        'tmp/asyncTitle.json',
+        'tmp/workingList.txt',
+        'tmp/done.txt',
+        'tmp/inFlight.txt',
+        'tmp/log.txt',
+        'tmp/timing.json',
+        'tmp/httpCache.sqlite',
+        'tmp/httpCache.sqlite-wal',
+        'tmp/httpCache.sqlite-shm',
+        'tmp/profile.pstats',
+        'tmp/profile.collapsed',
+        'tmp/seen.sqlite',
+        'tmp/seen.sqlite-wal',
+        'tmp/seen.sqlite-shm'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        """Hook method for starting the local http server.
+        """
+        cls.server = LocalServer(cls.pages)
+        cls.root = cls.server.root
+
+    @classmethod
+    def tearDownClass(cls):
+        """Hook method for shutting down the local http server.
+        """
+        cls.server.close()
+
+    def setUp(self):
+        """Hook method for setting up the test fixture before exercising it.
+
+        * Directing the standard output to a :obj:`io.StringIO` object.
+        * Checking the files assumed be created during test not exist before each test.
+        """
+        sys.stdout = self.strIO = io.StringIO()
+        for path in self.paths:
+            self.assertFalse(os.path.exists(path))
+
+    def tearDown(self):
+        """Hook method for deconstructing the test fixture after testing it.
+
+        * Redirecting the standard output.
+        * Removing the files created during esch test.
+        """
+        sys.stdout = sys.__stdout__
+        for path in self.paths:
+            if os.path.exists(path) and os.path.isfile(path):
+                os.remove(path)
+
+    def test_attributes(self):
+        """Test the setting of attributes.
+        """
+        c = AsyncCrawler()
+        self.assertEqual(c.concurrency, 8)      # Default concurrency
+        self.assertEqual(c.httpPool.poolMaxsize, 8)     # Default http pool keeps a connection for each request in flight
+
+        c = AsyncCrawler(concurrency=3, workingList=['http://www.test.com'], autoAddInternalLinks=False)
+        self.assertEqual(c.concurrency, 3)
+        self.assertTrue(c.WLM.workExists())
+        self.assertFalse(c.autoAddInternalLinks)
+
+        with self.assertRaises(TypeError):
+            AsyncCrawler(concurrency='3')
+        with self.assertRaises(ValueError):
+            AsyncCrawler(concurrency=0)
+
+        self.assertIsNone(AsyncCrawler().processes)      # Default parsing on the event loop thread
+        self.assertEqual(AsyncCrawler(processes=2).processes, 2)
+        with self.assertRaises(TypeError):
+            AsyncCrawler(processes='2')
+        with self.assertRaises(ValueError):
+            AsyncCrawler(processes=0)
+
+    def test_crawl(self):
+        """Test the ``crawl`` method. Every page of the local site is crawled exactly once.
+        """
+        c = AsyncCrawler(
+            concurrency=3,
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('asyncTitle')]
+        )
+        c.crawl()
+
+        self.assertFalse(c.WLM.workExists())
+        expectedDone = sorted(f'{self.root}{path}' for path in self.pages)
+        self.assertEqual(sorted(c.WLM.done), expectedDone)      # Every page is crawled once
+        with open(c.WLM.donePath, 'r') as fin:
+            self.assertEqual(sorted(fin.read().split('\n')), expectedDone)      # Done list file correctness
+
+        with open('tmp/asyncTitle.json', 'r') as fin:
+            records = json.loads(fin.read())
+        self.assertEqual(sorted(r['title'] for r in records.values()), ['a', 'b', 'c', 'd', 'index'])       # Record file correctness
+
+        info = self.strIO.getvalue()
+        self.assertTrue(info.strip('\n').split('\n')[-2] == 'Working List is clear. Done.')
+
+    def test_timer(self):
+        """Test the time cost of each stage of each page is measured, and the summary is written when the crawl finishes.
+        """
+        c = AsyncCrawler(
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('asyncTitle')]
+        )
+        self.assertIs(c.extractors[0].timer, c.timer)
+        c.crawl()
+
+        summary = c.timer.summary()
+        for stage in ('queue', 'fetch', 'fetch.ttfb', 'fetch.download', 'parse', 'extract.asyncTitle', 'extract.asyncTitle.title', 'record', 'links', 'log'):
+            self.assertEqual(summary[stage]['count'], 5)        # Once for each page
+        self.assertGreaterEqual(summary['frontier']['count'], 5)
+        self.assertGreater(summary['fetch']['p99'], 0)
+        self.assertLessEqual(summary['fetch']['p50'], summary['fetch']['p99'])
+
+        with open('tmp/timing.json', 'r') as fin:
+            self.assertEqual(json.loads(fin.read())['fetch']['count'], 5)
+
+        with self.assertRaises(TypeError):
+            AsyncCrawler(timer='timer')
+
+    def test_hooks(self):
+        """Test the callbacks added around the methods of the crawl loop, of both the crawler and the async crawler.
+        """
+        for crawlerClass in (Crawler, AsyncCrawler):
+            c = crawlerClass(
+                workingList=[f'{self.root}/index.html'],
+                domain_pattern=r'127\.0\.0\.1',
+                extractors=[self.TitleExtractor('asyncTitle')]
+            )
+            calls = []
+            for method in ('fetchPage', 'extract', 'addNewWorks', 'printInfo'):
+                c.addHook(method, before=lambda crawler, *args, method=method, **kwargs: calls.append(('before', method)), after=lambda crawler, result, *args, method=method, **kwargs: calls.append(('after', method)))
+            titles = []
+            c.addHook('extract', after=lambda crawler, result, url, bs: titles.append(bs.head.title.get_text()))
+            c.addHook('printInfo', before=lambda crawler, extractInfo: 1 / 0)       # Printed and not stopping the crawl
+            c.crawl()
+
+            self.assertEqual(sorted(titles), ['a', 'b', 'c', 'd', 'index'])
+            for method in ('fetchPage', 'extract', 'addNewWorks', 'printInfo'):
+                self.assertEqual(calls.count(('before', method)), 5)
+                self.assertEqual(calls.count(('after', method)), 5)
+            mainCalls = [call for call in calls if call[1] != 'fetchPage']      # Fetched by the worker threads of the async crawler
+            self.assertEqual(mainCalls[:6], [('before', 'extract'), ('after', 'extract'), ('before', 'addNewWorks'), ('after', 'addNewWorks'), ('before', 'printInfo'), ('after', 'printInfo')])
+            self.assertIn('Failed to run the hook of printInfo: division by zero', self.strIO.getvalue())
+            for path in self.paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        c = Crawler(workingList=[f'{self.root}/index.html'], domain_pattern=r'127\.0\.0\.1')
+        c.addHook('getPageHtml', after=print)
+        c.addHook('fetchPage', before=print)
+        c.clearHooks('fetchPage')
+        self.assertEqual(list(c.hooks), ['getPageHtml'])
+        c.clearHooks()
+        self.assertEqual(c.hooks, {})
+        with self.assertRaises(ValueError):
+            c.addHook('crawl', before=print)
+        with self.assertRaises(TypeError):
+            c.addHook('extract', before='print')
+
+        c = AsyncCrawler(workingList=[f'{self.root}/index.html'], domain_pattern=r'127\.0\.0\.1')
+        for method in ('getPageBs', 'getPageHtml'):     # Never called by the async crawler
+            with self.assertRaises(ValueError):
+                c.addHook(method, before=print)
+        self.assertEqual(c.hooks, {})
+
+    def test_stopped(self):
+        """Test a crawl stopped by an exception is still finished: the profiling stops, the records and the deferred savings are written, and the metrics server is closed.
+        """
+        def interrupt(crawler, result, extractInfo):
+            if len(crawler.WLM.done) >= 2:
+                raise KeyboardInterrupt()       # Not caught as a failed hook
+
+        for crawlerClass in (Crawler, AsyncCrawler):
+            extractor = self.TitleExtractor('asyncTitle')
+            c = crawlerClass(
+                workingList=[f'{self.root}/index.html'],
+                domain_pattern=r'127\.0\.0\.1',
+                extractors=[extractor],
+                metricsPort=0,
+                profiler=CrawlProfiler(mode='sampling'),
+                writeBehind=WriteBehind(flushSize=1000, background=True)
+            )
+            c.addHook('printInfo', after=interrupt)
+            with self.assertRaises(KeyboardInterrupt):
+                c.crawl()
+
+            self.assertFalse(c.profiler.running)
+            self.assertFalse(c.metricsServer.thread.is_alive())
+            self.assertIsNone(c.writeBehind.writer)
+            with open('tmp/asyncTitle.json', 'r') as fin:
+                self.assertGreaterEqual(len(json.loads(fin.read())), 1)
+            self.assertIn('works remained', self.strIO.getvalue())
+            for path in self.paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_profiler(self):
+        """Test profiling a window of the crawl.
+        """
+        profiler = CrawlProfiler(pages=2, interval=0.001)
+        c = AsyncCrawler(
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('asyncTitle')],
+            profiler=profiler
+        )
+        self.assertIs(c.profiler, profiler)
+        c.crawl()
+
+        self.assertEqual(len(c.WLM.done), 5)
+        self.assertEqual(profiler.pageCount, 2)
+        self.assertFalse(profiler.running)
+        self.assertTrue(os.path.exists('tmp/profile.pstats'))
+        self.assertTrue(os.path.exists('tmp/profile.collapsed'))
+
+        with self.assertRaises(TypeError):
+            AsyncCrawler(profiler='profiler')
+
+    def test_writeBehind(self):
+        """Test the record files are saved in batches by the writer thread, and complete when the crawl finishes.
+        """
+        writeBehind = WriteBehind(background=True)
+        c = AsyncCrawler(
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('asyncTitle')],
+            writeBehind=writeBehind
+        )
+        for recorder in (c.WLM, c.logRecorder, c.extractors[0].JsonRecorder):
+            self.assertIs(recorder.writeBehind, writeBehind)
+        c.crawl()
+
+        self.assertIsNone(writeBehind.writer)       # Stopped when the crawl finishes
+        with open(c.WLM.donePath, 'r') as fin:
+            self.assertEqual(sorted(fin.read().split('\n')), sorted(f'{self.root}{path}' for path in self.pages))
+        with open(c.WLM.inFlightPath, 'r') as fin:
+            self.assertEqual(fin.read(), '')
+        with open('tmp/asyncTitle.json', 'r') as fin:
+            self.assertEqual(len(json.loads(fin.read())), 5)
+        with open(c.logPath, 'r') as fin:
+            self.assertEqual(fin.read().count('Remained Work Amount'), 5)
+
+        with self.assertRaises(TypeError):
+            AsyncCrawler(writeBehind='writeBehind')
+
+    def test_crawlWithoutTree(self):
+        """Test the ``crawl`` method without any extractor. The links are found from the html text without building the trees.
+        """
+        c = AsyncCrawler(workingList=[f'{self.root}/index.html'], domain_pattern=r'127\.0\.0\.1')
+        self.assertFalse(c.treeNeeded())
+        c.crawl()
+
+        expectedDone = sorted(f'{self.root}{path}' for path in self.pages)
+        self.assertEqual(sorted(c.WLM.done), expectedDone)      # Every page is crawled once
+
+    def test_crawlWithProcesses(self):
+        """Test the ``crawl`` method parsing and extracting the pages in worker processes. The records are still written by the crawler.
+        """
+        c = AsyncCrawler(
+            concurrency=3,
+            processes=2,
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('asyncTitle')]
+        )
+        self.assertIsNotNone(c.parseStage())
+        c.crawl()
+
+        expectedDone = sorted(f'{self.root}{path}' for path in self.pages)
+        self.assertEqual(sorted(c.WLM.done), expectedDone)      # Every page is crawled once
+
+        with open('tmp/asyncTitle.json', 'r') as fin:
+            records = json.loads(fin.read())
+        self.assertEqual(sorted(r['title'] for r in records.values()), ['a', 'b', 'c', 'd', 'index'])       # Record file correctness
+
+        info = self.strIO.getvalue()
+        self.assertIn('Get title: index', info)        # The messages of the workers are printed by the crawler
+
+        summary = c.timer.summary()
+        self.assertEqual(summary['stage']['count'], 5)       # Parsed and extracted in the workers
+        self.assertNotIn('parse', summary)
+
+    def test_recrawlWithCache(self):
+        """Test recrawling with a http cache. The pages not modified are reused from the cache and not extracted again, while their links are still followed.
+        """
+        for processes in (None, 2):
+            cache = HttpCache(skipUnchanged=True)
+            c = AsyncCrawler(
+                processes=processes,
+                workingList=[f'{self.root}/index.html'],
+                domain_pattern=r'127\.0\.0\.1',
+                extractors=[self.TitleExtractor('asyncTitle')],
+                httpCache=cache
+            )
+            c.crawl()
+            self.assertEqual(cache.stats(), {'hits': 0, 'misses': 5, 'unchanged': 0})
+
+            c = AsyncCrawler(
+                processes=processes,
+                workingList=[f'{self.root}/index.html'],
+                domain_pattern=r'127\.0\.0\.1',
+                extractors=[self.TitleExtractor('asyncTitle', resume=True)],
+                httpCache=cache
+            )
+            c.crawl()
+            self.assertEqual(sorted(c.WLM.done), sorted(f'{self.root}{path}' for path in self.pages))       # Links of unchanged pages are followed
+            self.assertEqual(cache.stats(), {'hits': 5, 'misses': 5, 'unchanged': 5})
+            self.assertIn(c.unchangedInfo, self.strIO.getvalue())
+
+            with open('tmp/asyncTitle.json', 'r') as fin:
+                self.assertEqual(len(json.loads(fin.read())), 5)        # Not extracted again
+
+            cache.close()
+            self.tearDown()
+            sys.stdout = self.strIO = io.StringIO()
+
+        with self.assertRaises(TypeError):
+            AsyncCrawler(httpCache='cache')
+
+    def test_crawlByHost(self):
+        """Test the ``crawl`` method with a working list manager keeping a queue for each host. At most ``maxPerHost`` pages of the host are in flight.
+        """
+        c = AsyncCrawler(
+            concurrency=4,
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            workingListManager=HostWorkingListManager(minDelay=0, maxPerHost=2)
+        )
+        c.crawl()
+
+        expectedDone = sorted(f'{self.root}{path}' for path in self.pages)
+        self.assertEqual(sorted(c.WLM.done), expectedDone)      # Every page is crawled once
+        self.assertEqual(c.WLM.active, {})
+
+    def test_crawlSpilling(self):
+        """Test the ``crawl`` method with a working list manager keeping the works on disk. The seen set is closed when the crawl is finished, without write-behind.
+        """
+        for crawlerClass in (Crawler, AsyncCrawler):
+            c = crawlerClass(
+                workingList=[f'{self.root}/index.html'],
+                domain_pattern=r'127\.0\.0\.1',
+                workingListManager=SpillingWorkingListManager(segmentSize=2)
+            )
+            c.crawl()
+
+            self.assertFalse(c.WLM.workExists())
+            self.assertTrue(c.WLM.seen.closed)
+            with open('tmp/done.txt', 'r') as fin:
+                self.assertEqual(sorted(fin.read().split()), sorted(f'{self.root}{path}' for path in self.pages))
+        shutil.rmtree('tmp/frontier', ignore_errors=True)
+
+    def test_resume(self):
+        """Test resuming a stopped crawl. The finished pages are not requested again, the page in flight is, and the records continue.
+        """
+        c = AsyncCrawler(workingList=[f'{self.root}/index.html'], domain_pattern=r'127\.0\.0\.1', extractors=[self.TitleExtractor('asyncTitle')])
+        url = c.WLM.getWork()
+        c.processPage(url, c.fetchPage(url))
+        c.WLM.finishWork(url)
+        c.WLM.getWork()     # The crawl stops while a page is in flight
+
+        del self.server.requestPaths[:]
+        c = AsyncCrawler(domain_pattern=r'127\.0\.0\.1', extractors=[self.TitleExtractor('asyncTitle', resume=True)], resume=True)
+        self.assertEqual(c.WLM.records[0], f'{self.root}/a.html')      # The page in flight is crawled first
+        c.crawl()
+
+        self.assertEqual(sorted(self.server.requestPaths), ['/a.html', '/b.html', '/c.html', '/d.html'])       # The finished page is not requested again
+        with open('tmp/asyncTitle.json', 'r') as fin:
+            records = json.loads(fin.read())
+        self.assertEqual(sorted(records), ['0', '1', '2', '3', '4'])     # Record keys continue
+        self.assertEqual(sorted(r['title'] for r in records.values()), ['a', 'b', 'c', 'd', 'index'])
+
+if __name__ == '__main__':
+    unittest.main()
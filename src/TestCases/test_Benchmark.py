@@ -0,0 +1,83 @@
+from unittest import mock
+import unittest
+import json
+import re
+import os
+
+from Benchmark import SyntheticSite, runBenchmarks, writeResults, benchmarkCrawl
+from Crawler import Crawler
+
+class TestBenchmark(unittest.TestCase):
+    """The test case of the module `Benchmark`, on a small synthetic site.
+    """
+    def test_syntheticSite(self):
+        """Test the generated pages, their links and the duplicate notations.
+        """
+        site = SyntheticSite(pages=20, fanOut=4, pageSize=2000, duplicateRatio=0.5)
+        try:
+            self.assertEqual(len(site.documents), 20)
+            page = site.documents['/page/3.html'].decode('utf-8')
+            links = re.findall(r'href="([^"]+)"', page)
+            self.assertEqual(len(links), 8)     # Half of the links are duplicates
+            self.assertIn('/page/4.html', links)        # The next page is always linked
+            self.assertTrue(all(re.fullmatch(r'/page/\d+\.html', link.split('#')[0].split('?')[0]) for link in links))
+            self.assertAlmostEqual(len(page), 2000, delta=200)
+        finally:
+            site.close()
+
+        sites = [SyntheticSite(pages=20, seed=0)]
+        try:
+            sites.append(SyntheticSite(pages=20, seed=0))
+            self.assertEqual(sites[0].documents, sites[1].documents)      # Reproducible
+        finally:
+            for site in sites:
+                site.close()
+
+        with self.assertRaises(ValueError):
+            SyntheticSite(pages=0)
+        with self.assertRaises(ValueError):
+            SyntheticSite(duplicateRatio=1)
+
+    def test_runBenchmarks(self):
+        """Test the results of the benchmarks. Every page is crawled once however many notations it has, and the results could be written as json.
+        """
+        cwd = os.getcwd()
+        results = runBenchmarks(pages=15, fanOut=3, pageSize=1000, duplicateRatio=0.3, crawler='AsyncCrawler', concurrency=4, microSize=20)
+        self.assertEqual(os.getcwd(), cwd)      # Run in a temporary directory
+
+        self.assertEqual(results['config']['pages'], 15)
+        self.assertEqual(results['crawl']['pages'], 15)
+        self.assertEqual(results['crawl']['requests'], 15)
+        self.assertGreater(results['crawl']['pagesPerSecond'], 0)
+        self.assertGreater(results['crawl']['peakMemoryBytes'], 0)
+        self.assertIn('parse', results['crawl']['stages'])
+        for name, methods in {'WorkingListManager': ['addWorks', 'getWork'], 'UrlMatcher': ['isIncluded', 'isIncludedAgain'], 'Extractor': ['extract'], 'JsonRecorder': ['addRecord']}.items():
+            for method in methods:
+                self.assertEqual(results['micro'][name][method]['operations'], 20)
+
+        os.makedirs('tmp', exist_ok=True)
+        writeResults(results, 'tmp/benchmark.json')
+        try:
+            with open('tmp/benchmark.json', 'r') as fin:
+                self.assertEqual(json.loads(fin.read())['crawl']['pages'], 15)
+        finally:
+            os.remove('tmp/benchmark.json')
+
+        with self.assertRaises(ValueError):
+            runBenchmarks(crawler='OtherCrawler')
+
+    def test_benchmarkCrawlNothing(self):
+        """Test the cpu time per page is None instead of raising if no page is crawled.
+        """
+        site = SyntheticSite(pages=5)
+        try:
+            with mock.patch.object(Crawler, 'crawl'):
+                result = benchmarkCrawl(site, trackMemory=False)
+        finally:
+            site.close()
+
+        self.assertEqual(result['pages'], 0)
+        self.assertIsNone(result['cpuSecondsPerPage'])
+
+if __name__ == '__main__':
+    unittest.main()
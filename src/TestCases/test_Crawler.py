@@ -1,5 +1,6 @@
 from collections import deque
 from bs4 import BeautifulSoup
+import requests
 import unittest
 import json
 import sys
@@ -10,6 +11,8 @@ import re
 from Crawler import Crawler
 from Extractor import Extractor
 from UrlMatcher import UrlMatcher
+from RuleUrlMatcher import RuleUrlMatcher
+from UrlCanonicalizer import UrlCanonicalizer
 from Recorder import WorkingListManager
 
 class TestCrawler(unittest.TestCase):
@@ -82,7 +85,9 @@ class TestCrawler(unittest.TestCase):
         'tmp/giftTitles.json',
         'tmp/workingList.txt',
         'tmp/done.txt',
-        'tmp/log.txt'
+        'tmp/inFlight.txt',
+        'tmp/log.txt',
+        'tmp/timing.json'
     ]
 
     def setUp(self):
@@ -235,6 +240,101 @@ class TestCrawler(unittest.TestCase):
         self.assertTrue(c.WLM.workExists())
         self.assertEqual(c.WLM.records, deque(expected))
 
+    def test_addNewWorksFromHtml(self):
+        """Test adding new works from the html text of a web page.
+        """
+        c = Crawler()
+        html = ('<html><body>'
+                '<a href="http://www.testurl.com/link1"></a>'
+                '<a href="/link2"></a>'
+                '<a href=""></a>'
+                '</body></html>')
+        c.addNewWorks('http://www.testurl.com', html)
+        self.assertEqual(c.WLM.records, deque(['http://www.testurl.com/link1', 'http://www.testurl.com/link2']))
+
+    def test_addLinks(self):
+        """Test the links are turned into canonical urls before matching and adding.
+        """
+        c = Crawler()
+        html = ('<html><head><base href="http://www.testurl.com/dir/"></head><body>'
+                '<a href="page.html#part"></a>'
+                '<a href="../top.html?b=2&amp;a=1&amp;utm_source=x"></a>'
+                '<a href="HTTP://WWW.TESTURL.COM:80/dir/page.html"></a>'
+                '<a href="mailto:a@testurl.com"></a>'
+                '</body></html>')
+        c.addNewWorks('http://www.testurl.com/other/index.html', html)
+        self.assertEqual(c.WLM.records, deque(['http://www.testurl.com/dir/page.html', 'http://www.testurl.com/top.html?a=1&b=2']))
+
+        c = Crawler()
+        c.addLinks('http://www.testurl.com/dir/index.html', ['sub/a.html', './b.html'])
+        self.assertEqual(c.WLM.records, deque(['http://www.testurl.com/dir/sub/a.html', 'http://www.testurl.com/dir/b.html']))
+
+        canonicalizer = UrlCanonicalizer(dropParams=[])
+        c = Crawler(canonicalizer=canonicalizer)
+        self.assertIs(c.canonicalizer, canonicalizer)
+        c.addLinks('http://www.testurl.com/', ['/a.html?utm_source=x'])
+        self.assertEqual(c.WLM.records, deque(['http://www.testurl.com/a.html?utm_source=x']))
+
+        with self.assertRaises(TypeError):
+            Crawler(canonicalizer='canonicalizer')
+
+    def test_canonicalSeeds(self):
+        """Test the seeds and the extended works are turned into canonical urls like the links found in the pages.
+        """
+        c = Crawler(workingList=['http://a.com', 'HTTP://A.COM:80/b?utm_source=x'])
+        self.assertEqual(c.WLM.records, deque(['http://a.com/', 'http://a.com/b']))
+        self.assertEqual(c.WLM.getWork(), 'http://a.com/')
+        c.addLinks('http://a.com', ['/', 'b'])
+        self.assertEqual(c.WLM.records, deque(['http://a.com/b']))
+
+        c.extendWorkingList(['http://a.com/c#part', 'http://a.com'])
+        self.assertEqual(c.WLM.records, deque(['http://a.com/b', 'http://a.com/c']))
+
+        c = Crawler(workingList=deque(['http://a.com']))
+        self.assertEqual(c.WLM.records, deque(['http://a.com/']))
+
+        with self.assertRaises(TypeError):
+            Crawler(workingList=['http://a.com', 1])
+
+    def test_treeNeeded(self):
+        """Test the checking of whether the pages have to be parsed.
+        """
+        class UrlExtractor(Extractor):
+            needsTree = False
+            def get_url(self, url, bs):
+                return url, ''
+
+        self.assertFalse(Crawler().treeNeeded())        # No extractor needs the tree
+        self.assertFalse(Crawler(extractors=[UrlExtractor('title')]).treeNeeded())
+        self.assertTrue(Crawler(extractors=[UrlExtractor('title'), self.Extractor_1('para')]).treeNeeded())       # Some extractor needs the tree
+
+        class LinkCrawler(Crawler):
+            def addNewWorks(self, url, bs):
+                pass
+        self.assertTrue(LinkCrawler().treeNeeded())     # The overwritten addNewWorks may need the tree
+
+    def test_urlMatcher(self):
+        """Test adding new works with a user defined url matcher.
+        """
+        UM = RuleUrlMatcher(rules=[
+            {'host': '.testurl.com'},
+            {'path': '/private', 'include': False, 'priority': 1},
+        ])
+        c = Crawler(urlMatcher=UM)
+        self.assertIs(c.UM, UM)
+
+        html = ('<html><body>'
+                '<a href="/link1"></a>'
+                '<a href="/private/link2"></a>'
+                '<a href="http://blog.testurl.com/link3"></a>'
+                '<a href="http://www.other.com/link4"></a>'
+                '</body></html>')
+        c.addNewWorks('http://www.testurl.com', BeautifulSoup(html, 'html.parser'))
+        self.assertEqual(c.WLM.records, deque(['http://www.testurl.com/link1', 'http://blog.testurl.com/link3']))
+
+        with self.assertRaises(TypeError):
+            Crawler(urlMatcher='')
+
     def test_setUrlPattern(self):
         """Test setting url patterns for a crawler already be initialized
         """
@@ -280,6 +380,54 @@ class TestCrawler(unittest.TestCase):
         self.assertFalse(bs or isinstance(bs, BeautifulSoup))
         self.assertTrue(re.match(f'Getting: \nFailed to get : ', self.strIO.getvalue()))
 
+    def test_parsePage(self):
+        """Test parsing the raw bytes of a response with the parser backend.
+
+        1. Test parsing with the declared encoding.
+        2. Test parsing without a declared encoding.
+        3. Test parsing with a callable parser.
+        """
+        html = '<html><head><title>標題</title></head><body><a href="/link">連結</a></body></html>'
+
+        # Test parsing with the declared encoding
+        req = requests.Response()
+        req._content = html.encode('big5')
+        req.headers['Content-Type'] = 'text/html; charset=big5'
+        req.encoding = 'big5'
+        c = Crawler()
+        self.assertEqual(c.parser, 'html.parser')       # Default parser
+        self.assertEqual(c.declaredEncoding(req), 'big5')
+        bs = c.parsePage(req)
+        self.assertTrue(isinstance(bs, BeautifulSoup))
+        self.assertEqual(bs.head.title.get_text(), '標題')      # Decoded with the declared encoding
+
+        # Test parsing without a declared encoding
+        req = requests.Response()
+        req._content = html.encode('utf-8')
+        req.headers['Content-Type'] = 'text/html'
+        req.encoding = 'ISO-8859-1'
+        self.assertIsNone(c.declaredEncoding(req))
+        self.assertEqual(c.parsePage(req).head.title.get_text(), '標題')       # Encoding detected by the parser
+
+        # Test decoding without parsing gives the same text as parsing
+        metaReq = requests.Response()
+        metaReq._content = '<html><head><meta charset="utf-8"><title>café</title></head></html>'.encode('utf-8')
+        metaReq.headers['Content-Type'] = 'text/html'
+        metaReq.encoding = 'ISO-8859-1'
+        self.assertEqual(c.decodePage(metaReq), '<html><head><meta charset="utf-8"><title>café</title></head></html>')      # Not the iso-8859-1 fallback of requests
+        self.assertEqual(c.parsePage(metaReq).head.title.get_text(), 'café')
+
+        # Test parsing with a callable parser
+        c = Crawler(parser=lambda content, encoding: (content, encoding))
+        self.assertEqual(c.parsePage(req), (html.encode('utf-8'), None))
+
+        with self.assertRaises(ValueError):
+            Crawler(parser='not.a.parser')
+        with self.assertRaises(TypeError):
+            Crawler(parser=1)
+        with self.assertRaises(TypeError):
+            Crawler(resume='True')
+
     def test_extract1(self):
         """The testing method of extracting a string from a web page. In this case, all the targets of the extractors exist.
         """
@@ -357,11 +505,14 @@ class TestCrawler(unittest.TestCase):
         """Test the method of saving logs.
         """
         c = Crawler()
-        c.log = ['first', 'second']
-        c.saveLog()
+        c.logRecorder.addRecord('first', False)
+        c.logRecorder.addRecord('second', False)
         self.assertTrue(os.path.exists(c.logPath) and os.path.isfile(c.logPath))        # Log file existence
         with open(c.logPath, 'r') as fin:
-            self.assertEqual(fin.read(), 'first\nsecond')       # Log file content correctness
+            self.assertEqual(fin.read(), '')        # Unsaved logs are not written
+        c.saveLog()
+        with open(c.logPath, 'r') as fin:
+            self.assertEqual(fin.read(), 'first\nsecond\n')       # Log file content correctness
 
     def test_printInfo(self):
         """Test the :obj:``printInfo`` method.
@@ -370,6 +521,17 @@ class TestCrawler(unittest.TestCase):
         c.printInfo('this is a message')
         expectedStr = f'Result:\nthis is a message\nRemained Work Amount: 3\n{"-"*20}\n'
         self.assertEqual(self.strIO.getvalue(), expectedStr)        # Standard output string correctness
+        self.assertEqual(list(c.log), [expectedStr[:-1]])       # Recent log correctness
+        with open(c.logPath, 'r') as fin:
+            self.assertEqual(fin.read(), expectedStr)       # Log file content correctness
+
+        # Test not printing if verbose is set False
+        sys.stdout = self.strIO = io.StringIO()
+        c = Crawler(workingList=self.testUrls, verbose=False)
+        c.printInfo('this is a message')
+        self.assertEqual(self.strIO.getvalue(), '')     # Nothing printed
+        with open(c.logPath, 'r') as fin:
+            self.assertEqual(fin.read(), expectedStr)       # Log file is still written
 
     def test_crawl(self):
         """Test the ``crawl`` method"""
@@ -6,7 +6,7 @@ import re
 import os
 import io
 
-from Recorder import JsonRecorder
+from Recorder import JsonRecorder, JsonLinesRecorder
 from Extractor import Extractor
 
 class TestExtractor(unittest.TestCase):
@@ -49,6 +49,8 @@ class TestExtractor(unittest.TestCase):
         sys.stdout = sys.__stdout__
         if os.path.exists('tmp/testing.json'):
             os.remove('tmp/testing.json')
+        if os.path.exists('tmp/testing.jsonl'):
+            os.remove('tmp/testing.jsonl')
 
     def test_attributes2(self):
         """Test the setting of attributes.
@@ -119,8 +121,46 @@ class TestExtractor(unittest.TestCase):
         with open(path, 'r') as fin:
             self.assertEqual(json.loads(fin.read()), expectedDict) # Correct file content
 
-    
+    def test_extractingMethods(self):
+        """Test the extracting methods are found once for each class and decorated once for each extractor.
+        """
+        class myExtractor(Extractor):
+            get_version = '1.0'     # Not callable, so not an extracting method
+
+            def get_url(self, url, bs):
+                return url, ''
+
+            def get_title(self, url, bs):
+                return bs.head.title.get_text(), ''
+
+        class subExtractor(myExtractor):
+            def get_body(self, url, bs):
+                return bs.body.get_text(), ''
+
+        self.assertEqual(Extractor.extractingMethodNames, ())
+        self.assertEqual(myExtractor.extractingMethodNames, ('get_title', 'get_url'))       # Sorted names of the extracting methods
+        self.assertEqual(subExtractor.extractingMethodNames, ('get_body', 'get_title', 'get_url'))      # Inherited extracting methods are found
+
+        e = myExtractor('testing')
+        self.assertEqual([attr for attr, func in e.extractingMethods], ['title', 'url'])
+        self.assertEqual(e.extractingMethods[0][1](self.url, self.bs), ('aaa', 'Get title: aaa'))      # Decorated extracting method
+
+    def test_recorderClass(self):
+        """Test extracting with a json lines recorder.
+        """
+        class myExtractor(Extractor):
+            recorderClass = JsonLinesRecorder
+
+            def get_title(self, url, bs):
+                data = bs.head.title.get_text()
+                msg  = ''
+                return data, msg
 
+        e = myExtractor('testing')
+        self.assertTrue(isinstance(e.JsonRecorder, JsonLinesRecorder)) # Recorder class correctness
+        e.extract(self.url, self.bs)
+        e.extract(self.url, self.bs)
+        self.assertEqual(list(e.JsonRecorder.readRecords()), [{'title': 'aaa'}, {'title': 'aaa'}]) # Record file content correctness
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+from unittest import mock
+import unittest
+import os
+
+from HttpCache import HttpCache
+from HttpPool import HttpPool
+from .LocalServer import LocalServer
+
+class TestHttpCache(unittest.TestCase):
+    """The test case of the module `HttpCache`. The web pages are served by a local http server.
+
+    Attributes:
+
+    * paths (:obj:`list`): The list of paths of files created during the test.
+    """
+    paths = ['tmp/httpCache.sqlite', 'tmp/httpCache.sqlite-wal', 'tmp/httpCache.sqlite-shm']
+
+    @classmethod
+    def setUpClass(cls):
+        """Hook method for starting the local http server.
+        """
+        cls.server = LocalServer({'/a.html': '<html><title>標題</title></html>'})
+        cls.root = cls.server.root
+
+    @classmethod
+    def tearDownClass(cls):
+        """Hook method for shutting down the local http server.
+        """
+        cls.server.close()
+
+    def setUp(self):
+        """Hook method for removing the cache of the last test.
+        """
+        os.makedirs('tmp', exist_ok=True)
+        self.tearDown()
+
+    def tearDown(self):
+        """Hook method for deconstructing the test fixture after testing it.
+        """
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_attributes(self):
+        """Test the setting of attributes.
+        """
+        cache = HttpCache()
+        self.assertEqual(cache.path, 'tmp/httpCache.sqlite')
+        self.assertFalse(cache.skipUnchanged)
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0, 'unchanged': 0})
+        self.assertIsNone(cache.lookup(f'{self.root}/a.html'))
+        cache.close()
+
+        with self.assertRaises(TypeError):
+            HttpCache(skipUnchanged=1)
+        with self.assertRaises(TypeError):
+            HttpCache(path=None)
+
+    def test_get(self):
+        """Test a page not modified is revalidated with its ``ETag`` and reused from the cache.
+        """
+        pool = HttpPool()
+        cache = HttpCache()
+        url = f'{self.root}/a.html'
+
+        req = cache.get(url, pool.get)
+        self.assertEqual(req.status_code, 200)
+        self.assertFalse(req.fromCache)
+        self.assertFalse(req.unchanged)
+        self.assertNotIn('If-None-Match', self.server.requestHeaders[-1])
+
+        req = cache.get(url, pool.get, headers={'User-Agent': 'test'})
+        self.assertEqual(self.server.requestHeaders[-1]['If-None-Match'], cache.lookup(url)['etag'])
+        self.assertEqual(self.server.requestHeaders[-1]['User-Agent'], 'test')
+        self.assertEqual(req.status_code, 200)       # The 304 response is turned into the kept page
+        self.assertTrue(req.fromCache)
+        self.assertTrue(req.unchanged)
+        self.assertEqual(req.text, '<html><title>標題</title></html>')
+        self.assertEqual(req.encoding, 'utf-8')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'unchanged': 1})
+
+        cache.close()
+        pool.close()
+
+        cache = HttpCache()     # Kept on disk for the next crawl
+        self.assertIsNotNone(cache.lookup(url))
+        cache.close()
+
+    def test_refresh(self):
+        """Test a ``304`` response with new validators updates them without writing the kept body again.
+        """
+        pool = HttpPool()
+        cache = HttpCache()
+        url = f'{self.root}/a.html'
+        cache.get(url, pool.get)
+        kept = cache.lookup(url)
+
+        def send(url, headers=None):
+            req = pool.get(url, headers=headers)
+            req.headers['ETag'] = '"refreshed"'
+            req.headers['Last-Modified'] = 'Mon, 01 Jan 2024 00:00:00 GMT'
+            return req
+
+        with mock.patch.object(cache, 'store') as store:
+            req = cache.get(url, send)
+        store.assert_not_called()
+        self.assertTrue(req.unchanged)
+        entry = cache.lookup(url)
+        self.assertEqual(entry['etag'], '"refreshed"')
+        self.assertEqual(entry['lastModified'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertEqual(entry['digest'], kept['digest'])
+        self.assertEqual(entry['content'], kept['content'])
+
+        cache.close()
+        pool.close()
+
+    def test_digest(self):
+        """Test a page without validators is unchanged if its body is the same, in which case only its validators and headers are written, and a page with ``no-store`` is not kept.
+        """
+        def send(body, responseHeaders=None):
+            return lambda url, headers=None: SimpleNamespace(status_code=200, content=body, headers=responseHeaders or {})
+
+        cache = HttpCache()
+        self.assertFalse(cache.get('http://www.test.com/', send(b'a')).unchanged)
+        with mock.patch.object(cache, 'store') as store:
+            self.assertTrue(cache.get('http://www.test.com/', send(b'a', {'ETag': '"a"'})).unchanged)
+        store.assert_not_called() # The same body is not written again
+        self.assertEqual(cache.lookup('http://www.test.com/')['etag'], '"a"') # The new validator is kept
+        self.assertFalse(cache.get('http://www.test.com/', send(b'b')).unchanged)
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 3, 'unchanged': 1})
+
+        cache.get('http://www.test.com/private', send(b'a', {'Cache-Control': 'private, no-store'}))
+        self.assertIsNone(cache.lookup('http://www.test.com/private'))
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
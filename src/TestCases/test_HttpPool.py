@@ -0,0 +1,70 @@
+import unittest
+
+from HttpPool import HttpPool
+from .LocalServer import LocalServer
+
+class TestHttpPool(unittest.TestCase):
+    """The test case of the module `HttpPool`. The web pages are served by a local http server.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """Hook method for starting the local http server.
+        """
+        cls.server = LocalServer({'/a.html': '<html></html>', '/b.html': '<html></html>'})
+        cls.root = cls.server.root
+
+    @classmethod
+    def tearDownClass(cls):
+        """Hook method for shutting down the local http server.
+        """
+        cls.server.close()
+
+    def test_attributes(self):
+        """Test the setting of attributes.
+        """
+        pool = HttpPool()
+        self.assertEqual(pool.poolConnections, 10)
+        self.assertEqual(pool.poolMaxsize, 10)
+        self.assertEqual(pool.idleTimeout, 60)
+        self.assertEqual(pool.stats(), {})     # No connection pool at initial state
+
+        pool = HttpPool(poolConnections=2, poolMaxsize=4, idleTimeout=1.5)
+        self.assertEqual(pool.adapter._pool_connections, 2)
+        self.assertEqual(pool.adapter._pool_maxsize, 4)
+        self.assertEqual(pool.idleTimeout, 1.5)
+
+        with self.assertRaises(TypeError):
+            HttpPool(poolMaxsize='4')
+
+    def test_get(self):
+        """Test the connection is reused across web requests to the same host.
+        """
+        pool = HttpPool()
+        for path in ['/a.html', '/b.html', '/a.html']:
+            req = pool.get(f'{self.root}{path}')
+            self.assertEqual(req.status_code, 200)
+
+        stats = pool.stats()
+        self.assertEqual(list(stats), [self.root])      # One connection pool for the host
+        self.assertEqual(stats[self.root]['requests'], 3)
+        self.assertEqual(stats[self.root]['connections'], 1)        # The connection is kept alive
+        self.assertEqual(stats[self.root]['idle'], 1)
+        pool.close()
+
+    def test_closeIdle(self):
+        """Test the connection pool of an idle host is closed.
+        """
+        pool = HttpPool(idleTimeout=0)
+        pool.get(f'{self.root}/a.html')
+        self.assertTrue(pool.stats())
+
+        pool.closeIdle()
+        self.assertEqual(pool.stats(), {})      # The connection pool of the idle host is closed
+        self.assertEqual(pool.lastUsed, {})
+
+        pool.get(f'{self.root}/b.html')
+        self.assertEqual(pool.stats()[self.root]['requests'], 1)        # A new connection pool is opened for the host
+        pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
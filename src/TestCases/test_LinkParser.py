@@ -0,0 +1,51 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from LinkParser import LinkParser, extractLinks, findBase
+
+class TestLinkParser(unittest.TestCase):
+    """The test case of the module `LinkParser`.
+    """
+    html = ('<!DOCTYPE html>'
+            '<html>'
+            '<head>'
+            '    <title>aaa</title>'
+            '    <link href="style.css" rel="stylesheet">'
+            '</head>'
+            '<body>'
+            '    <div>'
+            '        <a href="http://www.testurl.com/link1">first</a>'
+            '        <A HREF="/link2">second</A>'
+            '        <a href="">empty</a>'
+            '        <a name="anchor">no href</a>'
+            '        <a href="/link3?a=1&amp;b=2"/>'
+            '    </div>'
+            '</body>'
+            '</html>')
+
+    def test_attributes(self):
+        """Testing the attribute setting after initialization.
+        """
+        parser = LinkParser()
+        self.assertEqual(parser.links, [])
+
+    def test_extractLinks(self):
+        """Testing the ``href`` of each ``<a>`` tag is collected in order.
+        """
+        expected = ['http://www.testurl.com/link1', '/link2', '/link3?a=1&b=2']
+        self.assertEqual(extractLinks(self.html), expected) # Only not empty href of <a> tags, with character references converted
+        self.assertEqual(extractLinks(''), [])
+
+    def test_findBase(self):
+        """Testing the ``href`` of the ``<base>`` tag is found from both a html document and a BeautifulSoup object.
+        """
+        html = '<html><head><BASE target="_self" HREF="http://www.testurl.com/dir/"></head><body></body></html>'
+        self.assertEqual(findBase(html), 'http://www.testurl.com/dir/')
+        self.assertEqual(findBase(BeautifulSoup(html, 'html.parser')), 'http://www.testurl.com/dir/')
+        self.assertEqual(findBase("<base href='/sub/'>"), '/sub/')
+        self.assertIsNone(findBase(self.html))
+        self.assertIsNone(findBase(BeautifulSoup(self.html, 'html.parser')))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import requests
+import unittest
+import sys
+import io
+import os
+import re
+
+from AsyncCrawler import AsyncCrawler
+from Extractor import Extractor
+from MetricsServer import CrawlMetrics, MetricsServer, escapeLabel
+from .LocalServer import LocalServer
+
+class TestMetricsServer(unittest.TestCase):
+    """The test case of the module `MetricsServer`. The web pages are served by a local http server.
+
+    Attributes:
+
+    * pages (:obj:`dict`): The html documents served by the local http server, keyed by path.
+    * paths (:obj:`list`): The list of paths of files created during the test.
+    """
+    class TitleExtractor(Extractor):
+        """The testing extractor.
+        """
+        def get_title(self, url, bs):
+            return bs.head.title.get_text(), ''
+
+    pages = {
+        '/index.html': '<html><head><title>index</title></head><body><a href="/a.html"></a><a href="/missing.html"></a></body></html>',
+        '/a.html': '<html><head><title>a</title></head><body></body></html>',
+    }
+
+    paths = [
+        'tmp/metricsTitle.json',
+        'tmp/workingList.txt',
+        'tmp/done.txt',
+        'tmp/inFlight.txt',
+        'tmp/log.txt',
+        'tmp/timing.json'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        """Hook method for starting the local http server.
+        """
+        cls.server = LocalServer(cls.pages)
+        cls.root = cls.server.root
+
+    @classmethod
+    def tearDownClass(cls):
+        """Hook method for shutting down the local http server.
+        """
+        cls.server.close()
+
+    def setUp(self):
+        """Hook method for directing the standard output to a :obj:`io.StringIO` object.
+        """
+        sys.stdout = io.StringIO()
+
+    def tearDown(self):
+        """Hook method for redirecting the standard output and removing the files created during each test.
+        """
+        sys.stdout = sys.__stdout__
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def sample(self, text, name):
+        """The method of reading the value of a sample from the metrics text.
+        """
+        m = re.search(rf'^{re.escape(name)} (\S+)$', text, re.MULTILINE)
+        self.assertIsNotNone(m, name)
+        return float(m.group(1))
+
+    def test_rates(self):
+        """Test the pages and bytes per second are computed from the recent web requests.
+        """
+        metrics = CrawlMetrics(window=10)
+        self.assertEqual(metrics.rates(metrics.startTime), (0.0, 0.0))
+
+        metrics.startRequest()
+        self.assertEqual(metrics.inFlight, 1)
+        metrics.finishRequest('a.com', None)
+        self.assertEqual((metrics.inFlight, metrics.pages, metrics.errors), (0, 1, 1))
+
+        metrics.recent.clear()
+        metrics.recent.extend([(metrics.startTime + 1, 100), (metrics.startTime + 15, 300)])
+        self.assertEqual(metrics.rates(metrics.startTime + 5), (0.4, 80.0))       # Since the counting started
+        self.assertEqual(metrics.rates(metrics.startTime + 20), (0.1, 30.0))      # The first one has expired
+
+        self.assertEqual(escapeLabel('a"b\\c\nd'), 'a\\"b\\\\c\\nd')
+
+    def test_endpoint(self):
+        """Test the metrics of a crawl are exposed in the Prometheus text format.
+        """
+        c = AsyncCrawler(
+            workingList=[f'{self.root}/index.html'],
+            domain_pattern=r'127\.0\.0\.1',
+            extractors=[self.TitleExtractor('metricsTitle')],
+            metricsPort=0
+        )
+        self.assertIsNone(c.metricsServer)      # Started when the crawl starts
+        c.start()
+        res = requests.get(c.metricsServer.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers['Content-Type'], MetricsServer.contentType)
+        self.assertEqual(self.sample(res.text, 'crawler_frontier_size'), 1)
+        self.assertEqual(requests.get(c.metricsServer.url.replace('/metrics', '/other')).status_code, 404)
+
+        c.crawl()
+        text = c.metricsServer.render()
+        self.assertEqual(self.sample(text, 'crawler_pages_total'), 3)
+        self.assertEqual(self.sample(text, 'crawler_errors_total'), 1)     # The missing page
+        self.assertGreater(self.sample(text, 'crawler_bytes_total'), sum(len(page) for page in self.pages.values()))       # With the error page
+        self.assertGreater(self.sample(text, 'crawler_pages_per_second'), 0)
+        self.assertEqual(self.sample(text, 'crawler_requests_in_flight'), 0)
+        self.assertEqual(self.sample(text, 'crawler_frontier_size'), 0)
+        self.assertEqual(self.sample(text, 'crawler_seen_size'), 3)
+        self.assertEqual(self.sample(text, 'crawler_works_in_flight'), 0)
+        self.assertEqual(self.sample(text, 'crawler_host_requests_total{host="127.0.0.1"}'), 3)
+        self.assertAlmostEqual(self.sample(text, 'crawler_host_error_ratio{host="127.0.0.1"}'), 1 / 3)
+        self.assertEqual(self.sample(text, 'crawler_records_total{extractor="metricsTitle"}'), 3)
+        self.assertEqual(self.sample(text, 'crawler_stage_seconds_count{stage="parse"}'), 3)
+        self.assertIn('crawler_stage_seconds{stage="parse",quantile="0.99"}', text)
+        self.assertIn('# TYPE crawler_stage_seconds summary', text)
+        if os.path.exists('/proc/self/statm'):
+            self.assertGreater(self.sample(text, 'process_resident_memory_bytes'), 0)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            requests.get(c.metricsServer.url)       # Closed when the crawl finishes
+
+        self.assertIsNone(AsyncCrawler().metricsServer)
+        with self.assertRaises(TypeError):
+            AsyncCrawler(metricsPort='9100')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import pickle
+import os
+
+from bs4 import BeautifulSoup
+
+from ParseStage import ParseStage, parseContent, decodeContent, initWorker, runStage
+from Extractor import Extractor
+import ParseStage as ParseStageModule
+
+class TitleExtractor(Extractor):
+    """The testing extractor. It is defined at the top level so that it could be pickled.
+    """
+    def get_title(self, url, bs):
+        data = bs.head.title.get_text()
+        msg  = ''
+        return data, msg
+
+class TextExtractor(Extractor):
+    """The testing extractor reading the html text without the tree.
+    """
+    needsTree = False
+
+    def get_text(self, url, bs):
+        return bs, ''
+
+class TestParseStage(unittest.TestCase):
+    """The test case of the module `ParseStage`.
+    """
+    html = ('<html><head><meta charset="utf-8"><title>標題</title></head>'
+            '<body><a href="/a.html">a</a><a href="">empty</a><a href="http://www.test.com/b.html">b</a></body></html>')
+
+    def tearDown(self):
+        """Hook method for removing the file created by the testing extractor.
+        """
+        if os.path.exists('tmp/stageTitle.json'):
+            os.remove('tmp/stageTitle.json')
+
+    def test_parseContent(self):
+        """Test the ``parseContent`` method.
+        """
+        bs = parseContent(self.html.encode('utf-8'), None, 'html.parser')
+        self.assertIsInstance(bs, BeautifulSoup)
+        self.assertEqual(bs.head.title.get_text(), '標題')       # Encoding detected from the meta tag
+
+        bs = parseContent(self.html.encode('big5'), 'big5', 'html.parser')
+        self.assertEqual(bs.head.title.get_text(), '標題')       # Declared encoding
+
+        self.assertEqual(parseContent(b'abc', 'utf-8', lambda content, encoding: (content, encoding)), (b'abc', 'utf-8'))       # Callable parser
+
+    def test_decodeContent(self):
+        """Test the ``decodeContent`` method decodes the same text as the parsed tree.
+        """
+        content = self.html.encode('utf-8')
+        self.assertEqual(decodeContent(content, None), self.html)       # Encoding detected from the meta tag, not the iso-8859-1 fallback of requests
+        self.assertEqual(decodeContent(self.html.encode('big5'), 'big5'), self.html)       # Declared encoding
+        self.assertIn('標題', str(parseContent(content, None, 'html.parser')))
+
+        stage = ParseStage([TextExtractor('stageTitle')], 'html.parser', False, False)
+        self.assertEqual(stage.run('http://www.test.com', content, None)[0][0][0], {'text': self.html})      # The same text in the worker processes
+
+    def test_run(self):
+        """Test the ``run`` method. Nothing is recorded in the stage.
+        """
+        extractor = TitleExtractor('stageTitle')
+        stage = ParseStage([extractor], 'html.parser', True, True)
+        results, links, base, linkError = stage.run('http://www.test.com', self.html.encode('utf-8'), None)
+
+        self.assertEqual(results, [({'title': '標題'}, ['Get title: 標題'])])
+        self.assertEqual(links, ['/a.html', 'http://www.test.com/b.html'])
+        self.assertEqual(linkError, '')
+        self.assertFalse(extractor.JsonRecorder.recordExists())       # Not recorded
+
+        stage = ParseStage([], 'html.parser', False, True)      # Links found from the html text
+        self.assertEqual(stage.run('http://www.test.com', self.html.encode('utf-8'), None), ([], ['/a.html', 'http://www.test.com/b.html'], None, ''))
+
+        stage = ParseStage([], 'html.parser', False, False)
+        self.assertEqual(stage.run('http://www.test.com', self.html.encode('utf-8'), None), ([], [], None, ''))
+
+    def test_pickle(self):
+        """Test sending a parse stage to a worker process. The extractors are rebuilt without their recorders.
+        """
+        stage = pickle.loads(pickle.dumps(ParseStage([TitleExtractor('stageTitle')], 'html.parser', True, True)))
+        extractor = stage.extractors[0]
+        self.assertIsNone(extractor.JsonRecorder)     # The recorder stays in the crawler
+        self.assertEqual([name for name, _ in extractor.extractingMethods], ['title'])
+
+        initWorker(stage)
+        try:
+            results, links, base, linkError = runStage('http://www.test.com', self.html.encode('utf-8'), None)
+        finally:
+            ParseStageModule.workerStage = None
+        self.assertEqual(results, [({'title': '標題'}, ['Get title: 標題'])])
+        self.assertEqual(links, ['/a.html', 'http://www.test.com/b.html'])
+
+if __name__ == '__main__':
+    unittest.main()
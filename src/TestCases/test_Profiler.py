@@ -0,0 +1,122 @@
+import unittest
+import pstats
+import time
+import os
+
+from Profiler import CrawlProfiler
+
+class TestCrawlProfiler(unittest.TestCase):
+    """The test case of the module `Profiler`.
+
+    Attributes:
+
+    * paths (:obj:`list`): The list of paths of files created during the test.
+    """
+    paths = [
+        'tmp/testProfile.pstats',
+        'tmp/testProfile.collapsed'
+    ]
+
+    def setUp(self):
+        """Hook method for checking the files assumed be created during test not exist before each test.
+        """
+        for path in self.paths:
+            self.assertFalse(os.path.exists(path))
+
+    def tearDown(self):
+        """Hook method for removing the files created during each test.
+        """
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def busyPage():
+        """The testing work of a page, spending some cpu time.
+        """
+        end = time.perf_counter() + 0.02
+        while time.perf_counter() < end:
+            sum(range(100))
+
+    def test_attributes(self):
+        """Test the setting of attributes.
+        """
+        profiler = CrawlProfiler()
+        self.assertEqual((profiler.mode, profiler.pages, profiler.seconds, profiler.path), ('both', None, None, 'tmp/profile'))
+        self.assertFalse(profiler.running)
+
+        with self.assertRaises(ValueError):
+            CrawlProfiler(mode='tracing')
+        with self.assertRaises(TypeError):
+            CrawlProfiler(pages='10')
+        with self.assertRaises(TypeError):
+            CrawlProfiler(seconds='10')
+
+    def test_pages(self):
+        """Test the profiling stops after the window of pages and writes both outputs.
+        """
+        profiler = CrawlProfiler(pages=3, interval=0.001, path='tmp/testProfile')
+        profiler.start()
+        self.assertTrue(profiler.running)
+        for _ in range(5):
+            self.busyPage()
+            profiler.pageDone()
+        self.assertFalse(profiler.running)
+        self.assertEqual(profiler.pageCount, 3)     # Not counted after the window
+
+        stats = pstats.Stats('tmp/testProfile.pstats')
+        self.assertIn('busyPage', [func for _, _, func in stats.stats])
+
+        with open('tmp/testProfile.collapsed', 'r') as fin:
+            lines = fin.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any(line.split(' ', 1)[0] != 'busyPage' and 'busyPage (test_Profiler.py:' in line for line in lines))       # Root first
+
+        profiler.start()        # Not started twice
+        self.assertFalse(profiler.running)
+
+    def test_seconds(self):
+        """Test the profiling stops after the window of seconds, and only the chosen output is written.
+        """
+        profiler = CrawlProfiler(mode='sampling', seconds=0.05, interval=0.001, path='tmp/testProfile')
+        profiler.start()
+        while profiler.running:
+            self.busyPage()
+            profiler.pageDone()
+        self.assertIsNone(profiler.profile)
+        self.assertFalse(os.path.exists('tmp/testProfile.pstats'))
+        self.assertTrue(os.path.exists('tmp/testProfile.collapsed'))
+
+    def test_secondsWithoutPages(self):
+        """Test the sampling stops after the window of seconds even if no page finishes, as a crawl hanging on a slow page.
+        """
+        profiler = CrawlProfiler(mode='sampling', seconds=0.05, interval=0.001, path='tmp/testProfile')
+        profiler.start()
+        end = time.time() + 2
+        while profiler.sampler.is_alive() and time.time() < end:
+            self.busyPage()
+        self.assertFalse(profiler.sampler.is_alive())
+        self.assertTrue(os.path.exists('tmp/testProfile.collapsed'))
+        samples = sum(profiler.samples.values())
+        self.assertGreater(samples, 0)
+        self.busyPage()
+        self.assertEqual(sum(profiler.samples.values()), samples)
+
+        profiler.pageDone()
+        self.assertFalse(profiler.running)
+
+    def test_stop(self):
+        """Test stopping the profiling before the window is over, as a crawl finishing early.
+        """
+        profiler = CrawlProfiler(mode='cprofile', pages=100, path='tmp/testProfile')
+        profiler.start()
+        self.busyPage()
+        profiler.pageDone()
+        self.assertTrue(profiler.running)
+        profiler.stop()
+        self.assertFalse(profiler.running)
+        self.assertTrue(os.path.exists('tmp/testProfile.pstats'))
+        self.assertFalse(os.path.exists('tmp/testProfile.collapsed'))
@@ -1,13 +1,25 @@
 from collections import deque
+from functools import partial
+from unittest import mock
 import unittest
+import time
 import os
 import io
 import sys
+import sqlite3
+import shutil
 import json
 
 from Recorder import Recorder
 from Recorder import WorkingListManager
+from Recorder import HostWorkingListManager
+from Recorder import PriorityWorkingListManager
+from Recorder import SpillingWorkingListManager
+from Recorder import BloomSeenSet, FingerprintSeenSet
 from Recorder import JsonRecorder
+from Recorder import JsonLinesRecorder
+from Recorder import LogRecorder
+from Recorder import WriteBehind
 
 class TestRecorder(unittest.TestCase):
     """The test case of the module `Recorder.Reocrder`.
@@ -171,6 +183,8 @@ class TestWorkingListManager(unittest.TestCase):
         # Checking record files not exists before testing
         self.assertFalse(os.path.exists('tmp/workingList.txt'))
         self.assertFalse(os.path.exists('tmp/done.txt'))
+        self.assertFalse(os.path.exists('tmp/workingList.journal'))
+        self.assertFalse(os.path.exists('tmp/inFlight.txt'))
 
     def tearDown(self):
         """Hook method for deconstructing the test fixture after testing it.
@@ -185,6 +199,10 @@ class TestWorkingListManager(unittest.TestCase):
             os.remove('tmp/workingList.txt')        
         if os.path.exists('tmp/done.txt'):
             os.remove('tmp/done.txt')
+        if os.path.exists('tmp/workingList.journal'):
+            os.remove('tmp/workingList.journal')
+        if os.path.exists('tmp/inFlight.txt'):
+            os.remove('tmp/inFlight.txt')
 
     def test_attributes(self):
         """Testing the attribute setting after initialization.
@@ -229,15 +247,25 @@ class TestWorkingListManager(unittest.TestCase):
         with open(WLM.donePath) as fin:
             self.assertEqual(fin.read(), '') # File correctness
 
-        # Testing auto saving after getting a work
+        # Testing only the in-flight works are saved after getting a work
         WLM.getWork()
+        with open(WLM.inFlightPath) as fin:
+            self.assertEqual(fin.read(), 'first work')
+        with open(WLM.path) as fin:
+            self.assertEqual(fin.read(), 'first work\nsecond work')
+        with open(WLM.donePath) as fin:
+            self.assertEqual(fin.read(), '')
+
+        # Testing auto saving after adding the works of a page
+        WLM.addWorks([])
         with open(WLM.path) as fin:
             self.assertEqual(fin.read(), 'second work')
         with open(WLM.donePath) as fin:
             self.assertEqual(fin.read(), 'first work')
 
-        # Testing auto saving after getting a work
+        # Testing saving after closing
         WLM.getWork()
+        WLM.close()
         with open(WLM.path) as fin:
             self.assertEqual(fin.read(), '')
         with open(WLM.donePath) as fin:
@@ -267,6 +295,25 @@ class TestWorkingListManager(unittest.TestCase):
         with open(WLM.path, 'r') as fin:
             self.assertEqual(fin.read(), expectedData) # File correctness of auto saving after adding a work
             
+    def test_addWorkDuplicated(self):
+        """Testing a work is not added again if it is in the working list or has been processed.
+        """
+        WLM = WorkingListManager(['abc'])
+        self.assertEqual(WLM.seen, {'abc'}) # Seen set correctness after initialization
+
+        WLM.addWorks(['abc', 'klm', 'klm'])
+        self.assertEqual(WLM.records, deque(['abc', 'klm'])) # Works in the working list are not added again
+        self.assertEqual(WLM.seen, {'abc', 'klm'})
+
+        WLM.getWork()
+        WLM.addWork('abc')
+        self.assertEqual(WLM.records, deque(['klm'])) # Processed works are not added again
+        self.assertEqual(WLM.done, ['abc'])
+        self.assertEqual(WLM.seen, {'abc', 'klm'}) # Seen set covers both the working list and the done list
+        WLM.close()
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'klm') # File correctness
+
     def test_getWork(self):
         """Testing method of getting a work.
         """
@@ -281,9 +328,133 @@ class TestWorkingListManager(unittest.TestCase):
 
         self.assertEqual(work, expectedWork) # Returning data correctness
         self.assertEqual(WLM.records, expectedRecords) # Record list correctness
+        with open(WLM.inFlightPath, 'r') as fin:
+            self.assertEqual(fin.read(), expectedWork) # File correctness of auto saving after getting a work
+        WLM.close()
         with open(WLM.path, 'r') as fin:
-            self.assertEqual(fin.read(), expectedData) # File correctness of auto saving after getting a work
+            self.assertEqual(fin.read(), expectedData) # File correctness of saving after closing
+
+    def test_writesPerPage(self):
+        """Testing the files rewritten for a page: the in-flight work list when the work is got and finished, and the done list and the working list when the links of the page are added.
+        """
+        WLM = WorkingListManager(['abc'])
+        with mock.patch.object(WLM, 'writeFile', wraps=WLM.writeFile) as writeFile:
+            work = WLM.getWork()
+            WLM.addWorks(['klm', 'rts'])
+            WLM.finishWork(work)
+        self.assertEqual([call.args[0] for call in writeFile.call_args_list], [WLM.inFlightPath, WLM.donePath, WLM.path, WLM.inFlightPath])
             
+    def test_journal(self):
+        """Testing the journaled persistence mode.
+        """
+        WLM = WorkingListManager(['abc'], journal=True, compactInterval=5)
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'abc') # Snapshot is written at initialization
+        with open(WLM.journalPath, 'r') as fin:
+            self.assertEqual(fin.read(), '') # Journal is empty at initialization
+
+        WLM.addWorks(['klm', 'rts'])
+        WLM.getWork()
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'abc') # Snapshot remained unchanged
+        with open(WLM.journalPath, 'r') as fin:
+            self.assertEqual(fin.read(), '+klm\n+rts\n-abc\n') # Changes are appended to the journal
+
+        WLM.addWork('xyz')
+        WLM.getWork()
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'rts\nxyz') # Snapshot is rewritten after compacting
+        with open(WLM.donePath, 'r') as fin:
+            self.assertEqual(fin.read(), 'abc\nklm')
+        with open(WLM.journalPath, 'r') as fin:
+            self.assertEqual(fin.read(), '') # Journal is emptied after compacting
+
+    def test_crashWhileGetting(self):
+        """Testing a got work is written into the in-flight work list before it is marked as got, so a crash between the writes does not lose it. Without the journal, the done list is written before the working list, and a work in both files is not queued again.
+        """
+        class Crash(BaseException):
+            pass
+
+        for journal, writes in ((False, 1), (False, 2), (True, 1)):
+            WLM = WorkingListManager(['abc', 'klm'], journal=journal)
+            writeFile = WLM.writeFile
+            written = []
+            def crashAfterWrites(*args, **kwargs):
+                if len(written) == writes:
+                    raise Crash()
+                written.append(args[0])
+                writeFile(*args, **kwargs)
+            with mock.patch.object(WLM, 'writeFile', crashAfterWrites), self.assertRaises(Crash):
+                WLM.getWork()
+                WLM.save()      # Without the journal, the working list is saved when the links of the page are added
+            with open(WLM.inFlightPath, 'r') as fin:
+                self.assertEqual(fin.read(), 'abc')
+
+            WLM = WorkingListManager(journal=journal, resume=True)
+            self.assertEqual(WLM.records, deque(['abc', 'klm'])) # Got again
+            self.tearDown()
+            sys.stdout = self.strIO
+
+    def test_crashWhileCompacting(self):
+        """Testing a journaled crawl crashed after the snapshot is written and before the journal is emptied is recovered without duplicated works.
+        """
+        WLM = WorkingListManager(['abc', 'klm'], journal=True)
+        WLM.addWork('rts')
+        WLM.getWork()
+        WLM.finishWork('abc')
+        WLM.saveSnapshot()      # Crashed before emptying the journal
+        with open(WLM.journalPath, 'r') as fin:
+            self.assertEqual(fin.read(), '+rts\n-abc\n')
+        self.assertFalse(os.path.exists(f'{WLM.path}.tmp')) # Snapshot is replaced atomically
+
+        WLM = WorkingListManager(journal=True, resume=True)
+        self.assertEqual(WLM.records, deque(['klm', 'rts']))
+        self.assertEqual(WLM.done, ['abc'])
+
+    def test_load(self):
+        """Testing the method of rebuilding the working list from the snapshot and the journal.
+        """
+        WLM = WorkingListManager(['abc', 'klm'], journal=True)
+        WLM.getWork()
+        WLM.addWorks(['rts', 'xyz'])
+        WLM.getWork()
+        WLM.addRecord('uvw', False) # Unsaved work is not recovered
+
+        expectedRecords = deque(['rts', 'xyz'])
+        expectedDone = ['abc', 'klm']
+
+        WLM.records, WLM.done, WLM.seen = deque(), [], set()
+        WLM.load()
+        self.assertEqual(WLM.records, expectedRecords) # Working list correctness
+        self.assertEqual(WLM.done, expectedDone) # Done list correctness
+        self.assertEqual(WLM.seen, {'abc', 'klm', 'rts', 'xyz'}) # Seen set correctness
+
+    def test_resume(self):
+        """Testing resuming from the files. The finished works are not processed again, while the works in flight are put back to the front.
+        """
+        for journal in (False, True):
+            WLM = WorkingListManager(['abc', 'klm', 'rts'], journal=journal)
+            WLM.getWork()
+            WLM.finishWork('abc')
+            WLM.getWork()       # 'klm' is in flight when the crawl stops
+            WLM.save()      # Without the journal, the working list is saved when the links of the page are added
+            with open(WLM.inFlightPath, 'r') as fin:
+                self.assertEqual(fin.read(), 'klm') # In-flight file correctness
+
+            WLM = WorkingListManager(['abc', 'xyz'], journal=journal, resume=True)
+            self.assertEqual(WLM.records, deque(['klm', 'rts', 'xyz'])) # In-flight work first, then the remained and the new works
+            self.assertEqual(WLM.done, ['abc']) # Finished work is kept done
+            self.assertEqual(WLM.seen, {'abc', 'klm', 'rts', 'xyz'})
+            self.assertEqual(WLM.inFlight, {})
+            with open(WLM.path, 'r') as fin:
+                self.assertEqual(fin.read(), 'klm\nrts\nxyz') # Snapshot is rewritten after resuming
+
+            self.tearDown()
+            sys.stdout = self.strIO
+
+        WLM = WorkingListManager(['abc'], resume=True) # Resuming without any file starts fresh
+        self.assertEqual(WLM.records, deque(['abc']))
+
     def test_workExists(self):
         """Testing method of checking the existence of work.
         """
@@ -311,6 +482,335 @@ class TestWorkingListManager(unittest.TestCase):
         WLM.addWorks(newRecords)
         self.assertEqual(WLM.remainedAmount(), 14) # Work amount correctness after adding works    
 
+class TestHostWorkingListManager(unittest.TestCase):
+    """The test case of the module `Recorder.HostWorkingListManager`. The set up and tear down hooks are the same as the ones of the working list manager.
+    """
+    setUp = TestWorkingListManager.setUp
+    tearDown = TestWorkingListManager.tearDown
+
+    works = ['http://a.com/1', 'http://a.com/2', 'http://b.com/1']
+
+    def test_hostQueues(self):
+        """Testing the works are sharded by host, and a host at its concurrency limit is held back until a work of it is finished.
+        """
+        WLM = HostWorkingListManager(self.works, minDelay=0)
+        self.assertEqual(WLM.hostQueues, {'a.com': deque(['http://a.com/1', 'http://a.com/2']), 'b.com': deque(['http://b.com/1'])})
+        self.assertEqual(WLM.remainedAmount(), 3)
+
+        self.assertEqual(WLM.getWork(), 'http://a.com/1')
+        self.assertEqual(WLM.getWork(), 'http://b.com/1') # The other host is not blocked
+        self.assertIsNone(WLM.getWork()) # Host a.com is at its concurrency limit
+        self.assertIsNone(WLM.waitTime())
+        self.assertTrue(WLM.workExists())
+
+        WLM.finishWork('http://a.com/1')
+        self.assertEqual(WLM.waitTime(), 0)
+        self.assertEqual(WLM.getWork(), 'http://a.com/2')
+        self.assertFalse(WLM.workExists())
+        self.assertEqual(WLM.done, ['http://a.com/1', 'http://b.com/1', 'http://a.com/2'])
+
+        WLM.addWork('http://a.com/1')
+        self.assertFalse(WLM.workExists()) # Processed works are not added again
+
+    def test_minDelay(self):
+        """Testing a host is held back until the delay has passed since its last work was got.
+        """
+        WLM = HostWorkingListManager(self.works, minDelay=60, maxPerHost=2)
+        self.assertEqual(WLM.getWork(), 'http://a.com/1')
+        WLM.finishWork('http://a.com/1')
+        self.assertEqual(WLM.getWork(), 'http://b.com/1')
+        self.assertIsNone(WLM.getWork()) # Host a.com is polite
+        self.assertGreater(WLM.waitTime(), 59)
+
+        WLM.nextTime['a.com'] = 0 # The delay has passed
+        WLM.readyHeap = [(0, 0, 'a.com')]
+        self.assertEqual(WLM.getWork(), 'http://a.com/2')
+
+        with self.assertRaises(ValueError):
+            HostWorkingListManager(minDelay=-1)
+        with self.assertRaises(ValueError):
+            HostWorkingListManager(maxPerHost=0)
+        with self.assertRaises(TypeError):
+            HostWorkingListManager(maxPerHost='1')
+
+    def test_resume(self):
+        """Testing resuming from the files. The works in flight are put back to the front of the queues of their hosts.
+        """
+        WLM = HostWorkingListManager(self.works, minDelay=0, journal=True)
+        WLM.getWork()
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'http://a.com/1\nhttp://a.com/2\nhttp://b.com/1') # Snapshot of the queues
+
+        WLM = HostWorkingListManager(['http://b.com/2'], minDelay=0, journal=True, resume=True)
+        self.assertEqual(WLM.hostQueues, {'a.com': deque(['http://a.com/1', 'http://a.com/2']), 'b.com': deque(['http://b.com/1', 'http://b.com/2'])})
+        self.assertEqual(WLM.done, [])
+        self.assertEqual(WLM.remainedAmount(), 4)
+
+class TestPriorityWorkingListManager(unittest.TestCase):
+    """The test case of the module `Recorder.PriorityWorkingListManager`. The set up and tear down hooks are the same as the ones of the working list manager.
+    """
+    setUp = TestWorkingListManager.setUp
+    tearDown = TestWorkingListManager.tearDown
+
+    def test_getWork(self):
+        """Testing the work with the highest score is got first, and the works of the same score in the order they were added.
+        """
+        WLM = PriorityWorkingListManager(['http://a.com/x/y/z', 'http://a.com/x', 'http://a.com/x/y', 'http://b.com/'])
+        self.assertEqual(WLM.remainedAmount(), 4)
+        self.assertEqual([WLM.getWork() for _ in range(4)], ['http://b.com/', 'http://a.com/x', 'http://a.com/x/y', 'http://a.com/x/y/z']) # Shallower paths first
+        self.assertIsNone(WLM.getWork())
+        self.assertFalse(WLM.workExists())
+
+    def test_rescore(self):
+        """Testing a queued work added again is scored again, while a processed work is not added again.
+        """
+        WLM = PriorityWorkingListManager(['http://a.com/1', 'http://a.com/2', 'http://a.com/3'])
+        WLM.addWorks(['http://a.com/3', 'http://a.com/2', 'http://a.com/3'])
+        self.assertEqual(WLM.inLinks, {'http://a.com/1': 1, 'http://a.com/2': 2, 'http://a.com/3': 3})
+        self.assertEqual(WLM.getWork(), 'http://a.com/3') # Most in-links first
+
+        WLM.addWork('http://a.com/3')
+        self.assertEqual(WLM.getWork(), 'http://a.com/2')
+        self.assertEqual(WLM.getWork(), 'http://a.com/1')
+        self.assertFalse(WLM.workExists()) # Processed work is not added again
+
+    def test_scorer(self):
+        """Testing a user-supplied scoring function.
+        """
+        WLM = PriorityWorkingListManager(['http://a.com/about', 'http://a.com/product/1'], scorer=lambda work, inLinks: '/product/' in work)
+        self.assertEqual(WLM.getWork(), 'http://a.com/product/1')
+
+        with self.assertRaises(TypeError):
+            PriorityWorkingListManager(scorer=1)
+
+    def test_resume(self):
+        """Testing resuming from the files. The works in flight are queued again.
+        """
+        WLM = PriorityWorkingListManager(['http://a.com/1', 'http://a.com/2'])
+        WLM.getWork()
+        WLM.save()
+
+        WLM = PriorityWorkingListManager(resume=True)
+        self.assertEqual(WLM.inLinks, {'http://a.com/2': 1, 'http://a.com/1': 1})
+        self.assertEqual(WLM.done, [])
+        with open(WLM.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'http://a.com/2\nhttp://a.com/1') # Snapshot of the queued works in the order they were queued
+        self.assertEqual(WLM.getWork(), 'http://a.com/2') # Same score, in the order they were queued
+
+class TestSpillingWorkingListManager(unittest.TestCase):
+    """The test case of the module `Recorder.SpillingWorkingListManager`.
+    """
+    def setUp(self):
+        """Hook method for checking the record files not exist before testing.
+        """
+        self.assertFalse(os.path.exists('tmp/frontier'))
+        self.assertFalse(os.path.exists('tmp/seen.sqlite'))
+
+    def tearDown(self):
+        """Hook method for removing files created during testing.
+        """
+        shutil.rmtree('tmp/frontier', ignore_errors=True)
+        for path in ['tmp/seen.sqlite', 'tmp/seen.sqlite-wal', 'tmp/seen.sqlite-shm', 'tmp/seen.bin', 'tmp/seen.bin.fp', 'tmp/done.txt', 'tmp/inFlight.txt', 'tmp/workingList.txt']:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_spill(self):
+        """Testing the works are written into segment files and only a bounded amount of them are kept in memory, while the works are got in the order they were added.
+        """
+        works = [f'http://a.com/{i}' for i in range(7)]
+        WLM = SpillingWorkingListManager(segmentSize=2)
+        WLM.addWorks(works + works[:3])
+        self.assertEqual(WLM.remainedAmount(), 7) # Duplicated works are not added again
+        self.assertEqual(sorted(os.listdir('tmp/frontier')), ['00000000.txt', '00000001.txt', '00000002.txt', '00000003.txt', 'cursor.json'])
+
+        got = []
+        while WLM.workExists():
+            got.append(WLM.getWork())
+            self.assertLessEqual(len(WLM.head) + len(WLM.tail), 2) # Memory stays bounded
+            if len(got) == 3:
+                WLM.addWork('http://a.com/7') # Works added while getting
+        self.assertEqual(got, works + ['http://a.com/7'])
+        self.assertIsNone(WLM.getWork())
+        self.assertEqual(WLM.done, [])
+        with open(WLM.donePath, 'r') as fin:
+            self.assertEqual(fin.read().split(), got) # Done list is appended to the file
+        self.assertIn('http://a.com/0', WLM.seen)
+
+    def test_resume(self):
+        """Testing resuming from the segment files. The works in flight are got again first, and the finished works are not.
+        """
+        WLM = SpillingWorkingListManager([f'http://a.com/{i}' for i in range(5)], segmentSize=2)
+        WLM.finishWork(WLM.getWork())
+        WLM.getWork() # 'http://a.com/1' is in flight when the crawl stops
+        WLM.close()
+
+        WLM = SpillingWorkingListManager(['http://a.com/0', 'http://a.com/5'], segmentSize=2, resume=True)
+        self.assertEqual(WLM.remainedAmount(), 5)
+        self.assertEqual(len(WLM.seen), 6)      # Counted from the database and kept in step
+        got = [WLM.getWork() for _ in range(5)]
+        self.assertEqual(got, ['http://a.com/1', 'http://a.com/2', 'http://a.com/3', 'http://a.com/4', 'http://a.com/5'])
+        self.assertFalse(WLM.workExists())
+        WLM.close()
+        self.assertTrue(WLM.seen.closed) # Committed and closed with the working list manager
+        with self.assertRaises(sqlite3.ProgrammingError):
+            WLM.seen.connection.execute('SELECT 1')
+        WLM.close()
+
+    def test_crashWhileGetting(self):
+        """Testing a got work is written into the in-flight work list before the cursor passes it, so a crash between the two writes does not lose it.
+        """
+        WLM = SpillingWorkingListManager([f'http://a.com/{i}' for i in range(3)], segmentSize=2)
+        with mock.patch.object(WLM, 'save'):        # Crashed before the cursor is written
+            self.assertEqual(WLM.getWork(), 'http://a.com/0')
+        with open(WLM.inFlightPath, 'r') as fin:
+            self.assertEqual(fin.read(), 'http://a.com/0')
+        WLM.seen.close()
+
+        WLM = SpillingWorkingListManager(segmentSize=2, resume=True)
+        self.assertEqual(WLM.getWork(), 'http://a.com/0') # Got again
+        WLM.close()
+
+    def test_cursorAhead(self):
+        """Testing a cursor counting more works than written in the segment files, as after a failed writing, does not keep loading the next segment forever.
+        """
+        WLM = SpillingWorkingListManager([f'http://a.com/{i}' for i in range(3)], segmentSize=2)
+        WLM.seen.close()
+        with open(WLM.cursorPath, 'r') as fin:
+            cursor = json.loads(fin.read())
+        cursor['queued'] = 5
+        with open(WLM.cursorPath, 'w') as fout:
+            fout.write(json.dumps(cursor))
+        self.assertFalse(os.path.exists(f'{WLM.cursorPath}.tmp')) # Replaced atomically
+
+        sys.stdout = strIO = io.StringIO()
+        try:
+            WLM = SpillingWorkingListManager(segmentSize=2, resume=True)
+            got = []
+            while WLM.workExists():
+                work = WLM.getWork()
+                if work is None:
+                    break
+                got.append(work)
+        finally:
+            sys.stdout = sys.__stdout__
+        self.assertEqual(got, [f'http://a.com/{i}' for i in range(3)])
+        self.assertFalse(WLM.workExists())
+        self.assertIn('Failed to find 2 queued works', strIO.getvalue())
+        WLM.close()
+
+    def test_compactSeenSet(self):
+        """Testing resuming with a seen set kept in memory after a crash. It is rebuilt from the done list file and the segment files.
+        """
+        WLM = SpillingWorkingListManager([f'http://a.com/{i}' for i in range(5)], segmentSize=2, seenClass=BloomSeenSet)
+        WLM.finishWork(WLM.getWork())
+
+        WLM = SpillingWorkingListManager(['http://a.com/0', 'http://a.com/4', 'http://a.com/5'], segmentSize=2, resume=True, seenClass=BloomSeenSet)
+        self.assertEqual(WLM.remainedAmount(), 5)
+        self.assertIn('http://a.com/0', WLM.seen)
+
+    def test_saveSeenSet(self):
+        """Testing the seen set kept in memory is written into its binary file when closing, and read from it instead of being rebuilt when resuming.
+        """
+        seenClass = partial(BloomSeenSet, capacity=100, exact=True)
+        WLM = SpillingWorkingListManager([f'http://a.com/{i}' for i in range(5)], segmentSize=2, seenClass=seenClass)
+        WLM.finishWork(WLM.getWork())
+        WLM.close()
+        self.assertTrue(os.path.exists(WLM.seenPath))
+        self.assertTrue(os.path.exists(f'{WLM.seenPath}.fp'))
+
+        with mock.patch.object(BloomSeenSet, 'update') as update:
+            WLM = SpillingWorkingListManager(segmentSize=2, resume=True, seenClass=seenClass)
+        update.assert_not_called() # Not rebuilt
+        self.assertFalse(os.path.exists(WLM.seenPath)) # Removed after reading, so a crash later rebuilds the seen set
+        self.assertEqual(len(WLM.seen), 5)
+        self.assertIsNotNone(WLM.seen.fingerprints)
+        self.assertIn('http://a.com/0', WLM.seen)
+        self.assertEqual(WLM.remainedAmount(), 4)
+        WLM.addWork('http://a.com/0')
+        self.assertEqual(WLM.remainedAmount(), 4) # Seen before closing
+
+class TestSeenSet(unittest.TestCase):
+    """The test case of the module `Recorder.SeenSet`.
+    """
+    works = [f'http://www.test.com/page/{i}' for i in range(3000)]
+    others = [f'http://www.other.com/page/{i}' for i in range(3000)]
+    paths = ['tmp/seen.bin', 'tmp/seen.bin.fp']
+
+    def tearDown(self):
+        """Hook method for removing files created during testing.
+        """
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_fingerprint(self):
+        """Testing the fingerprint seen set is exact and grows as works are added.
+        """
+        seen = FingerprintSeenSet(capacity=16)
+        seen.update(self.works)
+        seen.add(self.works[0])
+        self.assertEqual(len(seen), 3000)
+        self.assertTrue(all(work in seen for work in self.works))
+        self.assertFalse(any(work in seen for work in self.others))
+        self.assertGreaterEqual(len(seen.table), 6000) # Grown to keep the table at most half full
+
+        seen.save('tmp/seen.bin')
+        loaded = FingerprintSeenSet.load('tmp/seen.bin')
+        self.assertEqual(len(loaded), 3000)
+        self.assertTrue(all(work in loaded for work in self.works))
+
+    def test_bloom(self):
+        """Testing the bloom seen set never misses a work, keeps the false positive rate, and adds stages as it grows.
+        """
+        seen = BloomSeenSet(capacity=1000, errorRate=0.01)
+        seen.update(self.works)
+        self.assertEqual(len(seen.stages), 2) # Scaled when the first stage is full
+        self.assertTrue(all(work in seen for work in self.works)) # No false negative
+        falsePositives = sum(work in seen for work in self.others)
+        self.assertLess(falsePositives, 0.01 * 3000)
+        self.assertLess(sum(len(stage['bits']) for stage in seen.stages), 3000 * 3) # Compact
+
+        seen.save('tmp/seen.bin')
+        loaded = BloomSeenSet.load('tmp/seen.bin')
+        self.assertEqual(len(loaded), len(seen))
+        self.assertTrue(all(work in loaded for work in self.works))
+        self.assertEqual(sum(work in loaded for work in self.others), falsePositives)
+
+        with self.assertRaises(ValueError):
+            BloomSeenSet(errorRate=1)
+        with self.assertRaises(TypeError):
+            BloomSeenSet(capacity='1')
+
+    def test_exact(self):
+        """Testing the bloom seen set confirmed by the fingerprints is exact.
+        """
+        seen = BloomSeenSet(capacity=100, errorRate=0.5, exact=True)
+        seen.update(self.works)
+        self.assertEqual(len(seen), 3000)
+        self.assertTrue(all(work in seen for work in self.works))
+        self.assertFalse(any(work in seen for work in self.others)) # No false positive
+
+        seen.save('tmp/seen.bin')
+        loaded = BloomSeenSet.load('tmp/seen.bin')
+        self.assertFalse(any(work in loaded for work in self.others))
+
+    def test_workingListManager(self):
+        """Testing a working list manager with a compact seen set.
+        """
+        try:
+            WLM = WorkingListManager(['abc', 'abc', 'klm'], seenClass=BloomSeenSet)
+            self.assertIsInstance(WLM.seen, BloomSeenSet)
+            WLM.getWork()
+            WLM.addWorks(['abc', 'rts'])
+            self.assertEqual(WLM.records, deque(['klm', 'rts'])) # Processed works are not added again
+        finally:
+            for path in ['tmp/workingList.txt', 'tmp/done.txt', 'tmp/inFlight.txt']:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        with self.assertRaises(TypeError):
+            WorkingListManager(seenClass=1)
+
 class TestJsonRecorder(unittest.TestCase):
     """The test case of the module `Recorder.JsonRecorder`.
 
@@ -399,5 +899,424 @@ class TestJsonRecorder(unittest.TestCase):
         with open(jr.path, 'r') as fin:
             self.assertEqual(json.loads(fin.read()), expectedDict) # Record file content correctness
 
+    def test_resume(self):
+        """Testing resuming from the record file. The count continues, so the keys of the new records do not collide with the loaded ones.
+        """
+        jr = JsonRecorder('testRecorder')
+        jr.addRecords([{'a': 1}, {'a': 2}])
+
+        jr = JsonRecorder('testRecorder', resume=True)
+        self.assertEqual(jr.count, 2) # Record count correctness
+        jr.addRecord({'a': 3})
+        with open(jr.path, 'r') as fin:
+            self.assertEqual(json.loads(fin.read()), {'0': {'a': 1}, '1': {'a': 2}, '2': {'a': 3}}) # Record file content correctness
+
+        with self.assertRaises(TypeError):
+            JsonRecorder('testRecorder', resume='True')
+
+class TestJsonLinesRecorder(unittest.TestCase):
+    """The test case of the module `Recorder.JsonLinesRecorder`.
+
+    Attributes:
+
+    * testName (:obj:`str`): The name used to build a ``JsonLinesRecorder`` during the test.
+    * testPath (:obj:`str`): The path assumed the record file created on.
+    """
+
+    testName = 'testRecorder'
+    testPath = f'tmp/{testName}.jsonl'
+
+    def setUp(self):
+        self.assertFalse(os.path.exists(self.testPath))# Checking record files not exists before testing
+
+    def tearDown(self):
+        """Hook method for deconstructing the test fixture after testing it.
+
+        * Removing files created during testing
+        """
+        if os.path.exists(self.testPath):
+            os.remove(self.testPath)
+
+    def test_attributes(self):
+        """Testing the attribute setting after initialization.
+        """
+        jr = JsonLinesRecorder('testRecorder')
+        self.assertEqual(jr.name, 'testRecorder') # Json lines recorder name correctness
+        self.assertEqual(jr.path, self.testPath) # Record file path correctness
+        self.assertEqual(jr.records, []) # No unsaved record at initial state
+        self.assertEqual(jr.count, 0) # Record counting variable is 0 at initial state
+        with open(jr.path, 'r') as fin:
+            self.assertFalse(fin.read()) # Record file is empty at initial state
+
+        with self.assertRaises(TypeError):
+            JsonLinesRecorder([])
+        with self.assertRaises(TypeError):
+            JsonLinesRecorder('testRecorder', resume='True')
+
+    def test_addRecord(self):
+        """Testing the method of adding a record. Only the new record is appended to the record file.
+        """
+        jr = JsonLinesRecorder('testRecorder')
+        jr.addRecord({'a': '1', 'b': 3})
+        jr.addRecord({'a': '2'})
+
+        self.assertEqual(jr.records, []) # Records are saved at once by default
+        self.assertEqual(jr.count, 2)
+        with open(jr.path, 'r') as fin:
+            self.assertEqual(fin.read(), '{"a": "1", "b": 3}\n{"a": "2"}\n') # Record file content correctness
+
+        # Raising Type error if new record is not a dict
+        with self.assertRaises(TypeError):
+            jr.addRecord('')
+
+    def test_writeBehind(self):
+        """Testing the records are appended in batches by a write-behind policy.
+        """
+        jr = JsonLinesRecorder('testRecorder').setWriteBehind(WriteBehind(flushSize=3, flushInterval=None))
+        jr.addRecord({'a': 1})
+        jr.addRecord({'a': 2})
+        self.assertEqual(len(jr.records), 2) # Records are buffered
+        with open(jr.path, 'r') as fin:
+            self.assertFalse(fin.read())
+
+        jr.addRecord({'a': 3})
+        self.assertEqual(jr.records, []) # Records are saved when reaching the flushing size
+        with open(jr.path, 'r') as fin:
+            self.assertEqual(fin.read(), '{"a": 1}\n{"a": 2}\n{"a": 3}\n')
+
+        jr.addRecord({'a': 4})
+        jr.close()
+        self.assertEqual(list(jr.readRecords()), [{'a': 1}, {'a': 2}, {'a': 3}, {'a': 4}]) # Flushed when closing
+
+    def test_resume(self):
+        """Testing the new records are appended after the existing record file when resuming.
+        """
+        jr = JsonLinesRecorder('testRecorder')
+        jr.addRecords([{'a': 1}, {'a': 2}])
+
+        jr = JsonLinesRecorder('testRecorder', resume=True)
+        self.assertEqual(jr.recordAmount(), 2) # Record count correctness
+        jr.addRecord({'a': 3})
+        self.assertEqual(list(jr.readRecords()), [{'a': 1}, {'a': 2}, {'a': 3}])
+
+    def test_resumeTruncated(self):
+        """Testing the truncated last line left by a crash while appending is dropped when resuming, so the next record starts a new line.
+        """
+        jr = JsonLinesRecorder('testRecorder')
+        jr.addRecords([{'a': 1}, {'a': 2}])
+        with open(jr.path, 'at') as fout:
+            fout.write('{"a": 3')        # Crashed while appending
+
+        strIO = io.StringIO()
+        with mock.patch('sys.stdout', strIO):
+            jr = JsonLinesRecorder('testRecorder', resume=True)
+        self.assertIn('Dropped a truncated record', strIO.getvalue())
+        self.assertEqual(jr.recordAmount(), 2)
+        jr.addRecord({'a': 4})
+        self.assertEqual(list(jr.readRecords()), [{'a': 1}, {'a': 2}, {'a': 4}])
+
+class TestLogRecorder(unittest.TestCase):
+    """The test case of the module `Recorder.LogRecorder`.
+
+    Attributes:
+
+    * testPaths (:obj:`list`): The paths of the log file and the rotated log files created during the test.
+    """
+
+    testPaths = ['tmp/testLog.txt', 'tmp/testLog.txt.1', 'tmp/testLog.txt.2', 'tmp/testLog.txt.3']
+
+    def setUp(self):
+        for path in self.testPaths:
+            self.assertFalse(os.path.exists(path))# Checking log files not exists before testing
+
+    def tearDown(self):
+        """Hook method for deconstructing the test fixture after testing it.
+
+        * Removing files created during testing
+        """
+        for path in self.testPaths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_attributes(self):
+        """Testing the attribute setting after initialization.
+        """
+        lr = LogRecorder('testLog')
+        self.assertEqual(lr.path, 'tmp/testLog.txt') # Log file path correctness
+        self.assertEqual(lr.records.maxlen, 100) # Recent entries are bounded
+        self.assertEqual(lr.maxBytes, 0)
+        self.assertIsNone(lr.rotateInterval)
+        self.assertEqual(lr.backupCount, 5)
+        with open(lr.path, 'r') as fin:
+            self.assertFalse(fin.read()) # Log file is empty at initial state
+
+        with self.assertRaises(TypeError):
+            LogRecorder([])
+        with self.assertRaises(TypeError):
+            LogRecorder('testLog', maxBytes='1')
+
+    def test_addRecord(self):
+        """Testing the entries are appended to the log file and only the recent ones are kept in memory.
+        """
+        lr = LogRecorder('testLog', bufferSize=2)
+        for entry in ['first', 'second', 'third']:
+            lr.addRecord(entry)
+
+        self.assertEqual(list(lr.records), ['second', 'third']) # Only recent entries are kept
+        self.assertEqual(lr.unsaved, [])
+        with open(lr.path, 'r') as fin:
+            self.assertEqual(fin.read(), 'first\nsecond\nthird\n') # Every entry is appended
+
+    def test_rotateByBytes(self):
+        """Testing the size of the log file is counted in bytes, so entries of multi-byte characters are rotated by their encoded size.
+        """
+        lr = LogRecorder('testLog', maxBytes=10, backupCount=1)
+        lr.addRecord('ééé')
+        self.assertEqual(lr.size, 7) # Three two-byte characters and the line break
+        lr.addRecord('éé')
+        self.assertEqual(lr.size, 5) # Rotated since 12 bytes exceed the limit, though only 9 characters
+        with open('tmp/testLog.txt.1', 'r', encoding='utf-8') as fin:
+            self.assertEqual(fin.read(), 'ééé\n')
+
+        lr = LogRecorder('testLog', maxBytes=10, backupCount=1, resume=True)
+        self.assertEqual(lr.size, os.path.getsize('tmp/testLog.txt')) # Same unit as the written entries
+
+    def test_rotate(self):
+        """Testing the log file is rotated by size and only a number of rotated files are kept.
+        """
+        lr = LogRecorder('testLog', maxBytes=10, backupCount=2)
+        for entry in ['aaaa', 'bbbb', 'cccc', 'dddd', 'eeee']:
+            lr.addRecord(entry)
+
+        with open('tmp/testLog.txt', 'r') as fin:
+            self.assertEqual(fin.read(), 'eeee\n') # Current log file
+        with open('tmp/testLog.txt.1', 'r') as fin:
+            self.assertEqual(fin.read(), 'cccc\ndddd\n') # Latest rotated log file
+        with open('tmp/testLog.txt.2', 'r') as fin:
+            self.assertEqual(fin.read(), 'aaaa\nbbbb\n') # Older rotated log file
+        self.assertFalse(os.path.exists('tmp/testLog.txt.3')) # Rotated log files more than the backup count are removed
+
+        lr = LogRecorder('testLog', rotateInterval=0, backupCount=1)
+        lr.addRecord('first')
+        lr.addRecord('second')
+        with open('tmp/testLog.txt.1', 'r') as fin:
+            self.assertEqual(fin.read(), 'first\n') # Rotated by time
+
+    def test_resume(self):
+        """Testing the new entries are appended after the existing log file when resuming.
+        """
+        lr = LogRecorder('testLog')
+        lr.addRecord('first')
+
+        lr = LogRecorder('testLog', maxBytes=10, resume=True)
+        self.assertEqual(lr.size, 6) # Log position correctness
+        lr.addRecord('second')
+        with open('tmp/testLog.txt', 'r') as fin:
+            self.assertEqual(fin.read(), 'second\n') # Rotated as the size includes the existing entries
+        with open('tmp/testLog.txt.1', 'r') as fin:
+            self.assertEqual(fin.read(), 'first\n')
+
+        lr = LogRecorder('testLog', resume=True)
+        lr.addRecord('third')
+        with open('tmp/testLog.txt', 'r') as fin:
+            self.assertEqual(fin.read(), 'second\nthird\n') # Appended after the existing entries
+
+class TestWriteBehind(unittest.TestCase):
+    """The test case of the module `Recorder.WriteBehind` and the write-behind mode of the recorders.
+
+    Attributes:
+
+    * testPaths (:obj:`list`): The paths of the files created during the test.
+    """
+
+    testPaths = ['tmp/testRecorder.txt', 'tmp/testRecorder.json', 'tmp/testLog.txt', 'tmp/testLog.txt.1', 'tmp/testJsonLines.jsonl', 'tmp/workingList.txt', 'tmp/workingList.journal', 'tmp/done.txt', 'tmp/inFlight.txt', 'tmp/seen.sqlite', 'tmp/seen.sqlite-wal', 'tmp/seen.sqlite-shm']
+
+    def setUp(self):
+        for path in self.testPaths:
+            self.assertFalse(os.path.exists(path)) # Checking files not exists before testing
+
+    def tearDown(self):
+        """Hook method for removing files created during testing.
+        """
+        shutil.rmtree('tmp/frontier', ignore_errors=True)
+        for path in self.testPaths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def read(path):
+        """The method of reading a whole file.
+        """
+        with open(path, 'r') as fin:
+            return fin.read()
+
+    def test_attributes(self):
+        """Testing the attribute setting after initialization.
+        """
+        wb = WriteBehind()
+        self.assertEqual((wb.flushSize, wb.flushInterval, wb.background, wb.fsync), (1000, 1, False, 'never')) # Default policy
+        with self.assertRaises(TypeError):
+            WriteBehind(flushSize='10')
+        with self.assertRaises(ValueError):
+            WriteBehind(flushSize=0)
+        with self.assertRaises(TypeError):
+            WriteBehind(flushInterval='1')
+        with self.assertRaises(TypeError):
+            WriteBehind(background=1)
+        with self.assertRaises(ValueError):
+            WriteBehind(fsync='always')
+
+        r = Recorder('testRecorder')
+        self.assertIsNone(r.writeBehind) # Saving at once by default
+        self.assertIs(r.setWriteBehind(wb), r)
+        self.assertIs(r.writeBehind, wb)
+        with self.assertRaises(TypeError):
+            r.setWriteBehind('writeBehind')
+
+    def test_flushSize(self):
+        """Testing the savings are deferred until enough of them are requested.
+        """
+        wb = WriteBehind(flushSize=3, flushInterval=None)
+        r = Recorder('testRecorder').setWriteBehind(wb)
+        r.addRecord('a')
+        r.addRecords(['b', 'c'])
+        self.assertEqual(self.read(r.path), '') # Deferred
+        self.assertEqual((r.pendingSaves, wb.pendingCount), ({'save': None}, 2))
+        r.addRecord('d')
+        self.assertEqual(self.read(r.path), 'a\nb\nc\nd') # Saved on the third request
+        self.assertEqual((wb.pendingCount, wb.pending), (0, {}))
+
+        r.addRecord('e')
+        r.flush()
+        self.assertEqual(self.read(r.path), 'a\nb\nc\nd\ne') # Saved explicitly
+
+        r.addRecord('f')
+        r.setWriteBehind(None)
+        self.assertEqual(self.read(r.path), 'a\nb\nc\nd\ne\nf') # Flushed when the policy is replaced
+        r.addRecord('g')
+        self.assertEqual(self.read(r.path), 'a\nb\nc\nd\ne\nf\ng') # Saving at once again
+
+    def test_flushInterval(self):
+        """Testing the savings are done when the first of them has been deferred for the interval.
+        """
+        r = Recorder('testRecorder').setWriteBehind(WriteBehind(flushInterval=0.05))
+        r.addRecord('a')
+        self.assertEqual(self.read(r.path), '')
+        time.sleep(0.06)
+        r.addRecord('b')
+        self.assertEqual(self.read(r.path), 'a\nb')
+
+    def test_background(self):
+        """Testing the files are written by the writer thread in order, and the recorder is flushed when exiting as a context manager.
+        """
+        wb = WriteBehind(flushSize=1, background=True)
+        with LogRecorder('testLog', maxBytes=10, backupCount=1).setWriteBehind(wb) as lr:
+            for entry in ['aaaa', 'bbbb', 'cccc']:
+                lr.addRecord(entry)
+            self.assertIsNotNone(wb.writer)
+        self.assertIsNone(wb.writer) # Stopped when closed
+        self.assertEqual(self.read('tmp/testLog.txt'), 'cccc\n') # Rotated in order with the writing
+        self.assertEqual(self.read('tmp/testLog.txt.1'), 'aaaa\nbbbb\n')
+
+        jr = JsonLinesRecorder('testJsonLines').setWriteBehind(wb)
+        jr.addRecord({'a': 1})
+        self.assertEqual(list(jr.readRecords()), [{'a': 1}]) # Flushed before reading
+        self.assertIsNotNone(wb.writer) # Started again
+        jr.close()
+
+    def test_workingListManager(self):
+        """Testing the working list manager defers the savings of adding, getting and finishing works.
+        """
+        WLM = WorkingListManager(['http://a.com/0']).setWriteBehind(WriteBehind(flushSize=100, background=True))
+        WLM.addWorks(['http://a.com/1', 'http://a.com/2'])
+        work = WLM.getWork()
+        WLM.finishWork(work)
+        WLM.getWork()
+        self.assertEqual(list(WLM.pendingSaves), ['save', 'saveInFlight'])
+        self.assertEqual(self.read(WLM.donePath), '') # Deferred
+
+        WLM.flush()
+        self.assertEqual(self.read(WLM.path), 'http://a.com/2')
+        self.assertEqual(self.read(WLM.donePath), 'http://a.com/0\nhttp://a.com/1')
+        self.assertEqual(self.read(WLM.inFlightPath), 'http://a.com/1')
+        WLM.close()
+
+        WLM = SpillingWorkingListManager(segmentSize=2).setWriteBehind(WriteBehind(background=True))
+        works = [f'http://a.com/{i}' for i in range(5)]
+        WLM.addWorks(works)
+        got = []
+        while WLM.workExists():
+            got.append(WLM.getWork()) # The segments written by the writer thread are read
+        self.assertEqual(got, works)
+        WLM.close()
+        self.assertEqual(self.read(WLM.donePath).split(), works)
+
+    def test_sharedPolicy(self):
+        """Testing the savings of the recorders sharing a policy are counted and done together, and the working list manager is saved after the records of the pages.
+        """
+        wb = WriteBehind(flushSize=10, flushInterval=None)
+        WLM = WorkingListManager([f'u{i}' for i in range(6)]).setWriteBehind(wb)
+        jr = JsonRecorder('testRecorder').setWriteBehind(wb)
+        with mock.patch.object(wb, 'submit', wraps=wb.submit) as submit:
+            for _ in range(6):
+                work = WLM.getWork()
+                jr.addRecord({'url': work})
+                WLM.addWork(f'{work}/a')
+                WLM.finishWork(work)
+            paths = [call.args[1] for call in submit.call_args_list]
+
+        with open(jr.path, 'r') as fin:
+            recorded = {record['url'] for record in json.loads(fin.read()).values()}
+        finished = set(self.read(WLM.donePath).split()) - set(self.read(WLM.inFlightPath).split())
+        self.assertTrue(finished)
+        self.assertTrue(finished <= recorded) # Every page finished on disk has its record on disk
+        self.assertEqual(paths[0], jr.path) # The records are written before the progress
+        self.assertLess(paths.index(jr.path), paths.index(WLM.inFlightPath))
+
+        jr.addRecord({'url': 'u6'})
+        WLM.addWork('u7')
+        WLM.flush() # Flushing one recorder flushes the others sharing the policy
+        self.assertIn('u6', self.read(jr.path))
+        self.assertIn('u7', self.read(WLM.path))
+        WLM.close()
+
+    def test_pendingOrder(self):
+        """Testing the in-flight works are written before the got work is marked as done, even if the saving of the working list was requested first.
+        """
+        wb = WriteBehind(flushSize=100, flushInterval=None)
+        for journal in (False, True):
+            WLM = WorkingListManager(['http://a.com/0'], journal=journal).setWriteBehind(wb)
+            WLM.addWork('http://a.com/1')
+            WLM.getWork()
+            self.assertEqual(list(WLM.pendingSaves)[0], 'save')
+            with mock.patch.object(wb, 'submit', wraps=wb.submit) as submit:
+                WLM.flush()
+            paths = [call.args[1] for call in submit.call_args_list]
+            self.assertEqual(paths[0], WLM.inFlightPath)
+            WLM.close()
+            if os.path.exists(WLM.journalPath):
+                os.remove(WLM.journalPath)
+
+    def test_fsync(self):
+        """Testing the fsync policies.
+        """
+        with mock.patch('os.fsync') as fsync:
+            with Recorder('testRecorder').setWriteBehind(WriteBehind(flushSize=1, fsync='write')) as r:
+                r.addRecord('a')
+                r.addRecord('b')
+            self.assertEqual(fsync.call_count, 2) # After each writing
+
+            fsync.reset_mock()
+            with Recorder('testRecorder').setWriteBehind(WriteBehind(flushSize=1, fsync='close')) as r:
+                r.addRecord('a')
+                r.addRecord('b')
+                self.assertEqual(fsync.call_count, 0)
+            self.assertEqual(fsync.call_count, 1) # Once for each written file when closing
+
+            fsync.reset_mock()
+            with Recorder('testRecorder').setWriteBehind(WriteBehind(flushSize=1)) as r:
+                r.addRecord('a')
+            self.assertEqual(fsync.call_count, 0)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
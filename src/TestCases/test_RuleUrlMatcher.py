@@ -0,0 +1,102 @@
+import unittest
+
+from RuleUrlMatcher import RuleUrlMatcher
+from UrlMatcher import UrlMatcher
+
+class TestRuleUrlMatcher(unittest.TestCase):
+    """The test case of the module `RuleUrlMatcher`.
+    """
+    def test_attributes(self):
+        """Testing the attributes setting after initialization.
+        """
+        UM = RuleUrlMatcher()
+        self.assertTrue(isinstance(UM, UrlMatcher))
+        self.assertEqual(UM.rules, [])
+        self.assertIsNone(UM.default)
+        self.assertTrue(UM.isIncluded('http://www.google.com')) # Everything matched by the patterns is included without rules
+
+        UM = RuleUrlMatcher(rules=[{'host': 'www.yahoo.com', 'priority': 3}], scheme_pattern='https')
+        self.assertEqual(UM.scheme_pattern, 'https')
+        self.assertEqual(UM.rules, [{'include': True, 'scheme': None, 'host': 'www.yahoo.com', 'path': None, 'pathRegex': None, 'priority': 3}])
+
+        with self.assertRaises(TypeError):
+            RuleUrlMatcher(rules='')
+        with self.assertRaises(TypeError):
+            RuleUrlMatcher(rules=[{'host': 1}])
+        with self.assertRaises(ValueError):
+            RuleUrlMatcher(rules=[{'path': '/a', 'pathRegex': '/b'}])
+
+    def test_host(self):
+        """Testing the exact hosts and the host suffixes.
+        """
+        UM = RuleUrlMatcher(rules=[
+            {'host': 'www.yahoo.com'},
+            {'host': '.google.com'},
+        ])
+        self.assertTrue(UM.isIncluded('http://www.yahoo.com/path'))
+        self.assertFalse(UM.isIncluded('http://news.yahoo.com/path')) # Exact host only matches itself
+        self.assertTrue(UM.isIncluded('http://google.com/path')) # Host suffix matches the host itself
+        self.assertTrue(UM.isIncluded('https://mail.google.com:8080/path')) # Host suffix matches subdomains
+        self.assertFalse(UM.isIncluded('http://notgoogle.com/path')) # Host suffix matches whole labels only
+        self.assertFalse(UM.isIncluded('ftp://www.yahoo.com/path')) # Patterns are still checked
+
+    def test_priority(self):
+        """Testing the winning rule among the matched rules.
+        """
+        UM = RuleUrlMatcher(rules=[
+            {'host': '.example.com'},
+            {'host': '.example.com', 'path': '/private', 'include': False, 'priority': 1},
+            {'host': 'blog.example.com', 'pathRegex': r'/private/\d+$', 'priority': 2},
+            {'path': '/tmp', 'include': False},
+            {'host': 'www.example.com', 'path': '/tmp'},
+            {'scheme': 'http', 'host': 'old.example.com', 'include': False, 'priority': 5},
+        ])
+        self.assertTrue(UM.isIncluded('http://www.example.com/public'))
+        self.assertFalse(UM.isIncluded('http://www.example.com/private/1')) # Higher priority exclude rule wins
+        self.assertTrue(UM.isIncluded('http://blog.example.com/private/1')) # Higher priority include rule wins
+        self.assertFalse(UM.isIncluded('http://blog.example.com/private/a'))
+        self.assertFalse(UM.isIncluded('http://www.example.com/tmp')) # Exclude rule wins a tie
+        self.assertFalse(UM.isIncluded('http://old.example.com/public')) # Rule with a scheme
+        self.assertTrue(UM.isIncluded('https://old.example.com/public'))
+        self.assertFalse(UM.isIncluded('http://www.google.com/public')) # No matched rule and include rules exist
+
+    def test_default(self):
+        """Testing the verdict of a url matching no rule.
+        """
+        UM = RuleUrlMatcher(rules=[{'path': '/tmp', 'include': False}])
+        self.assertTrue(UM.isIncluded('http://www.google.com/path')) # Included if there is no include rule
+        self.assertFalse(UM.isIncluded('http://www.google.com/tmp/a'))
+
+        UM = RuleUrlMatcher(rules=[{'path': '/tmp', 'include': False}], default=False)
+        self.assertFalse(UM.isIncluded('http://www.google.com/path'))
+
+    def test_addRule(self):
+        """Testing the memorized verdicts are cleared when adding a rule.
+        """
+        UM = RuleUrlMatcher()
+        url = 'http://www.google.com/path'
+        self.assertTrue(UM.isIncluded(url))
+        UM.addRule(include=False, host='www.google.com')
+        self.assertFalse(UM.isIncluded(url))
+
+    def test_groups(self):
+        """Testing the rules with groups in their regular expressions are compiled on their own, and an invalid regular expression is refused when adding.
+        """
+        UM = RuleUrlMatcher(rules=[
+            {'host': 'www.test.com', 'pathRegex': r'/item/(?P<id>\d+)$'},
+            {'host': 'www.test.com', 'pathRegex': r'/user/(?P<id>\w+)$', 'include': False, 'priority': 1},
+            {'host': 'www.test.com', 'pathRegex': r'/(\w+)/\1/'},
+            {'host': 'www.test.com', 'path': '/static'},
+        ])
+        self.assertTrue(UM.isIncluded('http://www.test.com/item/12')) # Same group name on the same host
+        self.assertFalse(UM.isIncluded('http://www.test.com/user/a'))
+        self.assertTrue(UM.isIncluded('http://www.test.com/a/a/page')) # Numbered backreference kept
+        self.assertFalse(UM.isIncluded('http://www.test.com/a/b/page'))
+        self.assertTrue(UM.isIncluded('http://www.test.com/static/a.css'))
+        self.assertFalse(UM.isIncluded('http://www.test.com/other'))
+
+        with self.assertRaises(ValueError):
+            UM.addRule(pathRegex='/(unclosed')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from bs4 import BeautifulSoup
+import unittest
+import json
+import os
+
+from SelectorExtractor import SelectorExtractor
+
+class TestSelectorExtractor(unittest.TestCase):
+    """The test case of the module `SelectorExtractor`.
+
+    Attributes:
+
+    * html (:obj:`str`): The html string for testing.
+    * bs (:obj:`BeautifulSoup`): The :obj:`BeautifulSoup` object retained from parsing the testing html string.
+    * url (:obj:`str`): The url string for testing.
+    """
+    class myExtractor(SelectorExtractor):
+        fields = {
+            'title': 'head > title',
+            'links': {'selector': 'div a[href]', 'many': True, 'attr': 'href'},
+            'price': {'selector': '#price', 'process': lambda tag: float(tag.get_text().strip('$'))},
+            'missing': '#missing',
+        }
+
+        def get_url(self, url, bs):
+            return url, ''
+
+    html = ('<!DOCTYPE html>'
+            '<html>'
+            '<head>'
+            '    <title> aaa </title>'
+            '</head>'
+            '<body>'
+            '    <div><a href="/link1">1</a><a>no href</a><a href="/link2">2</a></div>'
+            '    <span id="price">$15.50</span>'
+            '</body>'
+            '</html>')
+    bs = BeautifulSoup(html, 'html.parser')
+    url = 'http://www.test.com/path/page.html'
+
+    def setUp(self):
+        """Hook method for setting up the test fixture before exercising it.
+
+        * Checking the file assumed be created during test not exist before each test.
+        """
+        self.assertFalse(os.path.exists('tmp/testing.json'))
+
+    def tearDown(self):
+        """Hook method for deconstructing the test fixture after testing it.
+
+        * Removing the file created during esch test.
+        """
+        if os.path.exists('tmp/testing.json'):
+            os.remove('tmp/testing.json')
+
+    def test_compiledFields(self):
+        """Test the fields are compiled once when the subclass is created.
+        """
+        fields = self.myExtractor.compiledFields
+        self.assertEqual([f['attr'] for f in fields], ['title', 'links', 'price', 'missing'])       # Declared order is kept
+        self.assertEqual(fields[0]['selector'].pattern, 'head > title')
+        self.assertTrue(fields[1]['many'])
+        self.assertEqual(fields[1]['tagAttr'], 'href')
+
+        with self.assertRaises(TypeError):
+            class wrongExtractor(SelectorExtractor):
+                fields = {'title': 1}
+
+    def test_matchFields(self):
+        """Test matching the tree with all selectors in one walk.
+        """
+        e = self.myExtractor('testing')
+        matches = e.matchFields(self.bs)
+        self.assertEqual([tag.name for tag in matches['title']], ['title'])
+        self.assertEqual([tag['href'] for tag in matches['links']], ['/link1', '/link2'])       # All matched tags in document order
+        self.assertEqual(matches['missing'], [])
+
+    def test_extract(self):
+        """Test extracting the fields and the extracting methods into one record.
+        """
+        e = self.myExtractor('testing')
+        msg = e.extract(self.url, self.bs)
+        expectedMsg = '\n'.join([
+            'Get title: aaa',
+            "Get links: ['/link1', '/link2']",
+            'Get price: 15.5',
+            'Failed to get missing: no tag matches #missing',
+            f'Get url: {self.url}',
+        ])
+        self.assertEqual(msg, expectedMsg)      # Returned message correctness
+
+        expectedDict = {'0': {'title': 'aaa', 'links': ['/link1', '/link2'], 'price': 15.5, 'missing': '', 'url': self.url}}
+        with open(e.JsonRecorder.path, 'r') as fin:
+            self.assertEqual(json.loads(fin.read()), expectedDict)      # Record file correctness
+
+        msg = e.extract(self.url, None)
+        self.assertTrue(msg.startswith('Failed to get title: '))        # Failing to walk the tree
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import json
+import time
+import os
+
+from StageTimer import StageTimer, Histogram
+
+class TestStageTimer(unittest.TestCase):
+    """The test case of the module `StageTimer`.
+    """
+    def tearDown(self):
+        """Hook method for removing the summary file.
+        """
+        if os.path.exists('tmp/stageTiming.json'):
+            os.remove('tmp/stageTiming.json')
+
+    def test_histogram(self):
+        """Test the percentiles of a histogram are accurate within a bucket.
+        """
+        histogram = Histogram()
+        self.assertEqual(histogram.summary()['p50'], 0.0)       # Nothing counted
+
+        for i in range(1, 1001):
+            histogram.add(i / 1000)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 1000)
+        self.assertAlmostEqual(summary['total'], 500.5)
+        self.assertAlmostEqual(summary['mean'], 0.5005)
+        self.assertEqual((summary['min'], summary['max']), (0.001, 1.0))
+        for p, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            self.assertAlmostEqual(summary[f'p{p}'], expected, delta=expected * 0.07)
+
+        histogram = Histogram()
+        histogram.add(0.25)
+        self.assertEqual(histogram.percentile(99), 0.25)        # Bounded by the smallest and the largest time costs
+        histogram.add(0)
+        self.assertLess(histogram.percentile(1), 2e-6)       # Below the smallest bucket
+
+    def test_measure(self):
+        """Test measuring stages and summarizing them.
+        """
+        timer = StageTimer(dumpPath=None)
+        with timer.measure('sleep'):
+            time.sleep(0.01)
+        with self.assertRaises(ValueError):
+            with timer.measure('error'):        # Measured even if an exception is raised
+                raise ValueError()
+        timer.add('sleep', 0.03)
+
+        summary = timer.summary()
+        self.assertEqual(list(summary), ['error', 'sleep'])
+        self.assertEqual(summary['sleep']['count'], 2)
+        self.assertGreaterEqual(summary['sleep']['min'], 0.01)
+        self.assertEqual(summary['sleep']['max'], 0.03)
+
+        timer.reset()
+        self.assertEqual(timer.summary(), {})
+
+        with self.assertRaises(TypeError):
+            StageTimer(dumpPath=1)
+        with self.assertRaises(TypeError):
+            StageTimer(dumpInterval='60')
+
+    def test_dump(self):
+        """Test the summary is written only when it is due.
+        """
+        os.makedirs('tmp', exist_ok=True)
+        timer = StageTimer(dumpPath='tmp/stageTiming.json', dumpInterval=3600)
+        timer.add('parse', 0.5)
+        timer.dumpIfDue()
+        self.assertFalse(os.path.exists('tmp/stageTiming.json'))
+
+        timer.dumpInterval = 0
+        timer.dumpIfDue()
+        with open('tmp/stageTiming.json', 'r') as fin:
+            self.assertEqual(json.loads(fin.read())['parse']['p99'], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from UrlCanonicalizer import UrlCanonicalizer
+
+class TestUrlCanonicalizer(unittest.TestCase):
+    """The test case of the module `UrlCanonicalizer`.
+    """
+    def test_attributes(self):
+        """Testing the attributes setting after initialization.
+        """
+        canonicalizer = UrlCanonicalizer()
+        self.assertEqual(canonicalizer.dropParams, ('utm_*', 'gclid', 'fbclid'))
+        self.assertTrue(canonicalizer.sortQuery)
+        self.assertEqual(canonicalizer.cacheSize, 4096)
+
+        with self.assertRaises(TypeError):
+            UrlCanonicalizer(dropParams='utm_*')
+        with self.assertRaises(TypeError):
+            UrlCanonicalizer(sortQuery=1)
+
+    def test_join(self):
+        """Testing the joining of the relative links with the url of the web page.
+        """
+        canonicalizer = UrlCanonicalizer()
+        base = 'http://www.test.com/dir/page.html'
+        self.assertEqual(canonicalizer.join(base, 'other.html'), 'http://www.test.com/dir/other.html')
+        self.assertEqual(canonicalizer.join(base, '../up.html'), 'http://www.test.com/up.html')
+        self.assertEqual(canonicalizer.join(base, './a/../b.html'), 'http://www.test.com/dir/b.html')
+        self.assertEqual(canonicalizer.join(base, '/root.html'), 'http://www.test.com/root.html')
+        self.assertEqual(canonicalizer.join(base, '//cdn.test.com/x'), 'http://cdn.test.com/x')
+        self.assertEqual(canonicalizer.join(base, '?q=1'), 'http://www.test.com/dir/page.html?q=1')
+        self.assertEqual(canonicalizer.join(base, '#top'), 'http://www.test.com/dir/page.html')
+        self.assertEqual(canonicalizer.join(base, ' next.html '), 'http://www.test.com/dir/next.html')
+        self.assertEqual(canonicalizer.join(base, 'mailto:a@test.com'), 'mailto:a@test.com')       # Only joined
+        self.assertIsNone(canonicalizer.join(base, 'http://www.test.com:port/'))        # Invalid url
+
+    def test_canonicalize(self):
+        """Testing the different notations of the same web page become one url.
+        """
+        canonicalizer = UrlCanonicalizer()
+        self.assertEqual(canonicalizer.canonicalize('HTTP://WWW.Test.COM:80/a.html#part'), 'http://www.test.com/a.html')
+        self.assertEqual(canonicalizer.canonicalize('https://www.test.com:443'), 'https://www.test.com/')
+        self.assertEqual(canonicalizer.canonicalize('https://www.test.com:8443/'), 'https://www.test.com:8443/')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/%7euser/%2f%e4 a'), 'http://www.test.com/~user/%2F%E4%20a')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?b=2&utm_source=x&a=1&gclid=y'), 'http://www.test.com/?a=1&b=2')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?utm_medium=x'), 'http://www.test.com/')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?q=a+b&e='), 'http://www.test.com/?e=&q=a+b')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?foo&b=a+b'), 'http://www.test.com/?b=a+b&foo')        # Valueless parameter kept as written
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?b=%7e%2f&a=x y&&c'), 'http://www.test.com/?a=x%20y&b=~%2F&c')
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?id=2&x=1&id=1'), 'http://www.test.com/?id=2&id=1&x=1')        # Same name keeps its order
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?utm_source&utm%5Fmedium=x&a'), 'http://www.test.com/?a')
+
+        canonicalizer = UrlCanonicalizer(dropParams=['session'], sortQuery=False)
+        self.assertEqual(canonicalizer.canonicalize('http://www.test.com/?b=2&session=1&a=1&utm_source=x'), 'http://www.test.com/?b=2&a=1&utm_source=x')
+
+    def test_cache(self):
+        """Testing the canonical urls are memorized.
+        """
+        canonicalizer = UrlCanonicalizer(cacheSize=2)
+        for _ in range(3):
+            canonicalizer.join('http://www.test.com/', 'a.html')
+        info = canonicalizer.canonicalUrls.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+if __name__ == "__main__":
+    unittest.main()
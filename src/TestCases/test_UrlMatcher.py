@@ -60,5 +60,26 @@ class TestUrlMatcher(unittest.TestCase):
         url = 'http://www.yahoo.com/path/page/11233.html'
         self.assertTrue(UM.isIncluded(url))
 
+    def test_compiledPatterns(self):
+        """Testing the patterns are compiled when set and the memorized verdicts are cleared.
+        """
+        UM = UrlMatcher(domain_pattern='www.yahoo.com')
+        self.assertEqual(UM.domain_regex.pattern, 'www.yahoo.com') # Pattern is compiled at initialization
+
+        url = 'http://www.google.com/path'
+        self.assertFalse(UM.isIncluded(url))
+        self.assertFalse(UM.isIncluded(url))
+        self.assertEqual(UM.verdicts.cache_info().hits, 1) # Verdict is memorized
+
+        UM.domain_pattern = 'www.google.com'
+        self.assertEqual(UM.domain_regex.pattern, 'www.google.com') # Pattern is compiled when set
+        self.assertEqual(UM.verdicts.cache_info().currsize, 0) # Memorized verdicts are cleared
+        self.assertTrue(UM.isIncluded(url))
+
+        UM.setPatterns('ftp')
+        self.assertEqual(UM.scheme_pattern, 'ftp')
+        self.assertEqual(UM.domain_pattern, r'.*')
+        self.assertFalse(UM.isIncluded(url))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: UrlCanonicalizer
+   :synopsis: This module contains the url canonicalizer turning the links of web pages into canonical urls.
+
+.. moduleauthor:: Su, Yeh-Tarn
+
+"""
+
+from urllib.parse import urlsplit, urlunsplit, urljoin, unquote_plus, quote
+from functools import lru_cache
+from fnmatch import fnmatchcase
+import re
+
+class UrlCanonicalizer:
+    """The device to turn the links of web pages into canonical urls, so the different notations of the same web page become one work.
+
+    A link is joined with the url of its web page, or the ``<base href>`` of the web page, into an absolute url. Then the scheme and the host are lowercased, the default port, the dot segments and the fragment are removed, the percent-encodings are normalized, the query parameters matching ``dropParams`` are removed and the remained ones are sorted. The urls of the schemes other than http and https are only joined.
+
+    The canonical urls of recently checked urls are memorized, so canonicalizing the same url again does not parse it again.
+
+    Attributes:
+
+    * dropParams (:obj:`tuple`): The glob patterns of the names of the query parameters removed, such as tracking parameters.
+    * sortQuery (:obj:`bool`): Whether to sort the query parameters.
+    * cacheSize (:obj:`int`): The amount of recent canonical urls memorized.
+
+    Args:
+
+    * dropParams (:obj:`tuple`): The glob patterns of the names of the query parameters removed. Default is ``('utm_*', 'gclid', 'fbclid')``.
+    * sortQuery (:obj:`bool`): Whether to sort the query parameters. Default is True.
+    * cacheSize (:obj:`int`): The amount of recent canonical urls memorized. Default is 4096.
+
+    Raise:
+
+    * TypeError: ``dropParams`` is not a tuple or a list of strings, or ``sortQuery`` is not a boolean value.
+    """
+    defaultPorts = {'http': 80, 'https': 443}
+    unreserved = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+    escapeRegex = re.compile(r'%([0-9A-Fa-f]{2})')
+
+    def __init__(self, dropParams=('utm_*', 'gclid', 'fbclid'), sortQuery=True, cacheSize=4096):
+        """The initial method of a url canonicalizer.
+        """
+        if not isinstance(dropParams, (tuple, list)) or not all(isinstance(param, str) for param in dropParams):
+            raise TypeError('Argument "dropParams" must be a tuple of strings')
+        if not isinstance(sortQuery, bool):
+            raise TypeError('Argument "sortQuery" must be a boolean value')
+
+        self.dropParams = tuple(dropParams)
+        self.sortQuery = sortQuery
+        self.cacheSize = cacheSize
+        self.canonicalUrls = lru_cache(maxsize=cacheSize)(self.canonicalize)
+
+    def normalizeEscapes(self, text, safe):
+        """The method of normalizing the percent-encodings of a component. The encoded unreserved characters are decoded, the other encodings are uppercased, and the characters not allowed in the component are encoded.
+
+        Args:
+
+        * text (:obj:`str`): The component of a url.
+        * safe (:obj:`str`): The reserved characters allowed in the component.
+
+        Return:
+
+        * :obj:`str`: The normalized component.
+        """
+        def unescape(m):
+            char = chr(int(m.group(1), 16))
+            return char if char in self.unreserved else f'%{m.group(1).upper()}'
+
+        return quote(self.escapeRegex.sub(unescape, text), safe=safe + '%')
+
+    @staticmethod
+    def removeDotSegments(path):
+        """The method of resolving the ``.`` and ``..`` segments of a path.
+
+        Args:
+
+        * path (:obj:`str`): The path of a url.
+
+        Return:
+
+        * :obj:`str`: The path without dot segments.
+        """
+        if '.' not in path:
+            return path
+
+        output = []
+        for segment in path.split('/'):
+            if segment == '..':
+                if len(output) > 1:
+                    output.pop()
+            elif segment != '.':
+                output.append(segment)
+
+        if path.endswith(('/.', '/..')):
+            output.append('')
+
+        return '/'.join(output)
+
+    def normalizeQuery(self, query):
+        """The method of removing the dropped parameters from a query and sorting the remained ones by name. Each ``name`` or ``name=value`` token is kept as it is written, except its percent-encodings are normalized, so a parameter without a value stays different from one with an empty value, and ``+`` is not re-encoded. The parameters of the same name keep their order.
+
+        Args:
+
+        * query (:obj:`str`): The query of a url.
+
+        Return:
+
+        * :obj:`str`: The normalized query.
+        """
+        params = []
+        for token in query.split('&'):
+            if not token:
+                continue
+            name = unquote_plus(token.partition('=')[0])
+            if not any(fnmatchcase(name, pattern) for pattern in self.dropParams):
+                params.append((name, self.normalizeEscapes(token, "/?:@!$'()*+,;=")))
+        if self.sortQuery:
+            params.sort(key=lambda param: param[0])
+
+        return '&'.join(token for _, token in params)
+
+    def canonicalize(self, url):
+        """The method of canonicalizing an absolute url without memorizing.
+
+        Args:
+
+        * url (:obj:`str`): The absolute url.
+
+        Return:
+
+        * :obj:`str`: The canonical url.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        if scheme not in self.defaultPorts:
+            return url
+
+        host = (parts.hostname or '').rstrip('.')
+        if ':' in host:
+            host = f'[{host}]'
+        port = parts.port
+        netloc = host if port is None or port == self.defaultPorts[scheme] else f'{host}:{port}'
+        if parts.username is not None:
+            userinfo = parts.netloc.rpartition('@')[0]
+            netloc = f'{userinfo}@{netloc}'
+
+        path = self.normalizeEscapes(self.removeDotSegments(parts.path), "/:@!$&'()*+,;=") or '/'
+        query = self.normalizeQuery(parts.query) if parts.query else ''
+
+        return urlunsplit((scheme, netloc, path, query, ''))
+
+    def join(self, base, link):
+        """The method of joining a link with the url of its web page into a canonical url.
+
+        Args:
+
+        * base (:obj:`str`): The url of the web page, or its ``<base href>``.
+        * link (:obj:`str`): The ``href`` of the link.
+
+        Return:
+
+        * :obj:`str`: The canonical url. None if the link is not a valid url.
+        """
+        try:
+            return self.canonicalUrls(urljoin(base, link.strip()))
+        except ValueError:
+            return None
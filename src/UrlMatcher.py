@@ -8,32 +8,99 @@
 """
 
 from urllib.parse import urlparse
+from functools import lru_cache
 import re
 
 class UrlMatcher:
     """The device to check if given url matched the specified patterns.
 
+    The patterns are compiled when they are set, and the verdicts of recently checked urls are memorized, so checking the same url again does not parse or match it again.
+
     Attributes:
 
     * scheme_pattern (:obj:`str`): The regular expression string for matching the scheme of a given url.
     * domain_pattern (:obj:`str`): The regular expression string for matching the domain of a given url.
     * path_pattern (:obj:`str`): The regular expression string for matching the path of a given url.
+    * scheme_regex (:obj:`re.Pattern`): The compiled scheme pattern.
+    * domain_regex (:obj:`re.Pattern`): The compiled domain pattern.
+    * path_regex (:obj:`re.Pattern`): The compiled path pattern.
+    * cacheSize (:obj:`int`): The amount of recent verdicts memorized.
 
     Args:
 
     * scheme_pattern (:obj:`str`): The regular expression string of url scheme. For example, http, https, etc. Default is ``r'http|https'``.
     * domain_pattern (:obj:`str`): The regular expression string of url domain. Default is ``r'.*'``.
     * path_pattern (:obj:`str`): The regular expression string of url path. Default is ``r'.*'``.
+    * cacheSize (:obj:`int`): The amount of recent verdicts memorized. Default is 4096.
     """
-    def __init__(self, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*'):
+    def __init__(self, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*', cacheSize=4096):
         """The initial method of a url matcher.
         """
+        self.cacheSize = cacheSize
+        self.verdicts = lru_cache(maxsize=cacheSize)(self.match)
+        self.setPatterns(scheme_pattern, domain_pattern, path_pattern)
+
+    @property
+    def scheme_pattern(self):
+        """The regular expression string for matching the scheme of a given url. Setting it compiles the pattern and clears the memorized verdicts.
+        """
+        return self.scheme_regex.pattern
+
+    @scheme_pattern.setter
+    def scheme_pattern(self, pattern):
+        self.scheme_regex = re.compile(pattern)
+        self.verdicts.cache_clear()
+
+    @property
+    def domain_pattern(self):
+        """The regular expression string for matching the domain of a given url. Setting it compiles the pattern and clears the memorized verdicts.
+        """
+        return self.domain_regex.pattern
+
+    @domain_pattern.setter
+    def domain_pattern(self, pattern):
+        self.domain_regex = re.compile(pattern)
+        self.verdicts.cache_clear()
+
+    @property
+    def path_pattern(self):
+        """The regular expression string for matching the path of a given url. Setting it compiles the pattern and clears the memorized verdicts.
+        """
+        return self.path_regex.pattern
+
+    @path_pattern.setter
+    def path_pattern(self, pattern):
+        self.path_regex = re.compile(pattern)
+        self.verdicts.cache_clear()
+
+    def setPatterns(self, scheme_pattern=r'http|https', domain_pattern=r'.*', path_pattern=r'.*'):
+        """The method of setting and compiling the patterns. The memorized verdicts are cleared.
+
+        Args:
+
+        * scheme_pattern (:obj:`str`): The regular expression string of url scheme.
+        * domain_pattern (:obj:`str`): The regular expression string of url domain.
+        * path_pattern (:obj:`str`): The regular expression string of url path.
+        """
         self.scheme_pattern = scheme_pattern
         self.domain_pattern = domain_pattern
         self.path_pattern = path_pattern
 
     def isIncluded(self, url):
-        """The method of checking if a given url matched the specified patterns.
+        """The method of checking if a given url matched the specified patterns. The verdict is memorized.
+
+        Args:
+
+        * url (:obj:`str`): The url attempted to check.
+
+        Returns:
+
+        :obj:`bool`: True if the url is matched the patterns, False otherwise.
+        """
+        return self.verdicts(url)
+
+    def match(self, url):
+        """The method of matching a given url with the compiled patterns without memorizing.
 
         Args:
 
@@ -45,13 +112,13 @@ class UrlMatcher:
         """
         parseResult = urlparse(url)
 
-        if not re.match(self.scheme_pattern, parseResult.scheme):
+        if not self.scheme_regex.match(parseResult.scheme):
             return False
 
-        if not re.match(self.domain_pattern, parseResult.netloc):
+        if not self.domain_regex.match(parseResult.netloc):
             return False
 
-        if not re.match(self.path_pattern, parseResult.path):
+        if not self.path_regex.match(parseResult.path):
             return False
 
-        return True
\ No newline at end of file
+        return True